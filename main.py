@@ -7,15 +7,65 @@ Punto de entrada principal del sistema reorganizado con estructura modular.
 
 import sys
 import os
+import argparse
 
 # Agregar el directorio src al path para importar módulos
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.core.controller import TextController
 
+def positive_int(value: str) -> int:
+    """Parse a command line count that must be at least 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"debe ser un entero positivo: {value!r}")
+    return number
 
-def main():
-    """Run the application"""
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser"""
+    parser = argparse.ArgumentParser(
+        description="Sistema de Análisis Léxico y Validación de Patrones. "
+                    "Sin subcomando se inicia el menú interactivo."
+    )
+    subcommands = parser.add_subparsers(dest='command')
+    
+    analyze = subcommands.add_parser(
+        'analyze', help="Analiza documentos sin interacción y emite un resultado por documento"
+    )
+    analyze.add_argument('--input', '-i', required=True,
+                         help="Directorio (recursivo), archivo o '-' para leer de stdin")
+    analyze.add_argument('--jobs', '-j', type=positive_int, default=None,
+                         help="Procesos de trabajo (por defecto, todos los núcleos)")
+    analyze.add_argument('--format', '-f', choices=('jsonl', 'text'), default='jsonl',
+                         help="Formato de salida (por defecto, jsonl)")
+    analyze.add_argument('--glob', default='*',
+                         help="Filtro de nombres de archivo dentro de un directorio")
+    analyze.add_argument('--advanced', action='store_true',
+                         help="Incluye las estadísticas avanzadas de cada documento")
+    analyze.add_argument('--graphs', action='store_true',
+                         help="Genera también los gráficos (requiere matplotlib)")
+    
+    serve = subcommands.add_parser(
+        'serve', help="Inicia un servidor local JSON-lines/HTTP de análisis y validación"
+    )
+    serve.add_argument('--host', default='127.0.0.1', help="Dirección (por defecto, 127.0.0.1)")
+    serve.add_argument('--port', '-p', type=int, default=8765, help="Puerto (por defecto, 8765)")
+    serve.add_argument('--jobs', '-j', type=positive_int, default=None,
+                       help="Procesos de trabajo (por defecto, todos los núcleos)")
+    serve.add_argument('--queue-size', type=int, default=64,
+                       help="Solicitudes en espera antes de dejar de leer conexiones")
+    serve.add_argument('--timeout', type=float, default=30.0,
+                       help="Segundos permitidos por solicitud")
+    return parser
+
+
+def run_interactive():
+    """Run the interactive menu application"""
+    from src.core.controller import TextController
+    
     print("="*70)
     print("SISTEMA DE ANÁLISIS LÉXICO Y VALIDACIÓN DE PATRONES")
     print("Universidad del Quindío - Teoría de Lenguajes Formales")
@@ -25,5 +75,19 @@ def main():
     controller.run()
 
 
+def main(argv=None):
+    """Run the application: a subcommand (analyze, serve) or the interactive menu"""
+    args = build_parser().parse_args(argv)
+    if args.command == 'analyze':
+        from src.core.batch import main as run_batch
+        return run_batch(args.input, args.jobs, args.format, args.glob,
+                         args.advanced, args.graphs)
+    if args.command == 'serve':
+        from src.core.server import main as run_server
+        return run_server(args.host, args.port, args.jobs, args.queue_size, args.timeout)
+    run_interactive()
+    return 0
+
+
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
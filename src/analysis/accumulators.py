@@ -0,0 +1,546 @@
+"""
+Accumulators: Acumuladores de una sola pasada para las estadísticas avanzadas
+Recorren el texto y la lista de tokens una única vez y guardan los totales
+con los que StatisticsAnalyzer arma todas sus métricas
+"""
+
+from collections import Counter
+from fractions import Fraction
+from typing import Dict, Iterable
+import math
+import sys
+
+from .sketches import HyperLogLog
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional para este módulo
+    np = None
+
+
+# Longitud desde la que conviene contar caracteres con NumPy
+VECTORIZE_MIN_LENGTH = 2048
+
+
+def count_characters(text: str) -> Counter:
+    """
+    Cuenta las apariciones de cada carácter del texto
+    
+    Con NumPy, el texto se convierte una sola vez en un arreglo de puntos de
+    código (bytes si es ASCII) y bincount cuenta todos los caracteres a la
+    vez; sin NumPy, o para textos cortos, se usa Counter.
+    
+    Args:
+        text: Texto a contar
+    
+    Returns:
+        Counter: carácter -> apariciones
+    """
+    if np is None or len(text) < VECTORIZE_MIN_LENGTH:
+        return Counter(text)
+    return _count_characters_vectorized(text)
+
+
+def _count_characters_vectorized(text: str) -> Counter:
+    if text.isascii():
+        codes = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+    else:
+        codes = np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+    counts = np.bincount(codes)
+    present = np.flatnonzero(counts)
+    return Counter(dict(zip(map(chr, present.tolist()), counts[present].tolist())))
+
+
+class TextAccumulator:
+    """
+    Totales del texto original: caracteres por clase, palabras y líneas
+    
+    El texto puede llegar en fragmentos consecutivos (update) o en
+    acumuladores parciales (merge). Como una palabra puede quedar cortada
+    entre dos fragmentos, las palabras de los bordes se guardan aparte sin
+    contar y se completan al unir con el fragmento vecino. Un acumulador
+    editable sigue además las ediciones del texto completo (replace).
+    """
+    
+    def __init__(self, approximate: bool = False, editable: bool = False):
+        """
+        Args:
+            approximate: Contar las palabras distintas con HyperLogLog en lugar
+                de guardarlas en un conjunto (memoria acotada, ver sketches)
+            editable: Guardar cuántas veces aparece cada palabra para poder
+                quitarlas con replace (incompatible con approximate)
+        """
+        self.approximate = approximate
+        self.editable = editable
+        self.char_counts = Counter()   # carácter -> apariciones
+        self._complete_words = 0       # palabras sin tocar los bordes
+        self._unique_words = _distinct_counter(approximate, editable)   # esas palabras, en minúsculas
+        self._prefix = ''              # palabra abierta al inicio
+        self._suffix = ''              # palabra abierta al final
+        self._has_space = False        # si hubo algún espacio (si no, todo es _prefix)
+    
+    def update(self, text: str):
+        """
+        Acumula un fragmento que continúa el texto acumulado hasta ahora
+        
+        Args:
+            text: Texto (o fragmento) a acumular
+        """
+        chunk = TextAccumulator(self.approximate, self.editable)
+        # Un solo conteo de caracteres; las clases se deducen luego
+        # consultando cada carácter distinto una sola vez
+        chunk.char_counts = count_characters(text)
+        words = text.split()
+        if words:
+            first = 1 if not text[0].isspace() else 0
+            last = len(words) - 1 if not text[-1].isspace() else len(words)
+            if first and last == 0:
+                # Una sola palabra sin espacios alrededor
+                chunk._prefix = text
+            else:
+                chunk._has_space = True
+                chunk._prefix = words[0] if first else ''
+                chunk._suffix = words[-1] if last < len(words) else ''
+                inner = words[first:last]
+                chunk._complete_words = len(inner)
+                chunk._unique_words.update(word.lower() for word in inner)
+        elif text:
+            chunk._has_space = True
+        self.merge(chunk)
+    
+    def merge(self, other: 'TextAccumulator') -> 'TextAccumulator':
+        """
+        Combina con el acumulador del texto que sigue inmediatamente a este
+        
+        Args:
+            other: Acumulador del fragmento siguiente
+        
+        Returns:
+            TextAccumulator: Este mismo acumulador, ya combinado
+        """
+        _check_same_mode(self, other)
+        self.char_counts.update(other.char_counts)
+        self._complete_words += other._complete_words
+        self._unique_words |= other._unique_words
+        
+        if not self._has_space:
+            # Todo lo acumulado es una palabra abierta que continúa en other
+            self._prefix += other._prefix
+            self._suffix = other._suffix
+            self._has_space = other._has_space
+        elif not other._has_space:
+            self._suffix += other._prefix
+        else:
+            # La palabra cortada en el borde ya está completa
+            self._add_word(self._suffix + other._prefix)
+            self._suffix = other._suffix
+        return self
+    
+    def replace(self, text: str, offset: int, delete_len: int, insert_text: str):
+        """
+        Corrige los totales para una edición del texto completo acumulado
+        
+        Solo se vuelven a contar los caracteres eliminados e insertados y las
+        palabras que tocan la edición, sin recorrer el resto del texto. Después
+        de una edición el texto se considera cerrado: ya no admite update.
+        
+        Args:
+            text: Texto completo antes de la edición
+            offset: Posición donde empieza la edición
+            delete_len: Cantidad de caracteres eliminados desde offset
+            insert_text: Texto insertado en offset
+        
+        Raises:
+            ValueError: Si el acumulador no es editable
+        """
+        if not self.editable:
+            raise ValueError("Solo un acumulador editable admite replace")
+        old_end = offset + delete_len
+        self.char_counts -= count_characters(text[offset:old_end])
+        self.char_counts.update(count_characters(insert_text))
+        
+        # Las palabras de los bordes pasan a ser palabras completas
+        self._add_word(self._prefix)
+        if self._has_space:
+            self._add_word(self._suffix)
+        self._prefix = self._suffix = ''
+        self._has_space = True
+        
+        # Extender la zona editada hasta los espacios que la rodean: fuera de
+        # ella ninguna palabra cambia
+        start, end = offset, old_end
+        while start and not text[start - 1].isspace():
+            start -= 1
+        while end < len(text) and not text[end].isspace():
+            end += 1
+        old_words = text[start:end].split()
+        new_words = (text[start:offset] + insert_text + text[old_end:end]).split()
+        self._complete_words += len(new_words) - len(old_words)
+        for word in old_words:
+            self._unique_words.discard(word.lower())
+        self._unique_words.update(word.lower() for word in new_words)
+    
+    def _add_word(self, word: str):
+        if word:
+            self._complete_words += 1
+            self._unique_words.add(word.lower())
+    
+    @property
+    def word_count(self) -> int:
+        """Cantidad de palabras, como len(text.split()) sobre el texto completo"""
+        return self._complete_words + bool(self._prefix) + (self._has_space and bool(self._suffix))
+    
+    @property
+    def unique_words(self):
+        """
+        Palabras distintas en minúsculas, como set(text.lower().split())
+        
+        En modo aproximado es un HyperLogLog; en ambos casos len() da la cantidad.
+        """
+        words = self._unique_words.copy()
+        for word in (self._prefix, self._suffix if self._has_space else ''):
+            if word:
+                words.add(word.lower())
+        return words
+    
+    @property
+    def character_count(self) -> int:
+        return sum(self.char_counts.values())
+    
+    @property
+    def newline_count(self) -> int:
+        return self.char_counts['\n']
+    
+    @property
+    def sentence_marks(self) -> int:
+        """Cantidad de signos que cierran una oración ('.', '!' y '?')"""
+        counts = self.char_counts
+        return counts['.'] + counts['!'] + counts['?']
+    
+    def class_counts(self) -> Dict[str, int]:
+        """
+        Cuenta los caracteres de cada clase
+        
+        Returns:
+            Dict[str, int]: Caracteres en mayúscula, minúscula, dígitos,
+            espacios en blanco y signos (ni alfanuméricos ni espacios)
+        """
+        totals = {'upper': 0, 'lower': 0, 'digit': 0, 'space': 0, 'punctuation': 0}
+        for char, count in self.char_counts.items():
+            if char.isupper():
+                totals['upper'] += count
+            elif char.islower():
+                totals['lower'] += count
+            if char.isdigit():
+                totals['digit'] += count
+            if char.isspace():
+                totals['space'] += count
+            elif not char.isalnum():
+                totals['punctuation'] += count
+        return totals
+    
+    @property
+    def word_length_total(self) -> int:
+        """Caracteres dentro de palabras: split() descarta exactamente los espacios"""
+        return self.character_count - self.class_counts()['space']
+
+
+class TokenAccumulator:
+    """
+    Totales de la lista de tokens: longitudes, lexemas, tipos, patrones y líneas
+    
+    Solo guarda sumas, conteos y conjuntos, así que los acumuladores de varios
+    fragmentos, bloques o procesos se combinan con merge() obteniendo
+    exactamente los mismos totales que un recorrido sobre todos los tokens.
+    En modo aproximado los lexemas distintos (globales y por patrón) se
+    cuentan con HyperLogLog y solo esos conteos pasan a ser estimaciones.
+    Un acumulador editable admite además quitar tokens (remove).
+    """
+    
+    def __init__(self, approximate: bool = False, editable: bool = False):
+        """
+        Args:
+            approximate: Usar HyperLogLog para los lexemas distintos
+            editable: Guardar cuántas veces aparece cada lexema para poder
+                quitar tokens con remove (incompatible con approximate)
+        """
+        self.approximate = approximate
+        self.editable = editable
+        self.total = 0
+        self.length_histogram = {}     # longitud -> cantidad de tokens
+        self.length_sum = 0
+        self.length_square_sum = 0
+        self.lexemes = _distinct_counter(approximate, editable)
+        self.valid_count = 0
+        self.type_counts = {}          # tipo de token -> cantidad
+        self.line_counts = {}          # línea -> cantidad de tokens
+        # patrón -> [cantidad, suma de longitudes, lexemas distintos]
+        self.pattern_totals = {}
+    
+    def update(self, tokens: Iterable):
+        """
+        Acumula una secuencia de tokens en un solo recorrido
+        
+        Args:
+            tokens: Tokens del análisis léxico (Token o vistas equivalentes)
+        """
+        histogram = self.length_histogram
+        lexemes = self.lexemes
+        type_counts = self.type_counts
+        line_counts = self.line_counts
+        pattern_totals = self.pattern_totals
+        total = length_sum = length_square_sum = valid_count = 0
+        
+        for token in tokens:
+            lexeme = token.lexeme
+            length = len(lexeme)
+            total += 1
+            length_sum += length
+            length_square_sum += length * length
+            histogram[length] = histogram.get(length, 0) + 1
+            lexemes.add(lexeme)
+            
+            token_type = token.token_type
+            type_counts[token_type] = type_counts.get(token_type, 0) + 1
+            line = token.line
+            line_counts[line] = line_counts.get(line, 0) + 1
+            
+            pattern_name = token.pattern_name
+            if pattern_name:
+                valid_count += 1
+                entry = pattern_totals.get(pattern_name)
+                if entry is None:
+                    entry = pattern_totals[pattern_name] = [0, 0, _distinct_counter(self.approximate,
+                                                                                     self.editable)]
+                entry[0] += 1
+                entry[1] += length
+                entry[2].add(lexeme)
+        
+        self.total += total
+        self.length_sum += length_sum
+        self.length_square_sum += length_square_sum
+        self.valid_count += valid_count
+    
+    def merge(self, other: 'TokenAccumulator') -> 'TokenAccumulator':
+        """
+        Combina con el acumulador de los tokens que siguen a los de este
+        
+        El orden solo afecta el orden de primera aparición de tipos y patrones.
+        
+        Args:
+            other: Acumulador de otro fragmento
+        
+        Returns:
+            TokenAccumulator: Este mismo acumulador, ya combinado
+        """
+        _check_same_mode(self, other)
+        self.total += other.total
+        self.length_sum += other.length_sum
+        self.length_square_sum += other.length_square_sum
+        self.valid_count += other.valid_count
+        self.lexemes |= other.lexemes
+        for counts, other_counts in ((self.length_histogram, other.length_histogram),
+                                     (self.type_counts, other.type_counts),
+                                     (self.line_counts, other.line_counts)):
+            for key, count in other_counts.items():
+                counts[key] = counts.get(key, 0) + count
+        for pattern_name, (count, length_sum, lexemes) in other.pattern_totals.items():
+            entry = self.pattern_totals.get(pattern_name)
+            if entry is None:
+                self.pattern_totals[pattern_name] = [count, length_sum, lexemes.copy()]
+            else:
+                entry[0] += count
+                entry[1] += length_sum
+                entry[2] |= lexemes
+        return self
+    
+    def remove(self, tokens: Iterable):
+        """
+        Descuenta tokens acumulados antes, como si nunca se hubieran acumulado
+        
+        Junto con update permite seguir una edición con solo los tokens
+        eliminados e insertados. Cada token debe conservar la línea con la que
+        se acumuló; el orden de primera aparición de tipos y patrones se
+        recupera luego con reorder.
+        
+        Args:
+            tokens: Tokens a descontar
+        
+        Raises:
+            ValueError: Si el acumulador no es editable
+        """
+        if not self.editable:
+            raise ValueError("Solo un acumulador editable admite remove")
+        for token in tokens:
+            lexeme = token.lexeme
+            length = len(lexeme)
+            self.total -= 1
+            self.length_sum -= length
+            self.length_square_sum -= length * length
+            _decrement(self.length_histogram, length)
+            self.lexemes.discard(lexeme)
+            _decrement(self.type_counts, token.token_type)
+            _decrement(self.line_counts, token.line)
+            
+            pattern_name = token.pattern_name
+            if pattern_name:
+                self.valid_count -= 1
+                entry = self.pattern_totals[pattern_name]
+                entry[0] -= 1
+                entry[1] -= length
+                entry[2].discard(lexeme)
+                if not entry[0]:
+                    del self.pattern_totals[pattern_name]
+    
+    def reorder(self, token_types: Iterable, pattern_names: Iterable[str]):
+        """
+        Restablece el orden de primera aparición de tipos y patrones tras remove
+        
+        Args:
+            token_types: Tipos presentes, en orden de primera aparición
+            pattern_names: Patrones presentes, en orden de primera aparición
+        """
+        self.type_counts = {token_type: self.type_counts[token_type] for token_type in token_types}
+        self.pattern_totals = {name: self.pattern_totals[name] for name in pattern_names}
+    
+    @property
+    def min_length(self) -> int:
+        return min(self.length_histogram)
+    
+    @property
+    def max_length(self) -> int:
+        return max(self.length_histogram)
+    
+    def length_at(self, index: int) -> int:
+        """Longitud que ocuparía la posición index si las longitudes estuvieran ordenadas"""
+        seen = 0
+        for length in sorted(self.length_histogram):
+            seen += self.length_histogram[length]
+            if seen > index:
+                return length
+        raise IndexError("índice fuera de rango")
+    
+    def length_quantile(self, fraction: float) -> int:
+        """
+        Cuantil de las longitudes por rango más cercano (0 <= fraction <= 1)
+        
+        Las longitudes se guardan en un histograma, que ya es un resumen de
+        cuantiles exacto y acotado: n tokens de longitudes distintas suman al
+        menos n*(n+1)/2 caracteres, así que hay O(sqrt(caracteres)) entradas.
+        """
+        if not 0 <= fraction <= 1:
+            raise ValueError(f"Fracción fuera de rango: {fraction}")
+        return self.length_at(max(0, math.ceil(fraction * self.total) - 1))
+    
+    def median_length(self):
+        """
+        Mediana de las longitudes obtenida del histograma
+        
+        Returns:
+            Igual que statistics.median: el valor central, o el promedio de
+            los dos centrales si la cantidad es par
+        """
+        middle = self.total // 2
+        if self.total % 2:
+            return self.length_at(middle)
+        return (self.length_at(middle - 1) + self.length_at(middle)) / 2
+    
+    def length_stdev(self) -> float:
+        """Desviación estándar muestral de las longitudes (0 con menos de dos tokens)"""
+        if self.total < 2:
+            return 0
+        # Varianza exacta a partir de las sumas enteras
+        variance = Fraction(self.total * self.length_square_sum - self.length_sum ** 2,
+                            self.total * (self.total - 1))
+        return sqrt_of_fraction(variance)
+
+
+class _Multiset(Counter):
+    """Conjunto con repeticiones: discard quita una sola aparición y |= suma"""
+    
+    def add(self, item):
+        self[item] += 1
+    
+    def discard(self, item):
+        count = self[item] - 1
+        if count > 0:
+            self[item] = count
+        else:
+            self.pop(item, None)
+    
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+
+def _check_same_mode(accumulator, other):
+    if accumulator.approximate != other.approximate:
+        raise ValueError("No se pueden combinar acumuladores exactos y aproximados")
+    if accumulator.editable != other.editable:
+        raise ValueError("No se pueden combinar acumuladores editables y no editables")
+
+
+def _distinct_counter(approximate: bool, editable: bool = False):
+    """Conjunto exacto, multiconjunto (editable) o HyperLogLog para contar elementos distintos"""
+    if approximate and editable:
+        raise ValueError("Un acumulador aproximado no puede ser editable")
+    if editable:
+        return _Multiset()
+    return HyperLogLog() if approximate else set()
+
+
+def _decrement(counts: Dict, key):
+    """Resta una aparición de key y borra la entrada al llegar a cero"""
+    count = counts[key] - 1
+    if count:
+        counts[key] = count
+    else:
+        del counts[key]
+
+
+def exact_mean(total: int, count: int):
+    """
+    Promedio de enteros con el mismo resultado y tipo que statistics.mean
+    
+    Args:
+        total: Suma de los valores
+        count: Cantidad de valores (mayor que cero)
+    
+    Returns:
+        int si el promedio es exacto, float en otro caso
+    """
+    if total % count == 0:
+        return total // count
+    return total / count
+
+
+# Bits de precisión extra para redondear la raíz correctamente
+_SQRT_BIT_WIDTH = 2 * sys.float_info.mant_dig + 3
+
+
+def sqrt_of_fraction(value: Fraction) -> float:
+    """
+    Raíz cuadrada de una fracción no negativa redondeada correctamente
+    
+    Reproduce el cálculo de statistics.stdev, de modo que la desviación
+    obtenida de las sumas coincide bit a bit con la de la lista completa.
+    
+    Args:
+        value: Fracción no negativa
+    
+    Returns:
+        float: Raíz cuadrada de value
+    """
+    numerator, denominator = value.numerator, value.denominator
+    shift = (numerator.bit_length() - denominator.bit_length() - _SQRT_BIT_WIDTH) // 2
+    if shift >= 0:
+        root = _isqrt_round_to_odd(numerator, denominator << 2 * shift) << shift
+        return root / 1
+    root = _isqrt_round_to_odd(numerator << -2 * shift, denominator)
+    return root / (1 << -shift)
+
+
+def _isqrt_round_to_odd(numerator: int, denominator: int) -> int:
+    """Raíz entera de numerator/denominator, impar si el resultado no es exacto"""
+    root = math.isqrt(numerator // denominator)
+    return root | (root * root * denominator != numerator)
@@ -0,0 +1,223 @@
+"""
+Corpus Index: Índice invertido de lexemas para un corpus de documentos
+Asocia cada lexema normalizado con los documentos donde aparece y las
+posiciones de sus tokens, para buscar sin volver a analizar los textos
+"""
+
+import gzip
+import json
+import os
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional
+from .lexical_analyzer import TokenType
+
+
+# Versión del formato guardado en disco
+FORMAT_VERSION = 1
+
+
+def normalize_lexeme(lexeme: str) -> str:
+    """
+    Normaliza un lexema para indexarlo y buscarlo
+    
+    Args:
+        lexeme: Texto del token
+    
+    Returns:
+        str: Lexema sin distinción de mayúsculas
+    """
+    return lexeme.casefold()
+
+
+class CorpusIndex:
+    """Índice invertido: lexema normalizado -> documento -> posiciones"""
+    
+    def __init__(self, valid_only: bool = True):
+        """
+        Args:
+            valid_only: Indexar solo los tokens que coinciden con un patrón.
+                Con False también se indexan los tokens inválidos (los signos
+                de puntuación nunca se indexan).
+        """
+        self.valid_only = valid_only
+        self.documents: List[str] = []          # Identificadores en orden de alta
+        self._document_numbers: Dict[str, int] = {}
+        # lexema -> {número de documento: posiciones de los tokens}
+        self._postings: Dict[str, Dict[int, List[int]]] = {}
+        # lexema -> patrón reconocido (None si el token no es válido)
+        self._patterns: Dict[str, Optional[str]] = {}
+        self._sorted_lexemes: Optional[List[str]] = None
+    
+    def add_document(self, document_id: str, tokens: Iterable):
+        """
+        Agrega los tokens de un documento analizado
+        
+        Args:
+            document_id: Identificador único del documento (p. ej. su ruta)
+            tokens: Tokens producidos por LexicalAnalyzer
+        
+        Raises:
+            ValueError: Si el documento ya está en el índice
+        """
+        if document_id in self._document_numbers:
+            raise ValueError(f"El documento '{document_id}' ya está indexado")
+        number = len(self.documents)
+        self.documents.append(document_id)
+        self._document_numbers[document_id] = number
+        
+        postings, patterns = self._postings, self._patterns
+        for token in tokens:
+            if token.token_type == TokenType.PUNCTUATION:
+                continue
+            if self.valid_only and token.token_type != TokenType.VALID_PATTERN:
+                continue
+            lexeme = normalize_lexeme(token.lexeme)
+            documents = postings.get(lexeme)
+            if documents is None:
+                documents = postings[lexeme] = {}
+                patterns[lexeme] = token.pattern_name
+                self._sorted_lexemes = None
+            offsets = documents.get(number)
+            if offsets is None:
+                offsets = documents[number] = []
+            offsets.append(token.position)
+    
+    def __len__(self) -> int:
+        """Cantidad de lexemas distintos indexados"""
+        return len(self._postings)
+    
+    def __contains__(self, lexeme: str) -> bool:
+        return normalize_lexeme(lexeme) in self._postings
+    
+    def lookup(self, lexeme: str) -> Dict[str, List[int]]:
+        """
+        Busca un lexema exacto (sin distinguir mayúsculas)
+        
+        Args:
+            lexeme: Lexema a buscar
+        
+        Returns:
+            Dict[str, List[int]]: Documento -> posiciones del lexema en él
+        """
+        documents = self._postings.get(normalize_lexeme(lexeme), {})
+        return {self.documents[number]: list(offsets) for number, offsets in documents.items()}
+    
+    def documents_containing(self, lexeme: str) -> List[str]:
+        """
+        Obtiene los documentos que contienen un lexema
+        
+        Args:
+            lexeme: Lexema a buscar
+        
+        Returns:
+            List[str]: Identificadores en orden de alta
+        """
+        documents = self._postings.get(normalize_lexeme(lexeme), {})
+        return [self.documents[number] for number in sorted(documents)]
+    
+    def prefix_lookup(self, prefix: str, limit: Optional[int] = None,
+                      pattern_name: Optional[str] = None) -> Dict[str, Dict[str, List[int]]]:
+        """
+        Busca los lexemas que empiezan con un prefijo
+        
+        Args:
+            prefix: Prefijo a buscar (sin distinguir mayúsculas)
+            limit: Cantidad máxima de lexemas a retornar
+            pattern_name: Si se indica, solo lexemas reconocidos por ese patrón
+        
+        Returns:
+            Dict[str, Dict[str, List[int]]]: Lexema -> documento -> posiciones,
+            en orden alfabético
+        """
+        if self._sorted_lexemes is None:
+            self._sorted_lexemes = sorted(self._postings)
+        lexemes = self._sorted_lexemes
+        prefix = normalize_lexeme(prefix)
+        
+        results = {}
+        for index in range(bisect_left(lexemes, prefix), len(lexemes)):
+            lexeme = lexemes[index]
+            if not lexeme.startswith(prefix):
+                break
+            if pattern_name is not None and self._patterns[lexeme] != pattern_name:
+                continue
+            results[lexeme] = self.lookup(lexeme)
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+    
+    def get_pattern(self, lexeme: str) -> Optional[str]:
+        """Obtiene el patrón con que se reconoció un lexema indexado"""
+        return self._patterns.get(normalize_lexeme(lexeme))
+    
+    def save(self, filepath: str) -> str:
+        """
+        Guarda el índice como JSON comprimido con gzip
+        
+        Las posiciones de cada documento se guardan como diferencias con la
+        anterior, que son números pequeños y se comprimen mejor.
+        
+        Args:
+            filepath: Ruta del archivo (por convención, .json.gz)
+        
+        Returns:
+            str: Ruta del archivo guardado
+        """
+        terms = {}
+        for lexeme, documents in self._postings.items():
+            entries = []
+            for number, offsets in documents.items():
+                deltas = [offsets[0]]
+                deltas.extend(current - previous for previous, current in zip(offsets, offsets[1:]))
+                entries.append([number, deltas])
+            terms[lexeme] = [self._patterns[lexeme], entries]
+        
+        data = {
+            'version': FORMAT_VERSION,
+            'valid_only': self.valid_only,
+            'documents': self.documents,
+            'terms': terms,
+        }
+        # Crear directorio si no existe
+        directory = os.path.dirname(filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with gzip.open(filepath, 'wt', encoding='utf-8') as handle:
+            json.dump(data, handle, ensure_ascii=False, separators=(',', ':'))
+        return filepath
+    
+    @classmethod
+    def load(cls, filepath: str) -> 'CorpusIndex':
+        """
+        Carga un índice guardado con save()
+        
+        Args:
+            filepath: Ruta del archivo
+        
+        Returns:
+            CorpusIndex: Índice listo para consultas y nuevas altas
+        
+        Raises:
+            ValueError: Si el archivo tiene un formato desconocido
+        """
+        with gzip.open(filepath, 'rt', encoding='utf-8') as handle:
+            data = json.load(handle)
+        if data.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Formato de índice no soportado: {data.get('version')}")
+        
+        index = cls(valid_only=data['valid_only'])
+        index.documents = list(data['documents'])
+        index._document_numbers = {document_id: number
+                                   for number, document_id in enumerate(index.documents)}
+        for lexeme, (pattern_name, entries) in data['terms'].items():
+            documents = {}
+            for number, deltas in entries:
+                offsets = []
+                position = 0
+                for delta in deltas:
+                    position += delta
+                    offsets.append(position)
+                documents[number] = offsets
+            index._postings[lexeme] = documents
+            index._patterns[lexeme] = pattern_name
+        return index
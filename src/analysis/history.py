@@ -0,0 +1,192 @@
+"""
+History: Historial acotado de análisis estadísticos
+Mantiene en memoria solo los análisis más recientes y desplaza los antiguos a
+un archivo JSONL de solo anexado, con agregados que se actualizan en cada alta
+"""
+
+import json
+import tempfile
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+# Columnas del historial exportado a CSV
+CSV_FIELDS = ('timestamp', 'character_count', 'word_count', 'line_count', 'total_tokens',
+              'valid_tokens', 'accuracy', 'pattern_variety', 'complexity_index')
+
+# Cantidad de análisis recientes usados en la comparación de tendencias
+COMPARISON_WINDOW = 5
+
+
+def flatten_analysis(analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Extrae de un análisis completo la fila que se exporta a CSV
+    
+    Args:
+        analysis: Resultado de StatisticsAnalyzer.analyze_results
+    
+    Returns:
+        Dict[str, Any]: Valores de CSV_FIELDS
+    """
+    return {
+        'timestamp': analysis['timestamp'],
+        'character_count': analysis['text_analysis']['character_count'],
+        'word_count': analysis['text_analysis']['word_count'],
+        'line_count': analysis['text_analysis']['line_count'],
+        'total_tokens': analysis['token_analysis'].get('total_tokens', 0),
+        'valid_tokens': analysis['token_analysis'].get('valid_token_count', 0),
+        'accuracy': analysis['quality_metrics']['accuracy'],
+        'pattern_variety': analysis['pattern_analysis'].get('pattern_variety', 0),
+        'complexity_index': analysis['complexity_analysis'].get('complexity_index', 0)
+    }
+
+
+class AnalysisHistory:
+    """Historial con un búfer circular en memoria y un archivo JSONL para lo antiguo"""
+    
+    def __init__(self, capacity: int = 100, spill_path: Optional[str] = None):
+        """
+        Args:
+            capacity: Cantidad máxima de análisis completos en memoria
+            spill_path: Archivo JSONL donde se guardan los análisis desplazados.
+                Si existe, sus entradas se incorporan al historial. Sin ruta se
+                usa un archivo temporal que se crea al primer desplazamiento.
+        """
+        if capacity < 1:
+            raise ValueError(f"Capacidad inválida: {capacity}. Debe ser al menos 1")
+        self.capacity = capacity
+        self.spill_path = spill_path
+        self._recent = deque()          # (análisis, fila CSV) en orden de llegada
+        self._spill_file = None
+        self.spilled_count = 0
+        
+        # Agregados acumulados de todo el historial
+        self.count = 0
+        self.accuracy_sum = 0.0
+        self.complexity_sum = 0.0
+        self.token_sum = 0
+        # (precisión, complejidad, tokens) de los últimos análisis
+        self.window = deque(maxlen=COMPARISON_WINDOW)
+        
+        if spill_path:
+            self._spill_file = open(spill_path, 'a+', encoding='utf-8')
+            for row in self._read_spilled_rows():
+                self.spilled_count += 1
+                self._aggregate(row)
+    
+    def append(self, analysis: Dict[str, Any]):
+        """
+        Agrega un análisis; si se supera la capacidad, desplaza el más antiguo al disco
+        
+        Args:
+            analysis: Resultado de StatisticsAnalyzer.analyze_results
+        """
+        row = flatten_analysis(analysis)
+        self._recent.append((analysis, row))
+        self._aggregate(row)
+        if len(self._recent) > self.capacity:
+            self._spill(*self._recent.popleft())
+    
+    def _aggregate(self, row: Dict[str, Any]):
+        """Actualiza los agregados con la fila de un análisis nuevo"""
+        self.count += 1
+        self.accuracy_sum += row['accuracy']
+        self.complexity_sum += row['complexity_index']
+        self.token_sum += row['total_tokens']
+        self.window.append((row['accuracy'], row['complexity_index'], row['total_tokens']))
+    
+    def _spill(self, analysis: Dict[str, Any], row: Dict[str, Any]):
+        """Anexa un análisis al archivo JSONL"""
+        if self._spill_file is None:
+            if self.spill_path:
+                self._spill_file = open(self.spill_path, 'a+', encoding='utf-8')
+            else:
+                self._spill_file = tempfile.TemporaryFile('a+', encoding='utf-8', suffix='.jsonl')
+        self._spill_file.write(json.dumps({'row': row, 'analysis': analysis},
+                                          ensure_ascii=False, default=str) + '\n')
+        self.spilled_count += 1
+    
+    def _read_spilled(self) -> Iterator[Dict[str, Any]]:
+        """Lee el archivo JSONL línea por línea"""
+        if self._spill_file is None:
+            return
+        self._spill_file.flush()
+        self._spill_file.seek(0)
+        for line in self._spill_file:
+            if line.strip():
+                yield json.loads(line)
+        self._spill_file.seek(0, 2)
+    
+    def _read_spilled_rows(self) -> Iterator[Dict[str, Any]]:
+        for entry in self._read_spilled():
+            yield entry['row']
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Recorre todos los análisis, del más antiguo al más reciente"""
+        for entry in self._read_spilled():
+            yield entry['analysis']
+        for analysis, _ in list(self._recent):
+            yield analysis
+    
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        """
+        Recorre las filas CSV de todos los análisis sin cargarlos en memoria
+        
+        Yields:
+            Dict[str, Any]: Fila con los valores de CSV_FIELDS
+        """
+        yield from self._read_spilled_rows()
+        for _, row in list(self._recent):
+            yield row
+    
+    def recent(self) -> List[Dict[str, Any]]:
+        """Obtiene los análisis completos que siguen en memoria"""
+        return [analysis for analysis, _ in self._recent]
+    
+    def get_window(self) -> Tuple[List[float], List[float], List[int]]:
+        """
+        Obtiene las métricas de los últimos COMPARISON_WINDOW análisis
+        
+        Returns:
+            Tuple: Listas de precisión, índice de complejidad y total de tokens
+        """
+        accuracies = [entry[0] for entry in self.window]
+        complexities = [entry[1] for entry in self.window]
+        token_counts = [entry[2] for entry in self.window]
+        return accuracies, complexities, token_counts
+    
+    def get_aggregates(self) -> Dict[str, Any]:
+        """
+        Obtiene los promedios acumulados de todo el historial
+        
+        Returns:
+            Dict[str, Any]: Cantidad de análisis y promedios de precisión,
+            complejidad y tokens
+        """
+        count = self.count
+        return {
+            'count': count,
+            'avg_accuracy': self.accuracy_sum / count if count else 0,
+            'avg_complexity': self.complexity_sum / count if count else 0,
+            'avg_tokens': self.token_sum / count if count else 0,
+            'in_memory': len(self._recent),
+            'spilled': self.spilled_count,
+        }
+    
+    def close(self):
+        """
+        Cierra el archivo de desplazamiento
+        
+        Con una ruta propia, antes se guardan también los análisis que seguían
+        en memoria, de modo que un historial nuevo sobre el mismo archivo
+        continúa donde quedó este. El archivo temporal, en cambio, se elimina.
+        """
+        if self.spill_path:
+            while self._recent:
+                self._spill(*self._recent.popleft())
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
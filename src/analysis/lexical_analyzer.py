@@ -4,9 +4,35 @@ Implementa la tokenización y clasificación según los patrones definidos
 """
 
 import re
-from typing import List, Dict, Tuple, Any
+import sys
+import codecs
+import mmap
+from bisect import bisect_left, bisect_right
+import os
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import List, Dict, Tuple, Any, IO, Iterator, Optional
 from enum import Enum
-from ..patterns.patterns import PatternValidator
+from ..patterns.patterns import PatternValidator, TOKEN_PUNCTUATION
+from ..patterns.automata import DFAClassifier
+from .token_table import TokenTable
+from .position_index import PositionIndex
+
+
+# Signos que siempre forman un token propio y cortan cualquier otro token
+PUNCTUATION_CHARS = TOKEN_PUNCTUATION
+_PUNCTUATION_SET = frozenset(PUNCTUATION_CHARS)
+
+# Escáner: un signo suelto o una secuencia máxima sin espacios ni signos.
+# Los espacios en blanco quedan entre coincidencias y no generan tokens.
+_TOKEN_SCANNER = re.compile(r'[,;!?()\[\]{}"\']|[^\s,;!?()\[\]{}"\']+')
+_NEWLINE = re.compile(r'\n')
+
+# Escáner equivalente sobre bytes UTF-8. Solo reconoce los espacios ASCII
+# (los mismos que str.isspace() en ese rango); las secuencias con bytes no
+# ASCII se decodifican y se vuelven a escanear como texto.
+_BYTES_TOKEN_SCANNER = re.compile(rb'[,;!?()\[\]{}"\']|[^ \t\n\r\x0b\x0c\x1c-\x1f,;!?()\[\]{}"\']+')
+_PUNCTUATION_BYTES = frozenset(PUNCTUATION_CHARS.encode('ascii'))
 
 
 class TokenType(Enum):
@@ -21,6 +47,12 @@ class TokenType(Enum):
 class Token:
     """Clase que representa un token encontrado en el análisis"""
     
+    # Sin __dict__ por instancia: cada token ocupa solo sus seis referencias.
+    # token_type apunta a un miembro de TokenType y pattern_name a una cadena
+    # internada, compartidos por todos los tokens; el texto de __str__ se
+    # construye solo cuando se solicita.
+    __slots__ = ('lexeme', 'token_type', 'pattern_name', 'position', 'line', 'column')
+    
     def __init__(self, lexeme: str, token_type: TokenType, pattern_name: str = None, 
                  position: int = 0, line: int = 1, column: int = 1):
         self.lexeme = lexeme  # El texto literal del token
@@ -39,22 +71,161 @@ class Token:
         return self.__str__()
 
 
+# Códigos compactos de TokenType para transferir tokens entre procesos
+_TOKEN_TYPES = tuple(TokenType)
+_TOKEN_TYPE_CODES = {token_type: code for code, token_type in enumerate(_TOKEN_TYPES)}
+
+# Analizadores reutilizados por cada proceso trabajador (conservan su caché)
+_SHARD_ANALYZERS = {}
+
+
+def _analyze_shard(engine: str, cache_size: int, custom_patterns: Tuple[Tuple[str, str], ...],
+                   shard: str) -> Tuple[List[tuple], Tuple[int, int, int]]:
+    """
+    Analiza un fragmento de texto en un proceso trabajador
+    
+    Args:
+        engine: Motor de clasificación
+        cache_size: Capacidad de la caché LRU
+        custom_patterns: Patrones agregados con add_pattern, en orden de prioridad
+        shard: Fragmento que empieza al inicio de una línea
+    
+    Returns:
+        Tuple: Tokens como tuplas (lexeme, código de tipo, patrón, posición,
+        línea, columna) relativas al fragmento, y los contadores de la caché
+        (aciertos, fallos, desalojos) acumulados por este fragmento
+    """
+    key = (engine, cache_size, custom_patterns)
+    analyzer = _SHARD_ANALYZERS.get(key)
+    if analyzer is None:
+        analyzer = LexicalAnalyzer(engine, cache_size)
+        for pattern_name, pattern in custom_patterns:
+            analyzer.pattern_validator.add_pattern(pattern_name, pattern)
+        _SHARD_ANALYZERS[key] = analyzer
+    
+    hits, misses, evictions = analyzer.cache_hits, analyzer.cache_misses, analyzer.cache_evictions
+    codes = _TOKEN_TYPE_CODES
+    tokens = [(token.lexeme, codes[token.token_type], token.pattern_name,
+               token.position, token.line, token.column)
+              for token in analyzer.analyze(shard)]
+    analyzer.tokens = []
+    analyzer.text = ""
+    return tokens, (analyzer.cache_hits - hits, analyzer.cache_misses - misses,
+                    analyzer.cache_evictions - evictions)
+
+
 class LexicalAnalyzer:
     """Analizador léxico principal"""
     
-    def __init__(self):
+    # Motores de clasificación disponibles
+    ENGINES = ('regex', 'dfa')
+    
+    def __init__(self, engine: str = 'regex', cache_size: int = 4096):
+        """
+        Args:
+            engine: 'regex' (expresión fusionada de `re`) o
+                'dfa' (autómata determinista sin retroceso, tiempo lineal)
+            cache_size: Capacidad de la caché LRU de clasificaciones (0 la desactiva)
+        """
+        if engine not in self.ENGINES:
+            raise ValueError(f"Motor desconocido: {engine}. Opciones: {', '.join(self.ENGINES)}")
+        self.engine = engine
         self.pattern_validator = PatternValidator()
+        if engine == 'dfa':
+            self.classifier = DFAClassifier(self.pattern_validator)
+        else:
+            # La alternación fusionada descarta cada rama en su primer carácter, más
+            # rápido que calcular en Python la firma de forma (ver ShapeDispatcher)
+            self.classifier = self.pattern_validator
+        # Desplazamiento pendiente de apply_edit: los tokens desde el índice
+        # _shift_from guardan posición y línea sin sumar _shift_position/_shift_line
+        self._shift_from = 0
+        self._shift_position = 0
+        self._shift_line = 0
+        # Índices de tokens por tipo y por patrón, y sus conteos. Los índices
+        # se construyen durante el escaneo; tras una edición se reconstruyen al
+        # consultarlos, mientras que los conteos se corrigen en el momento.
+        self._type_index = None
+        self._pattern_index = None
+        self._type_counts = None
+        self._pattern_counts = None
+        # Versión de los tokens: cambia con cada análisis o edición y marca
+        # como desactualizado el índice posicional construido antes
+        self.generation = 0
+        self._position_index = None
         self.tokens = []
         self.current_position = 0
         self.current_line = 1
         self.current_column = 1
         self.text = ""
         
+        # Caché LRU de clasificaciones: (versión de patrones, lexeme) -> patrón.
+        # Se conserva entre análisis porque los lexemas se repiten entre textos.
+        self.cache_size = cache_size
+        self._classification_cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_evictions = 0
+        
         # Patrones para caracteres especiales
         self.whitespace_pattern = re.compile(r'\s+')
         self.punctuation_pattern = re.compile(r'[.,;:!?()[\]{}"\'`~@#$%^&*+=|\\<>/\-_]')
         self.word_pattern = re.compile(r'\S+')
     
+    @property
+    def tokens(self):
+        """Tokens del último análisis, con los desplazamientos pendientes ya aplicados"""
+        self._flush_shift()
+        return self._tokens
+    
+    @tokens.setter
+    def tokens(self, tokens):
+        self._tokens = tokens
+        self._shift_position = self._shift_line = 0
+        self._type_index = self._pattern_index = None
+        self._type_counts = self._pattern_counts = None
+        self.generation += 1
+    
+    def _flush_shift(self):
+        """Aplica a los tokens el desplazamiento pendiente de apply_edit"""
+        if self._shift_position or self._shift_line:
+            self._apply_shift(self._shift_from, len(self._tokens),
+                              self._shift_position, self._shift_line)
+            self._shift_position = self._shift_line = 0
+    
+    def _set_index(self, type_index: Dict[TokenType, List[Token]],
+                   pattern_index: Dict[str, List[Token]]):
+        """Guarda los índices de tokens y toma de ellos los conteos"""
+        self._type_index = type_index
+        self._pattern_index = pattern_index
+        self._type_counts = {token_type: len(tokens) for token_type, tokens in type_index.items()}
+        self._pattern_counts = {name: len(tokens) for name, tokens in pattern_index.items()}
+    
+    def _build_index(self):
+        """Construye los índices por tipo y por patrón recorriendo self.tokens"""
+        type_index = {token_type: [] for token_type in TokenType}
+        pattern_index = {}
+        for token in self.tokens:
+            type_index[token.token_type].append(token)
+            if token.token_type == TokenType.VALID_PATTERN:
+                pattern_tokens = pattern_index.get(token.pattern_name)
+                if pattern_tokens is None:
+                    pattern_tokens = pattern_index[token.pattern_name] = []
+                pattern_tokens.append(token)
+        self._set_index(type_index, pattern_index)
+    
+    def _get_index(self) -> Tuple[Dict[TokenType, List[Token]], Dict[str, List[Token]]]:
+        """Obtiene los índices por tipo y por patrón, reconstruyéndolos si hace falta"""
+        if self._type_index is None:
+            self._build_index()
+        return self._type_index, self._pattern_index
+    
+    def _get_counts(self) -> Tuple[Dict[TokenType, int], Dict[str, int]]:
+        """Obtiene los conteos por tipo y por patrón"""
+        if self._type_counts is None:
+            self._build_index()
+        return self._type_counts, self._pattern_counts
+    
     def analyze(self, text: str) -> List[Token]:
         """
         Analiza el texto completo y retorna la lista de tokens
@@ -66,110 +237,558 @@ class LexicalAnalyzer:
             List[Token]: Lista de tokens encontrados
         """
         self.text = text
-        self.tokens = []
-        self.current_position = 0
-        self.current_line = 1
-        self.current_column = 1
+        self.tokens = tokens = []
+        
+        # Tabla de inicios de línea: la línea y columna de cada token se
+        # obtienen por búsqueda binaria en lugar de contar carácter a carácter
+        newlines = [match.start() for match in _NEWLINE.finditer(text)]
+        
+        # Índices por tipo y por patrón, llenados durante el mismo recorrido
+        type_index = {token_type: [] for token_type in TokenType}
+        pattern_index = {}
+        punctuation_append = type_index[TokenType.PUNCTUATION].append
+        valid_append = type_index[TokenType.VALID_PATTERN].append
+        invalid_append = type_index[TokenType.INVALID_TOKEN].append
         
-        while self.current_position < len(text):
-            self._skip_whitespace()
+        append = tokens.append
+        classify = self._classify_token
+        line_index = 0
+        for match in _TOKEN_SCANNER.finditer(text):
+            start = match.start()
+            lexeme = match.group()
+            line_index = bisect_right(newlines, start, line_index)
+            column = start - newlines[line_index - 1] if line_index else start + 1
             
-            if self.current_position >= len(text):
-                break
+            if lexeme in _PUNCTUATION_SET:
+                token = Token(lexeme, TokenType.PUNCTUATION, None, start, line_index + 1, column)
+                append(token)
+                punctuation_append(token)
+                continue
             
-            # Intentar extraer el siguiente token
-            token = self._extract_next_token()
-            if token:
-                self.tokens.append(token)
+            pattern_name = classify(lexeme)
+            if pattern_name:
+                token = Token(lexeme, TokenType.VALID_PATTERN, pattern_name,
+                              start, line_index + 1, column)
+                valid_append(token)
+                pattern_tokens = pattern_index.get(pattern_name)
+                if pattern_tokens is None:
+                    pattern_tokens = pattern_index[pattern_name] = []
+                pattern_tokens.append(token)
+            else:
+                token = Token(lexeme, TokenType.INVALID_TOKEN, None,
+                              start, line_index + 1, column)
+                invalid_append(token)
+            append(token)
         
-        return self.tokens
+        self._set_index(type_index, pattern_index)
+        self.current_position = len(text)
+        self.current_line = len(newlines) + 1
+        self.current_column = len(text) - (newlines[-1] if newlines else -1)
+        
+        return tokens
     
-    def _skip_whitespace(self):
-        """Salta espacios en blanco y actualiza posición"""
-        while (self.current_position < len(self.text) and 
-               self.text[self.current_position].isspace()):
+    def analyze_columnar(self, text: str) -> TokenTable:
+        """
+        Analiza el texto guardando los tokens en una tabla columnar
+        
+        Produce los mismos tokens que analyze(), pero como columnas de enteros
+        en lugar de un objeto Token por token; self.tokens queda apuntando a la
+        tabla y los demás métodos la consultan con máscaras vectorizadas.
+        
+        Args:
+            text: Texto a analizar
+        
+        Returns:
+            TokenTable: Tabla con los tokens encontrados
+        """
+        self.text = text
+        self.tokens = table = TokenTable(text, _TOKEN_TYPES)
+        
+        newlines = [match.start() for match in _NEWLINE.finditer(text)]
+        
+        append = table.append
+        classify = self._classify_token
+        line_index = 0
+        for match in _TOKEN_SCANNER.finditer(text):
+            start, end = match.span()
+            lexeme = match.group()
+            line_index = bisect_right(newlines, start, line_index)
+            column = start - newlines[line_index - 1] if line_index else start + 1
             
-            if self.text[self.current_position] == '\n':
-                self.current_line += 1
-                self.current_column = 1
+            if lexeme in _PUNCTUATION_SET:
+                append(start, end, line_index + 1, column, TokenType.PUNCTUATION)
+                continue
+            
+            pattern_name = classify(lexeme)
+            if pattern_name:
+                append(start, end, line_index + 1, column, TokenType.VALID_PATTERN, pattern_name)
             else:
-                self.current_column += 1
-                
-            self.current_position += 1
+                append(start, end, line_index + 1, column, TokenType.INVALID_TOKEN)
+        
+        self.current_position = len(text)
+        self.current_line = len(newlines) + 1
+        self.current_column = len(text) - (newlines[-1] if newlines else -1)
+        
+        return table
     
-    def _extract_next_token(self) -> Token:
+    def analyze_parallel(self, text: str, workers: Optional[int] = None,
+                         executor: Optional[Executor] = None,
+                         min_shard_size: int = 262144) -> List[Token]:
         """
-        Extrae el siguiente token del texto
+        Analiza el texto repartiéndolo en fragmentos entre varios procesos
+        
+        El texto se corta solo en saltos de línea, así que ningún token queda
+        partido y las columnas no cambian; al unir los resultados se desplazan
+        las posiciones y líneas de cada fragmento. Los tokens, estadísticas y
+        posición final son idénticos a los de analyze().
+        
+        Args:
+            text: Texto a analizar
+            workers: Cantidad de procesos (por defecto, los núcleos disponibles)
+            executor: Ejecutor ya creado a reutilizar entre llamadas (opcional)
+            min_shard_size: Tamaño mínimo de fragmento; textos más cortos se
+                analizan en el proceso actual
         
         Returns:
-            Token: El token extraído o None si no se puede extraer
-        """
-        if self.current_position >= len(self.text):
-            return None
-        
-        # Buscar el final del token actual (hasta el siguiente espacio o final)
-        start_pos = self.current_position
-        start_line = self.current_line
-        start_column = self.current_column
-        
-        # Extraer hasta el siguiente espacio, pero preservar algunos caracteres especiales
-        # que son importantes para patrones como emails e IPs
-        end_pos = start_pos
-        while (end_pos < len(self.text) and 
-               not self.text[end_pos].isspace()):
-            # Si encontramos puntuación que no es parte de patrones comunes, parar
-            char = self.text[end_pos]
-            if char in ',;!?()[]{}"\'':
+            List[Token]: Lista de tokens encontrados
+        """
+        if workers is None:
+            workers = getattr(executor, '_max_workers', None) or os.cpu_count() or 1
+        shards = self._split_shards(text, max(1, min(workers, len(text) // max(1, min_shard_size))))
+        if len(shards) < 2:
+            return self.analyze(text)
+        
+        validator = self.pattern_validator
+        custom_names = validator.custom_patterns
+        custom_patterns = tuple((name, pattern) for name, pattern in validator.patterns.items()
+                                if name in custom_names)
+        arguments = ([self.engine] * len(shards), [self.cache_size] * len(shards),
+                     [custom_patterns] * len(shards), [shard for _, _, shard in shards])
+        
+        own_executor = executor is None
+        if own_executor:
+            executor = ProcessPoolExecutor(max_workers=min(workers, len(shards)))
+        try:
+            results = list(executor.map(_analyze_shard, *arguments))
+        finally:
+            if own_executor:
+                executor.shutdown()
+        
+        # Unión ordenada: desplazar posiciones y líneas de cada fragmento
+        self.text = text
+        self.tokens = tokens = []
+        append = tokens.append
+        types = _TOKEN_TYPES
+        intern = sys.intern
+        for (offset, line_offset, _), (shard_tokens, counters) in zip(shards, results):
+            for lexeme, code, pattern_name, position, line, column in shard_tokens:
+                # Los nombres llegan como copias nuevas al deserializar
+                if pattern_name is not None:
+                    pattern_name = intern(pattern_name)
+                append(Token(lexeme, types[code], pattern_name,
+                             position + offset, line + line_offset, column))
+            self.cache_hits += counters[0]
+            self.cache_misses += counters[1]
+            self.cache_evictions += counters[2]
+        self._build_index()
+        
+        last_newline = text.rfind('\n')
+        self.current_position = len(text)
+        self.current_line = shards[-1][1] + shards[-1][2].count('\n') + 1
+        self.current_column = len(text) - last_newline
+        
+        return tokens
+    
+    @staticmethod
+    def _split_shards(text: str, count: int) -> List[Tuple[int, int, str]]:
+        """
+        Divide el texto en fragmentos de tamaño parecido cortando tras un salto de línea
+        
+        Args:
+            text: Texto a dividir
+            count: Cantidad deseada de fragmentos
+        
+        Returns:
+            List[Tuple[int, int, str]]: (posición inicial, líneas previas, fragmento)
+        """
+        shards = []
+        start = 0
+        line_offset = 0
+        size = len(text) // count if count else len(text)
+        for _ in range(count - 1):
+            cut = text.find('\n', max(start, start + size - 1))
+            if cut < 0:
                 break
-            end_pos += 1
-        
-        # Si no hemos avanzado, es un carácter de puntuación simple
-        if end_pos == start_pos:
-            char = self.text[start_pos]
-            if char in ',;!?()[]{}"\'':
-                lexeme = char
-                self.current_position += 1
-                self.current_column += 1
-                return Token(lexeme, TokenType.PUNCTUATION, None, 
-                           start_pos, start_line, start_column)
-            else:
-                # Carácter desconocido
-                lexeme = char
-                self.current_position += 1
-                self.current_column += 1
-                return Token(lexeme, TokenType.UNKNOWN, None, 
-                           start_pos, start_line, start_column)
-        
-        # Extraer el lexeme
-        lexeme = self.text[start_pos:end_pos]
-        
-        # Actualizar posición
-        self.current_position = end_pos
-        self.current_column += len(lexeme)
-        
-        # Clasificar el token
-        pattern_name = self._classify_token(lexeme)
-        
-        if pattern_name:
-            return Token(lexeme, TokenType.VALID_PATTERN, pattern_name,
-                        start_pos, start_line, start_column)
+            shard = text[start:cut + 1]
+            shards.append((start, line_offset, shard))
+            line_offset += shard.count('\n')
+            start = cut + 1
+        if start < len(text) or not shards:
+            shards.append((start, line_offset, text[start:]))
+        return shards
+    
+    def apply_edit(self, offset: int, delete_len: int,
+                   insert_text: str) -> Tuple[int, List[Token], List[Token]]:
+        """
+        Aplica una edición al texto analizado re-analizando solo la zona afectada
+        
+        Se vuelve a escanear desde el final del último token que la edición no
+        puede alterar hasta que un token nuevo coincide con uno anterior a la
+        derecha de la edición; desde ahí el resto de tokens es el mismo, solo
+        desplazado. Ese desplazamiento de posición y línea se registra como
+        pendiente y se aplica al leer self.tokens, así que varias ediciones
+        seguidas no recorren la lista completa. Las columnas solo cambian en la
+        línea donde termina la edición y se corrigen de inmediato.
+        
+        Args:
+            offset: Posición donde empieza la edición
+            delete_len: Cantidad de caracteres eliminados desde offset
+            insert_text: Texto insertado en offset
+        
+        Returns:
+            Tuple[int, List[Token], List[Token]]: Índice del primer token
+            reemplazado, tokens eliminados y tokens nuevos en su lugar
+        
+        Raises:
+            ValueError: Si la edición está fuera del texto o el análisis no
+                conserva el texto (analyze_file)
+        """
+        text = self.text
+        if len(text) != self.current_position:
+            raise ValueError("El análisis actual no conserva el texto; no se puede editar")
+        if offset < 0 or delete_len < 0 or offset + delete_len > len(text):
+            raise ValueError(f"Edición fuera del texto: offset={offset}, delete_len={delete_len}")
+        
+        old_end = offset + delete_len
+        delta = len(insert_text) - delete_len
+        line_delta = insert_text.count('\n') - text.count('\n', offset, old_end)
+        new_text = text[:offset] + insert_text + text[old_end:]
+        
+        if isinstance(self._tokens, TokenTable):
+            # La tabla columnar no admite reemplazos parciales
+            removed = list(self._tokens)
+            inserted = list(self.analyze_columnar(new_text))
+            return 0, removed, inserted
+        
+        tokens = self._tokens
+        first = self._first_token_ending_at(offset)
+        
+        # Reanudar el escaneo tras el token anterior: ese token y todo lo que
+        # lo precede quedan iguales porque terminan antes de la edición
+        if first:
+            previous = tokens[first - 1]
+            scan_from = self._true_position(first - 1) + len(previous.lexeme)
+            line = self._true_line(first - 1)
+        else:
+            scan_from = 0
+            line = 1
+        line_start = new_text.rfind('\n', 0, scan_from) + 1
+        
+        # Re-escanear hasta sincronizar con un token anterior desplazado
+        inserted = []
+        classify = self._classify_token
+        sync = len(tokens)
+        cursor = first
+        stable_from = offset + len(insert_text)
+        previous_end = scan_from
+        for match in _TOKEN_SCANNER.finditer(new_text, scan_from):
+            start, end = match.span()
+            if start >= stable_from:
+                old_start = start - delta
+                while cursor < len(tokens) and self._true_position(cursor) < old_start:
+                    cursor += 1
+                if (cursor < len(tokens) and self._true_position(cursor) == old_start
+                        and len(tokens[cursor].lexeme) == end - start):
+                    sync = cursor
+                    break
+            
+            newline_count = new_text.count('\n', previous_end, start)
+            if newline_count:
+                line += newline_count
+                line_start = new_text.rfind('\n', previous_end, start) + 1
+            previous_end = end
+            
+            lexeme = match.group()
+            column = start - line_start + 1
+            if lexeme in _PUNCTUATION_SET:
+                inserted.append(Token(lexeme, TokenType.PUNCTUATION, None, start, line, column))
+                continue
+            pattern_name = classify(lexeme)
+            token_type = TokenType.VALID_PATTERN if pattern_name else TokenType.INVALID_TOKEN
+            inserted.append(Token(lexeme, token_type, pattern_name, start, line, column))
+        
+        # Columnas de los tokens que siguen en la línea donde termina la edición
+        if sync < len(tokens):
+            sync_start = self._true_position(sync)
+            if text.find('\n', old_end, sync_start) < 0:
+                sync_line = self._true_line(sync)
+                column_delta = ((sync_start + delta) - (new_text.rfind('\n', 0, sync_start + delta) + 1) + 1
+                                - tokens[sync].column)
+                if column_delta:
+                    index = sync
+                    while index < len(tokens) and self._true_line(index) == sync_line:
+                        tokens[index].column += column_delta
+                        index += 1
+        
+        # Combinar con el desplazamiento pendiente: la cola recibe ambos y los
+        # tokens entre las dos ediciones se corrigen ahora
+        pending_from, pending_position, pending_line = self._shift_from, self._shift_position, self._shift_line
+        if pending_position or pending_line:
+            if pending_from < first:
+                self._apply_shift(pending_from, first, pending_position, pending_line)
+            elif pending_from > sync:
+                self._apply_shift(sync, pending_from, -pending_position, -pending_line)
+            # Los tokens reemplazados se devuelven con su posición y línea reales
+            self._apply_shift(max(first, pending_from), sync, pending_position, pending_line)
         else:
-            return Token(lexeme, TokenType.INVALID_TOKEN, None,
-                        start_pos, start_line, start_column)
+            pending_position = pending_line = 0
+        
+        removed = tokens[first:sync]
+        tokens[first:sync] = inserted
+        self._update_counts(removed, inserted)
+        self.generation += 1
+        self._shift_from = first + len(inserted)
+        self._shift_position = pending_position + delta
+        self._shift_line = pending_line + line_delta
+        
+        self.text = new_text
+        self.current_position = len(new_text)
+        self.current_line += line_delta
+        self.current_column = len(new_text) - new_text.rfind('\n')
+        return first, removed, inserted
     
-    def _is_part_of_pattern(self, start_pos: int, current_pos: int) -> bool:
+    def _update_counts(self, removed: List[Token], inserted: List[Token]):
         """
-        Determina si el carácter actual podría ser parte de un patrón válido
+        Corrige los conteos con los tokens de una edición e invalida los índices
+        
+        Los índices se reconstruyen en la siguiente consulta; los conteos se
+        mantienen al día para que get_statistics() no recorra los tokens.
         """
-        if current_pos >= len(self.text):
-            return False
+        self._type_index = self._pattern_index = None
+        if self._type_counts is None:
+            return
+        type_counts, pattern_counts = self._type_counts, self._pattern_counts
+        for tokens, sign in ((removed, -1), (inserted, 1)):
+            for token in tokens:
+                type_counts[token.token_type] += sign
+                if token.token_type == TokenType.VALID_PATTERN:
+                    count = pattern_counts.get(token.pattern_name, 0) + sign
+                    if count:
+                        pattern_counts[token.pattern_name] = count
+                    else:
+                        del pattern_counts[token.pattern_name]
+    
+    def _true_position(self, index: int) -> int:
+        """Posición real de un token, contando el desplazamiento pendiente"""
+        position = self._tokens[index].position
+        return position + self._shift_position if index >= self._shift_from else position
+    
+    def _true_line(self, index: int) -> int:
+        """Línea real de un token, contando el desplazamiento pendiente"""
+        line = self._tokens[index].line
+        return line + self._shift_line if index >= self._shift_from else line
+    
+    def _first_token_ending_at(self, offset: int) -> int:
+        """Índice del primer token cuyo final es mayor o igual que offset"""
+        tokens = self._tokens
+        low, high = 0, len(tokens)
+        while low < high:
+            middle = (low + high) // 2
+            if self._true_position(middle) + len(tokens[middle].lexeme) < offset:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+    
+    def _apply_shift(self, start: int, stop: int, position_delta: int, line_delta: int):
+        """Suma un desplazamiento de posición y línea a los tokens [start, stop)"""
+        for token in self._tokens[start:stop]:
+            token.position += position_delta
+            token.line += line_delta
+    
+    def analyze_stream(self, fileobj: IO, chunk_size: int = 65536,
+                       encoding: str = 'utf-8') -> Iterator[Token]:
+        """
+        Analiza un archivo por bloques y genera los tokens a medida que aparecen
+        
+        No conserva el texto ni los tokens (self.tokens no se modifica), así que
+        la memoria no depende del tamaño de la entrada. Un lexema que queda
+        cortado al final de un bloque se arrastra al siguiente, y las posiciones,
+        líneas y columnas son absolutas y coinciden con las de analyze().
         
-        char = self.text[current_pos]
-        # Permitir puntos, arrobas, guiones, dos puntos como parte de patrones
-        if char in '.@-:/#':
-            return True
+        Args:
+            fileobj: Objeto tipo archivo abierto en modo texto o binario
+            chunk_size: Cantidad de caracteres (o bytes) a leer por bloque
+            encoding: Codificación usada si el archivo entrega bytes
         
-        return False
+        Yields:
+            Token: Cada token en orden de aparición
+        """
+        decoder = None
+        carry = ""
+        base = 0          # Posición absoluta del primer carácter del búfer
+        line = 1          # Línea del primer carácter del búfer
+        column_base = 0   # Caracteres entre el inicio de esa línea y el búfer
+        classify = self._classify_token
+        
+        while True:
+            chunk = fileobj.read(chunk_size)
+            at_eof = not chunk
+            if isinstance(chunk, bytes):
+                if decoder is None:
+                    decoder = codecs.getincrementaldecoder(encoding)()
+                chunk = decoder.decode(chunk, final=at_eof)
+            
+            buffer = carry + chunk
+            newlines = [match.start() for match in _NEWLINE.finditer(buffer)]
+            consumed = len(buffer)
+            line_index = 0
+            
+            for match in _TOKEN_SCANNER.finditer(buffer):
+                start = match.start()
+                lexeme = match.group()
+                if not at_eof and match.end() == len(buffer) and lexeme not in _PUNCTUATION_SET:
+                    # El lexema puede continuar en el siguiente bloque
+                    consumed = start
+                    break
+                
+                line_index = bisect_right(newlines, start, line_index)
+                column = start - newlines[line_index - 1] if line_index else column_base + start + 1
+                
+                if lexeme in _PUNCTUATION_SET:
+                    yield Token(lexeme, TokenType.PUNCTUATION, None,
+                                base + start, line + line_index, column)
+                    continue
+                
+                pattern_name = classify(lexeme)
+                if pattern_name:
+                    yield Token(lexeme, TokenType.VALID_PATTERN, pattern_name,
+                                base + start, line + line_index, column)
+                else:
+                    yield Token(lexeme, TokenType.INVALID_TOKEN, None,
+                                base + start, line + line_index, column)
+            
+            # Avanzar el origen hasta el inicio del texto arrastrado
+            consumed_newlines = bisect_left(newlines, consumed)
+            if consumed_newlines:
+                line += consumed_newlines
+                column_base = consumed - newlines[consumed_newlines - 1] - 1
+            else:
+                column_base += consumed
+            base += consumed
+            carry = buffer[consumed:]
+            
+            if at_eof:
+                break
+        
+        self.current_position = base
+        self.current_line = line
+        self.current_column = column_base + 1
+    
+    def analyze_file(self, path: str) -> List[Token]:
+        """
+        Analiza un archivo UTF-8 mapeándolo en memoria
+        
+        Equivale a analyze() sobre el contenido decodificado, pero el archivo
+        nunca se carga completo como str: solo se decodifica cada lexema.
+        
+        Args:
+            path: Ruta del archivo
+        
+        Returns:
+            List[Token]: Lista de tokens encontrados
+        """
+        self.text = ""
+        self.tokens = list(self.iter_file(path))
+        self._build_index()
+        return self.tokens
+    
+    def iter_file(self, path: str) -> Iterator[Token]:
+        """
+        Genera los tokens de un archivo UTF-8 mapeado en memoria (mmap)
+        
+        El escaneo y la clasificación de lexemas ASCII trabajan directamente
+        sobre los bytes; un lexema se decodifica solo al materializar su Token.
+        Las posiciones se expresan en caracteres, igual que en analyze().
+        
+        Args:
+            path: Ruta del archivo
+        
+        Yields:
+            Token: Cada token en orden de aparición
+        """
+        classify = self._classify_token
+        char_position = 0   # Posición en caracteres del byte previous_end
+        previous_end = 0
+        line = 1
+        column = 1
+        
+        with open(path, 'rb') as handle:
+            if handle.seek(0, 2) == 0:
+                # mmap no admite archivos vacíos
+                self.current_position, self.current_line, self.current_column = 0, 1, 1
+                return
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                for match in _BYTES_TOKEN_SCANNER.finditer(data):
+                    start, end = match.span()
+                    
+                    # Entre coincidencias solo hay espacios ASCII: 1 byte = 1 carácter
+                    if start > previous_end:
+                        gap = data[previous_end:start]
+                        newline_count = gap.count(b'\n')
+                        if newline_count:
+                            line += newline_count
+                            column = len(gap) - gap.rfind(b'\n')
+                        else:
+                            column += len(gap)
+                        char_position += len(gap)
+                    previous_end = end
+                    
+                    lexeme = match.group()
+                    if end - start == 1 and lexeme[0] in _PUNCTUATION_BYTES:
+                        yield Token(lexeme.decode('ascii'), TokenType.PUNCTUATION, None,
+                                    char_position, line, column)
+                        char_position += 1
+                        column += 1
+                        continue
+                    
+                    if lexeme.isascii():
+                        pattern_name = classify(lexeme)
+                        token_type = TokenType.VALID_PATTERN if pattern_name else TokenType.INVALID_TOKEN
+                        yield Token(lexeme.decode('ascii'), token_type, pattern_name,
+                                    char_position, line, column)
+                        char_position += end - start
+                        column += end - start
+                        continue
+                    
+                    # Secuencia con caracteres no ASCII: puede contener espacios
+                    # Unicode, así que se escanea de nuevo como texto
+                    text = lexeme.decode('utf-8')
+                    for sub_match in _TOKEN_SCANNER.finditer(text):
+                        sub_start = sub_match.start()
+                        sub_lexeme = sub_match.group()
+                        if sub_lexeme in _PUNCTUATION_SET:
+                            yield Token(sub_lexeme, TokenType.PUNCTUATION, None,
+                                        char_position + sub_start, line, column + sub_start)
+                            continue
+                        pattern_name = classify(sub_lexeme)
+                        token_type = TokenType.VALID_PATTERN if pattern_name else TokenType.INVALID_TOKEN
+                        yield Token(sub_lexeme, token_type, pattern_name,
+                                    char_position + sub_start, line, column + sub_start)
+                    char_position += len(text)
+                    column += len(text)
+                
+                tail = data[previous_end:]
+        
+        newline_count = tail.count(b'\n')
+        if newline_count:
+            line += newline_count
+            column = len(tail) - tail.rfind(b'\n')
+        else:
+            column += len(tail)
+        self.current_position = char_position + len(tail)
+        self.current_line = line
+        self.current_column = column
     
     def _classify_token(self, lexeme: str) -> str:
         """
@@ -181,11 +800,60 @@ class LexicalAnalyzer:
         Returns:
             str: Nombre del patrón si coincide, None si no coincide con ninguno
         """
-        for pattern_name in self.pattern_validator.get_available_patterns():
-            if self.pattern_validator.validate_pattern(lexeme, pattern_name):
-                return pattern_name
+        cache = self._classification_cache
+        key = (self.pattern_validator.version, lexeme)
+        try:
+            pattern_name = cache[key]
+        except KeyError:
+            pass
+        else:
+            cache.move_to_end(key)
+            self.cache_hits += 1
+            return pattern_name
+        
+        # Una sola llamada al motor de clasificación configurado
+        self.cache_misses += 1
+        if isinstance(lexeme, bytes):
+            # Lexema ASCII leído de un archivo mapeado en memoria
+            if self.engine == 'regex':
+                pattern_name = self.pattern_validator.classify_bytes(lexeme)
+            else:
+                pattern_name = self.classifier.classify(lexeme.decode('ascii'))
+        else:
+            pattern_name = self.classifier.classify(lexeme)
+        if pattern_name is not None:
+            # Una sola copia de cada nombre, compartida por todos los tokens
+            pattern_name = sys.intern(pattern_name)
+        if self.cache_size > 0:
+            cache[key] = pattern_name
+            if len(cache) > self.cache_size:
+                cache.popitem(last=False)
+                self.cache_evictions += 1
+        return pattern_name
+    
+    def get_cache_statistics(self) -> Dict[str, Any]:
+        """
+        Obtiene los contadores de la caché de clasificaciones
         
-        return None
+        Returns:
+            Dict[str, Any]: Aciertos, fallos, desalojos, tamaño y capacidad
+        """
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'evictions': self.cache_evictions,
+            'size': len(self._classification_cache),
+            'capacity': self.cache_size,
+            'hit_ratio': self.cache_hits / lookups if lookups else 0,
+        }
+    
+    def clear_cache(self):
+        """Vacía la caché de clasificaciones y reinicia sus contadores"""
+        self._classification_cache.clear()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_evictions = 0
     
     def get_statistics(self) -> Dict[str, Any]:
         """
@@ -194,29 +862,38 @@ class LexicalAnalyzer:
         Returns:
             Dict[str, Any]: Diccionario con estadísticas
         """
-        if not self.tokens:
+        if not self._tokens:
             return {}
         
-        valid_tokens = [t for t in self.tokens if t.token_type == TokenType.VALID_PATTERN]
-        invalid_tokens = [t for t in self.tokens if t.token_type == TokenType.INVALID_TOKEN]
-        punctuation_tokens = [t for t in self.tokens if t.token_type == TokenType.PUNCTUATION]
+        if isinstance(self._tokens, TokenTable):
+            # Conteos vectorizados sobre las columnas de la tabla
+            type_counts = self.tokens.count_by_type()
+            valid_count = type_counts[TokenType.VALID_PATTERN]
+            return {
+                'total_tokens': len(self.tokens),
+                'valid_tokens': valid_count,
+                'invalid_tokens': type_counts[TokenType.INVALID_TOKEN],
+                'punctuation_tokens': type_counts[TokenType.PUNCTUATION],
+                'pattern_counts': self.tokens.count_by_pattern(),
+                'valid_percentage': (valid_count / len(self.tokens)) * 100,
+                'lines_processed': self.current_line,
+                'cache': self.get_cache_statistics(),
+            }
         
-        # Contar por tipos de patrones
-        pattern_counts = {}
-        for token in valid_tokens:
-            if token.pattern_name in pattern_counts:
-                pattern_counts[token.pattern_name] += 1
-            else:
-                pattern_counts[token.pattern_name] = 1
+        # Conteos mantenidos por el escaneo y por apply_edit
+        type_counts, pattern_counts = self._get_counts()
+        total = len(self._tokens)
+        valid_count = type_counts[TokenType.VALID_PATTERN]
         
         return {
-            'total_tokens': len(self.tokens),
-            'valid_tokens': len(valid_tokens),
-            'invalid_tokens': len(invalid_tokens),
-            'punctuation_tokens': len(punctuation_tokens),
-            'pattern_counts': pattern_counts,
-            'valid_percentage': (len(valid_tokens) / len(self.tokens)) * 100 if self.tokens else 0,
+            'total_tokens': total,
+            'valid_tokens': valid_count,
+            'invalid_tokens': type_counts[TokenType.INVALID_TOKEN],
+            'punctuation_tokens': type_counts[TokenType.PUNCTUATION],
+            'pattern_counts': dict(pattern_counts),
+            'valid_percentage': (valid_count / total) * 100 if total else 0,
             'lines_processed': self.current_line,
+            'cache': self.get_cache_statistics(),
         }
     
     def get_tokens_by_type(self, token_type: TokenType) -> List[Token]:
@@ -229,7 +906,12 @@ class LexicalAnalyzer:
         Returns:
             List[Token]: Lista de tokens del tipo especificado
         """
-        return [token for token in self.tokens if token.token_type == token_type]
+        if isinstance(self.tokens, TokenTable):
+            return self.tokens.select(self.tokens.type_mask(token_type))
+        # Aplicar cualquier desplazamiento pendiente antes de entregar tokens
+        self._flush_shift()
+        type_index, _ = self._get_index()
+        return list(type_index.get(token_type, ()))
     
     def get_tokens_by_pattern(self, pattern_name: str) -> List[Token]:
         """
@@ -241,9 +923,126 @@ class LexicalAnalyzer:
         Returns:
             List[Token]: Lista de tokens que coinciden con el patrón
         """
-        return [token for token in self.tokens 
-                if token.token_type == TokenType.VALID_PATTERN and 
-                token.pattern_name == pattern_name]
+        if isinstance(self.tokens, TokenTable):
+            # Solo los tokens válidos tienen patrón asignado
+            return self.tokens.select(self.tokens.pattern_mask(pattern_name))
+        self._flush_shift()
+        _, pattern_index = self._get_index()
+        return list(pattern_index.get(pattern_name, ()))
+    
+    def get_position_index(self) -> PositionIndex:
+        """
+        Obtiene el índice posicional de los tokens actuales
+        
+        Se construye en la primera consulta tras cada análisis o edición; con
+        tokens en una TokenTable usa directamente sus columnas, sin copiarlas.
+        
+        Returns:
+            PositionIndex: Índice de inicios, finales y líneas
+        """
+        index = self._position_index
+        if index is None or index.generation != self.generation:
+            tokens = self.tokens
+            if isinstance(tokens, TokenTable):
+                index = PositionIndex(tokens.starts, tokens.ends, tokens.lines, self.generation)
+            else:
+                index = PositionIndex.from_tokens(tokens, self.generation)
+            self._position_index = index
+        return index
+    
+    def get_token_at(self, offset: int) -> Optional[Token]:
+        """
+        Obtiene el token que cubre una posición del texto
+        
+        Args:
+            offset: Posición en caracteres
+        
+        Returns:
+            Optional[Token]: Token en esa posición, o None si no hay ninguno
+        """
+        index = self.get_position_index().token_at(offset)
+        return self.tokens[index] if index is not None else None
+    
+    def get_tokens_in_range(self, start: int, end: int) -> List[Token]:
+        """
+        Obtiene los tokens que se superponen con un rango de posiciones
+        
+        Args:
+            start: Posición inicial del rango
+            end: Posición final (exclusiva) del rango
+        
+        Returns:
+            List[Token]: Tokens del rango en orden de aparición
+        """
+        first, last = self.get_position_index().offset_range(start, end)
+        return self.tokens[first:last]
+    
+    def get_tokens_in_lines(self, first_line: int, last_line: int) -> List[Token]:
+        """
+        Obtiene los tokens ubicados entre dos líneas, ambas incluidas
+        
+        Args:
+            first_line: Primera línea del rango
+            last_line: Última línea del rango
+        
+        Returns:
+            List[Token]: Tokens de esas líneas en orden de aparición
+        """
+        first, last = self.get_position_index().line_range(first_line, last_line)
+        return self.tokens[first:last]
+    
+    def count_tokens_by_type(self, token_type: TokenType) -> int:
+        """
+        Cuenta los tokens de un tipo sin recorrerlos
+        
+        Args:
+            token_type: Tipo de token a contar
+        
+        Returns:
+            int: Cantidad de tokens del tipo especificado
+        """
+        if isinstance(self._tokens, TokenTable):
+            return self._tokens.count_by_type().get(token_type, 0)
+        type_counts, _ = self._get_counts()
+        return type_counts.get(token_type, 0)
+    
+    def get_pattern_counts(self) -> Dict[str, int]:
+        """
+        Obtiene la cantidad de tokens válidos de cada patrón sin recorrerlos
+        
+        Returns:
+            Dict[str, int]: Patrón -> cantidad de tokens
+        """
+        if isinstance(self._tokens, TokenTable):
+            return self._tokens.count_by_pattern()
+        _, pattern_counts = self._get_counts()
+        return dict(pattern_counts)
+    
+    def get_first_appearance_order(self) -> Tuple[List[TokenType], List[str]]:
+        """
+        Obtiene los tipos y patrones presentes en el orden en que aparecen por primera vez
+        
+        Recorre los tokens solo hasta haberlos visto todos y sin aplicar el
+        desplazamiento pendiente de apply_edit, que no cambia tipos ni patrones.
+        
+        Returns:
+            Tuple[List[TokenType], List[str]]: Tipos y nombres de patrón
+        """
+        if isinstance(self._tokens, TokenTable):
+            type_total = sum(1 for count in self._tokens.count_by_type().values() if count)
+            pattern_total = len(self._tokens.pattern_names)
+        else:
+            type_counts, pattern_counts = self._get_counts()
+            type_total = sum(1 for count in type_counts.values() if count)
+            pattern_total = len(pattern_counts)
+        token_types, pattern_names = {}, {}
+        for token in self._tokens:
+            token_types[token.token_type] = None
+            if token.pattern_name:
+                pattern_names[token.pattern_name] = None
+            if len(token_types) == type_total and len(pattern_names) == pattern_total:
+                break
+        return list(token_types), list(pattern_names)
     
     def generate_report(self) -> str:
         """
@@ -260,7 +1059,7 @@ class LexicalAnalyzer:
             "="*60,
             "REPORTE DE ANÁLISIS LÉXICO",
             "="*60,
-            f"Texto analizado: {len(self.text)} caracteres",
+            f"Texto analizado: {self.current_position} caracteres",
             f"Líneas procesadas: {stats['lines_processed']}",
             f"Total de tokens: {stats['total_tokens']}",
             "",
@@ -0,0 +1,94 @@
+"""
+Position Index: Índice posicional de tokens para consultas por rango
+Guarda en arreglos ordenados el inicio, el final y la línea de cada token para
+responder con búsqueda binaria qué tokens ocupan un rango de posiciones o de
+líneas, sin recorrer la lista completa
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Optional, Sequence, Tuple
+
+
+class PositionIndex:
+    """Arreglos ordenados de inicios, finales y líneas de una secuencia de tokens"""
+    
+    def __init__(self, starts: Sequence[int], ends: Sequence[int], lines: Sequence[int],
+                 generation: int = 0):
+        """
+        Args:
+            starts: Posición inicial de cada token, en orden creciente
+            ends: Posición final (exclusiva) de cada token, en orden creciente
+            lines: Línea de cada token, en orden no decreciente
+            generation: Versión de los tokens a partir de la que se construyó
+        """
+        self.starts = starts
+        self.ends = ends
+        self.lines = lines
+        self.generation = generation
+    
+    @classmethod
+    def from_tokens(cls, tokens, generation: int = 0) -> 'PositionIndex':
+        """
+        Construye el índice a partir de una lista de tokens
+        
+        Args:
+            tokens: Tokens en orden de aparición
+            generation: Versión de los tokens
+        
+        Returns:
+            PositionIndex: Índice con una entrada por token
+        """
+        starts = array('q', [token.position for token in tokens])
+        ends = array('q', [token.position + len(token.lexeme) for token in tokens])
+        lines = array('q', [token.line for token in tokens])
+        return cls(starts, ends, lines, generation)
+    
+    def __len__(self) -> int:
+        return len(self.starts)
+    
+    def token_at(self, offset: int) -> Optional[int]:
+        """
+        Busca el token que cubre una posición del texto
+        
+        Args:
+            offset: Posición en caracteres
+        
+        Returns:
+            Optional[int]: Índice del token, o None si la posición cae en un
+            espacio entre tokens o fuera del texto
+        """
+        index = bisect_right(self.starts, offset) - 1
+        if index >= 0 and offset < self.ends[index]:
+            return index
+        return None
+    
+    def offset_range(self, start: int, end: int) -> Tuple[int, int]:
+        """
+        Obtiene los tokens que se superponen con el rango de posiciones [start, end)
+        
+        Args:
+            start: Posición inicial del rango
+            end: Posición final (exclusiva) del rango
+        
+        Returns:
+            Tuple[int, int]: Índices [primero, último) de los tokens
+        """
+        first = bisect_right(self.ends, start)
+        last = bisect_left(self.starts, end)
+        return first, max(first, last)
+    
+    def line_range(self, first_line: int, last_line: int) -> Tuple[int, int]:
+        """
+        Obtiene los tokens ubicados entre dos líneas, ambas incluidas
+        
+        Args:
+            first_line: Primera línea del rango
+            last_line: Última línea del rango
+        
+        Returns:
+            Tuple[int, int]: Índices [primero, último) de los tokens
+        """
+        first = bisect_left(self.lines, first_line)
+        last = bisect_right(self.lines, last_line)
+        return first, max(first, last)
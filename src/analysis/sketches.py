@@ -0,0 +1,110 @@
+"""
+Sketches: Estructuras aproximadas de memoria acotada para corpus muy grandes
+Implementa HyperLogLog para contar elementos distintos sin guardarlos
+"""
+
+from collections import Counter
+from hashlib import blake2b
+from typing import Iterable
+import math
+
+
+class HyperLogLog:
+    """
+    Contador aproximado de elementos distintos (Flajolet et al., 2007)
+    
+    Usa 2**precision registros de un byte, sin importar cuántos elementos se
+    agreguen. El error estándar relativo de la estimación es
+    1.04 / sqrt(2**precision): con la precisión por defecto (14) son 16 KiB y
+    un error típico de 0.81 % (menos de 2.5 % en el 99 % de los casos).
+    Para cardinalidades pequeñas se usa conteo lineal, que es casi exacto.
+    
+    El hash es blake2b de 64 bits y no depende de PYTHONHASHSEED, así que los
+    sketches de distintos procesos se pueden combinar con merge().
+    """
+    
+    def __init__(self, precision: int = 14):
+        """
+        Args:
+            precision: Bits del hash usados para elegir el registro (4 a 18)
+        """
+        if not 4 <= precision <= 18:
+            raise ValueError(f"Precisión fuera de rango: {precision}. Debe estar entre 4 y 18")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+        self._rank_bits = 64 - precision
+        self._rank_mask = (1 << self._rank_bits) - 1
+    
+    def add(self, value: str):
+        """
+        Agrega un elemento
+        
+        Args:
+            value: Texto a contar
+        """
+        digest = blake2b(value.encode('utf-8', 'surrogatepass'), digest_size=8).digest()
+        hashed = int.from_bytes(digest, 'big')
+        index = hashed >> self._rank_bits
+        # Posición del primer bit en 1 dentro de los bits restantes
+        rank = self._rank_bits - (hashed & self._rank_mask).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+    
+    def update(self, values: Iterable[str]):
+        """Agrega varios elementos"""
+        for value in values:
+            self.add(value)
+    
+    def merge(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        """
+        Combina con otro sketch: el resultado estima la unión de ambos conjuntos
+        
+        Args:
+            other: Sketch con la misma precisión
+        
+        Returns:
+            HyperLogLog: Este mismo sketch, ya combinado
+        """
+        if other.precision != self.precision:
+            raise ValueError("Solo se pueden combinar sketches con la misma precisión")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+    
+    def __ior__(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        return self.merge(other)
+    
+    def copy(self) -> 'HyperLogLog':
+        """Obtiene una copia independiente del sketch"""
+        duplicate = HyperLogLog(self.precision)
+        duplicate.registers = bytearray(self.registers)
+        return duplicate
+    
+    def count(self) -> int:
+        """
+        Estima la cantidad de elementos distintos agregados
+        
+        Returns:
+            int: Estimación de la cardinalidad
+        """
+        size = len(self.registers)
+        histogram = Counter(self.registers)
+        harmonic_sum = sum(count * 2.0 ** -rank for rank, count in histogram.items())
+        alpha = 0.7213 / (1 + 1.079 / size)
+        estimate = alpha * size * size / harmonic_sum
+        empty = histogram.get(0, 0)
+        if estimate <= 2.5 * size and empty:
+            # Corrección para rangos pequeños: conteo lineal
+            estimate = size * math.log(size / empty)
+        return int(round(estimate))
+    
+    def __len__(self) -> int:
+        return self.count()
+    
+    @property
+    def relative_error(self) -> float:
+        """Error estándar relativo teórico de la estimación"""
+        return 1.04 / math.sqrt(len(self.registers))
+    
+    def memory_usage(self) -> int:
+        """Bytes ocupados por los registros"""
+        return len(self.registers)
@@ -9,13 +9,29 @@ from collections import Counter
 import statistics
 from datetime import datetime
 import os
+from .accumulators import TextAccumulator, TokenAccumulator, exact_mean
+from .history import AnalysisHistory, CSV_FIELDS
 
 
 class StatisticsAnalyzer:
     """Analizador estadístico para resultados de análisis léxico"""
     
-    def __init__(self):
-        self.analysis_history = []
+    def __init__(self, approximate: bool = False, history_size: int = 100,
+                 history_path: str = None):
+        """
+        Args:
+            approximate: Modo aproximado para corpus enormes. Las cantidades de
+                elementos distintos (unique_tokens, token_diversity,
+                lexical_diversity y unique_values/diversity por patrón) se
+                estiman con HyperLogLog: memoria fija de 16 KiB por conteo y
+                error relativo típico de 0.81 %. El resto de métricas,
+                incluida la mediana, sigue siendo exacto.
+            history_size: Análisis completos que se conservan en memoria
+            history_path: Archivo JSONL para los análisis más antiguos (por
+                defecto, un archivo temporal)
+        """
+        self.approximate = approximate
+        self.analysis_history = AnalysisHistory(history_size, history_path)
         self.current_analysis = {}
     
     def analyze_results(self, tokens: List, text: str, analysis_stats: Dict[str, Any]) -> Dict[str, Any]:
@@ -27,85 +43,116 @@ class StatisticsAnalyzer:
             text: Texto original analizado
             analysis_stats: Estadísticas básicas del análisis
         
+        Returns:
+            Dict con estadísticas avanzadas
+        """
+        # Un solo recorrido del texto y uno de los tokens; todas las métricas
+        # se derivan de los totales acumulados
+        text_totals = TextAccumulator(self.approximate)
+        text_totals.update(text)
+        token_totals = TokenAccumulator(self.approximate)
+        token_totals.update(tokens)
+        
+        return self.analyze_accumulators(text_totals, token_totals, analysis_stats)
+    
+    def analyze_accumulators(self, text_totals: TextAccumulator, token_totals: TokenAccumulator,
+                             analysis_stats: Dict[str, Any], record: bool = True) -> Dict[str, Any]:
+        """
+        Realiza el análisis estadístico a partir de totales ya acumulados
+        
+        Permite obtener las estadísticas de un corpus procesado por fragmentos,
+        bloques o procesos: cada parte acumula sus totales y se combinan con
+        merge() antes de llamar a este método. El resultado es el mismo que el
+        de analyze_results sobre el texto y los tokens completos.
+        
+        Args:
+            text_totals: Totales del texto
+            token_totals: Totales de los tokens
+            analysis_stats: Estadísticas básicas del análisis
+            record: Guardar el resultado en el historial; con False solo pasa a
+                ser el análisis actual (por ejemplo, al recalcular tras una
+                edición del mismo texto)
+        
         Returns:
             Dict con estadísticas avanzadas
         """
         stats = {
             'timestamp': datetime.now().isoformat(),
-            'text_analysis': self._analyze_text_properties(text),
-            'token_analysis': self._analyze_tokens(tokens),
-            'pattern_analysis': self._analyze_patterns(tokens),
-            'performance_metrics': self._calculate_performance_metrics(tokens, text),
+            'text_analysis': self._analyze_text_properties(text_totals),
+            'token_analysis': self._analyze_tokens(token_totals),
+            'pattern_analysis': self._analyze_patterns(token_totals),
+            'performance_metrics': self._calculate_performance_metrics(token_totals, text_totals),
             'quality_metrics': self._calculate_quality_metrics(analysis_stats),
-            'distribution_analysis': self._analyze_distributions(tokens),
-            'complexity_analysis': self._analyze_complexity(text, tokens)
+            'distribution_analysis': self._analyze_distributions(token_totals),
+            'complexity_analysis': self._analyze_complexity(text_totals, token_totals)
         }
         
         # Guardar en historial
-        self.analysis_history.append(stats)
+        if record:
+            self.analysis_history.append(stats)
         self.current_analysis = stats
         
         return stats
     
-    def _analyze_text_properties(self, text: str) -> Dict[str, Any]:
+    def _analyze_text_properties(self, text_totals: TextAccumulator) -> Dict[str, Any]:
         """Analiza propiedades del texto original"""
-        words = text.split()
-        lines = text.split('\n')
+        length = text_totals.character_count
+        classes = text_totals.class_counts()
+        words = text_totals.word_count
+        # split('\n') produce una línea más que saltos de línea
+        line_count = text_totals.newline_count + 1
         
         return {
-            'character_count': len(text),
-            'word_count': len(words),
-            'line_count': len(lines),
-            'avg_word_length': statistics.mean([len(word) for word in words]) if words else 0,
-            'avg_line_length': statistics.mean([len(line) for line in lines]) if lines else 0,
-            'whitespace_ratio': text.count(' ') / len(text) if text else 0,
-            'punctuation_count': sum(1 for c in text if not c.isalnum() and not c.isspace()),
-            'uppercase_ratio': sum(1 for c in text if c.isupper()) / len(text) if text else 0,
-            'lowercase_ratio': sum(1 for c in text if c.islower()) / len(text) if text else 0,
-            'digit_ratio': sum(1 for c in text if c.isdigit()) / len(text) if text else 0
+            'character_count': length,
+            'word_count': words,
+            'line_count': line_count,
+            'avg_word_length': exact_mean(length - classes['space'], words) if words else 0,
+            'avg_line_length': exact_mean(length - text_totals.newline_count, line_count),
+            'whitespace_ratio': text_totals.char_counts[' '] / length if length else 0,
+            'punctuation_count': classes['punctuation'],
+            'uppercase_ratio': classes['upper'] / length if length else 0,
+            'lowercase_ratio': classes['lower'] / length if length else 0,
+            'digit_ratio': classes['digit'] / length if length else 0
         }
     
-    def _analyze_tokens(self, tokens: List) -> Dict[str, Any]:
+    def _analyze_tokens(self, token_totals: TokenAccumulator) -> Dict[str, Any]:
         """Analiza propiedades de los tokens"""
-        if not tokens:
+        total = token_totals.total
+        if not total:
             return {}
         
-        token_lengths = [len(token.lexeme) for token in tokens]
-        valid_tokens = [t for t in tokens if hasattr(t, 'pattern_name') and t.pattern_name]
-        
         return {
-            'total_tokens': len(tokens),
-            'avg_token_length': statistics.mean(token_lengths),
-            'median_token_length': statistics.median(token_lengths),
-            'min_token_length': min(token_lengths),
-            'max_token_length': max(token_lengths),
-            'token_length_std': statistics.stdev(token_lengths) if len(token_lengths) > 1 else 0,
-            'valid_token_count': len(valid_tokens),
-            'valid_token_ratio': len(valid_tokens) / len(tokens) if tokens else 0,
-            'unique_tokens': len(set(token.lexeme for token in tokens)),
-            'token_diversity': len(set(token.lexeme for token in tokens)) / len(tokens) if tokens else 0
+            'total_tokens': total,
+            'avg_token_length': exact_mean(token_totals.length_sum, total),
+            'median_token_length': token_totals.median_length(),
+            'min_token_length': token_totals.min_length,
+            'max_token_length': token_totals.max_length,
+            'token_length_std': token_totals.length_stdev(),
+            'valid_token_count': token_totals.valid_count,
+            'valid_token_ratio': token_totals.valid_count / total,
+            'unique_tokens': len(token_totals.lexemes),
+            'token_diversity': len(token_totals.lexemes) / total
         }
     
-    def _analyze_patterns(self, tokens: List) -> Dict[str, Any]:
+    def _analyze_patterns(self, token_totals: TokenAccumulator) -> Dict[str, Any]:
         """Analiza distribución y propiedades de los patrones"""
-        valid_tokens = [t for t in tokens if hasattr(t, 'pattern_name') and t.pattern_name]
+        valid_count = token_totals.valid_count
         
-        if not valid_tokens:
+        if not valid_count:
             return {'pattern_distribution': {}, 'pattern_metrics': {}}
         
-        # Distribución de patrones
-        pattern_counts = Counter(token.pattern_name for token in valid_tokens)
+        # Distribución de patrones (en orden de primera aparición)
+        pattern_counts = Counter({name: totals[0] for name, totals in token_totals.pattern_totals.items()})
         
-        # Métricas por patrón
+        # Métricas por patrón a partir de los totales acumulados
         pattern_metrics = {}
-        for pattern_name, count in pattern_counts.items():
-            pattern_tokens = [t for t in valid_tokens if t.pattern_name == pattern_name]
+        for pattern_name, (count, length_sum, lexemes) in token_totals.pattern_totals.items():
             pattern_metrics[pattern_name] = {
                 'count': count,
-                'percentage': (count / len(valid_tokens)) * 100,
-                'avg_length': statistics.mean([len(t.lexeme) for t in pattern_tokens]),
-                'unique_values': len(set(t.lexeme for t in pattern_tokens)),
-                'diversity': len(set(t.lexeme for t in pattern_tokens)) / count if count > 0 else 0
+                'percentage': (count / valid_count) * 100,
+                'avg_length': exact_mean(length_sum, count),
+                'unique_values': len(lexemes),
+                'diversity': len(lexemes) / count if count > 0 else 0
             }
         
         return {
@@ -116,12 +163,15 @@ class StatisticsAnalyzer:
             'entropy': self._calculate_entropy(list(pattern_counts.values()))
         }
     
-    def _calculate_performance_metrics(self, tokens: List, text: str) -> Dict[str, Any]:
+    def _calculate_performance_metrics(self, token_totals: TokenAccumulator,
+                                       text_totals: TextAccumulator) -> Dict[str, Any]:
         """Calcula métricas de rendimiento del análisis"""
+        length = text_totals.character_count
+        total = token_totals.total
         return {
-            'tokens_per_character': len(tokens) / len(text) if text else 0,
-            'coverage_ratio': len([t for t in tokens if hasattr(t, 'pattern_name') and t.pattern_name]) / len(tokens) if tokens else 0,
-            'processing_efficiency': len(text) / len(tokens) if tokens else 0
+            'tokens_per_character': total / length if length else 0,
+            'coverage_ratio': token_totals.valid_count / total if total else 0,
+            'processing_efficiency': length / total if total else 0
         }
     
     def _calculate_quality_metrics(self, analysis_stats: Dict[str, Any]) -> Dict[str, Any]:
@@ -137,48 +187,42 @@ class StatisticsAnalyzer:
             'quality_score': self._calculate_quality_score(valid_tokens, invalid_tokens, total_tokens)
         }
     
-    def _analyze_distributions(self, tokens: List) -> Dict[str, Any]:
+    def _analyze_distributions(self, token_totals: TokenAccumulator) -> Dict[str, Any]:
         """Analiza distribuciones estadísticas de los tokens"""
-        if not tokens:
+        if not token_totals.total:
             return {}
         
         # Distribución por tipo de token
-        from ..analysis.lexical_analyzer import TokenType
         type_distribution = Counter()
-        
-        for token in tokens:
-            if hasattr(token, 'token_type'):
-                type_distribution[token.token_type.value if hasattr(token.token_type, 'value') else str(token.token_type)] += 1
+        for token_type, count in token_totals.type_counts.items():
+            type_distribution[token_type.value if hasattr(token_type, 'value') else str(token_type)] += count
         
         # Distribución por posición
-        positions = []
-        for token in tokens:
-            if hasattr(token, 'line') and hasattr(token, 'column'):
-                positions.append((token.line, token.column))
+        lines = token_totals.line_counts
         
         return {
             'type_distribution': dict(type_distribution),
             'position_analysis': {
-                'lines_with_tokens': len(set(pos[0] for pos in positions)) if positions else 0,
-                'avg_tokens_per_line': len(tokens) / len(set(pos[0] for pos in positions)) if positions else 0,
-                'max_line': max(pos[0] for pos in positions) if positions else 0
+                'lines_with_tokens': len(lines),
+                'avg_tokens_per_line': token_totals.total / len(lines),
+                'max_line': max(lines)
             }
         }
     
-    def _analyze_complexity(self, text: str, tokens: List) -> Dict[str, Any]:
+    def _analyze_complexity(self, text_totals: TextAccumulator,
+                            token_totals: TokenAccumulator) -> Dict[str, Any]:
         """Analiza la complejidad del texto y análisis"""
-        if not text or not tokens:
+        if not text_totals.character_count or not token_totals.total:
             return {}
         
         # Complejidad léxica
-        unique_words = len(set(text.lower().split()))
-        total_words = len(text.split())
+        total_words = text_totals.word_count
         
         return {
-            'lexical_diversity': unique_words / total_words if total_words > 0 else 0,
-            'avg_sentence_length': len(text.split()) / max(1, text.count('.') + text.count('!') + text.count('?')),
-            'complexity_index': self._calculate_complexity_index(text),
-            'pattern_complexity': len(set(t.pattern_name for t in tokens if hasattr(t, 'pattern_name') and t.pattern_name))
+            'lexical_diversity': len(text_totals.unique_words) / total_words if total_words > 0 else 0,
+            'avg_sentence_length': total_words / max(1, text_totals.sentence_marks),
+            'complexity_index': self._calculate_complexity_index(text_totals),
+            'pattern_complexity': len(token_totals.pattern_totals)
         }
     
     def _calculate_entropy(self, values: List[int]) -> float:
@@ -209,17 +253,17 @@ class StatisticsAnalyzer:
         # Score ponderado
         return (accuracy * 0.7 + completeness * 0.3) * 100
     
-    def _calculate_complexity_index(self, text: str) -> float:
+    def _calculate_complexity_index(self, text_totals: TextAccumulator) -> float:
         """Calcula un índice de complejidad del texto"""
-        if not text:
+        if not text_totals.character_count:
             return 0.0
         
-        words = text.split()
-        sentences = max(1, text.count('.') + text.count('!') + text.count('?'))
+        words = text_totals.word_count
+        sentences = max(1, text_totals.sentence_marks)
         
         # Índice basado en longitud promedio de palabras y oraciones
-        avg_word_length = sum(len(word) for word in words) / len(words) if words else 0
-        avg_sentence_length = len(words) / sentences
+        avg_word_length = text_totals.word_length_total / words if words else 0
+        avg_sentence_length = words / sentences
         
         return (avg_word_length * 0.4 + avg_sentence_length * 0.6) / 10
     
@@ -242,33 +286,18 @@ class StatisticsAnalyzer:
     def export_to_csv(self, filepath: str) -> bool:
         """Exporta estadísticas históricas a CSV"""
         try:
-            if not self.analysis_history:
+            if not len(self.analysis_history):
                 return False
             
             # Crear directorio si no existe
             os.makedirs(os.path.dirname(filepath), exist_ok=True)
             
-            # Flatten data for CSV
-            flattened_data = []
-            for analysis in self.analysis_history:
-                flat_row = {
-                    'timestamp': analysis['timestamp'],
-                    'character_count': analysis['text_analysis']['character_count'],
-                    'word_count': analysis['text_analysis']['word_count'],
-                    'line_count': analysis['text_analysis']['line_count'],
-                    'total_tokens': analysis['token_analysis'].get('total_tokens', 0),
-                    'valid_tokens': analysis['token_analysis'].get('valid_token_count', 0),
-                    'accuracy': analysis['quality_metrics']['accuracy'],
-                    'pattern_variety': analysis['pattern_analysis']['pattern_variety'],
-                    'complexity_index': analysis['complexity_analysis'].get('complexity_index', 0)
-                }
-                flattened_data.append(flat_row)
-            
+            # Las filas se aplanaron al agregar cada análisis; se escriben
+            # a medida que se leen del historial
             with open(filepath, 'w', newline='', encoding='utf-8') as f:
-                if flattened_data:
-                    writer = csv.DictWriter(f, fieldnames=flattened_data[0].keys())
-                    writer.writeheader()
-                    writer.writerows(flattened_data)
+                writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+                writer.writeheader()
+                writer.writerows(self.analysis_history.rows())
             
             return True
         except Exception as e:
@@ -280,11 +309,8 @@ class StatisticsAnalyzer:
         if len(self.analysis_history) < 2:
             return {'message': 'Se necesitan al menos 2 análisis para comparación'}
         
-        recent_analyses = self.analysis_history[-5:]  # Últimos 5 análisis
-        
-        accuracies = [a['quality_metrics']['accuracy'] for a in recent_analyses]
-        complexities = [a['complexity_analysis'].get('complexity_index', 0) for a in recent_analyses]
-        token_counts = [a['token_analysis'].get('total_tokens', 0) for a in recent_analyses]
+        # Últimos 5 análisis, mantenidos por el historial en cada alta
+        accuracies, complexities, token_counts = self.analysis_history.get_window()
         
         return {
             'trend_analysis': {
@@ -0,0 +1,222 @@
+"""
+Token Table: Almacenamiento columnar de tokens
+Guarda los tokens como columnas de enteros (estructura de arreglos) en lugar
+de un objeto Token por cada uno; los lexemas se recortan del texto original
+solo cuando se consultan
+"""
+
+from array import array
+from collections import Counter
+from itertools import compress
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+
+try:
+    import numpy as np
+except ImportError:  # Sin NumPy las máscaras y conteos usan los arreglos directamente
+    np = None
+
+
+class TokenView:
+    """Vista liviana de una fila de TokenTable con la misma interfaz que Token"""
+    
+    __slots__ = ('_table', '_index')
+    
+    def __init__(self, table: 'TokenTable', index: int):
+        self._table = table
+        self._index = index
+    
+    @property
+    def lexeme(self) -> str:
+        return self._table.lexeme(self._index)
+    
+    @property
+    def token_type(self):
+        return self._table.token_types[self._table.type_codes[self._index]]
+    
+    @property
+    def pattern_name(self) -> Optional[str]:
+        pattern_id = self._table.pattern_ids[self._index]
+        return self._table.pattern_names[pattern_id] if pattern_id >= 0 else None
+    
+    @property
+    def position(self) -> int:
+        return self._table.starts[self._index]
+    
+    @property
+    def end(self) -> int:
+        return self._table.ends[self._index]
+    
+    @property
+    def line(self) -> int:
+        return self._table.lines[self._index]
+    
+    @property
+    def column(self) -> int:
+        return self._table.columns[self._index]
+    
+    def __eq__(self, other):
+        return (isinstance(other, TokenView) and self._table is other._table
+                and self._index == other._index)
+    
+    def __hash__(self):
+        return hash((id(self._table), self._index))
+    
+    def __str__(self):
+        pattern_name = self.pattern_name
+        if pattern_name:
+            return f"Token('{self.lexeme}', {self.token_type.value}, {pattern_name}, L{self.line}:C{self.column})"
+        return f"Token('{self.lexeme}', {self.token_type.value}, L{self.line}:C{self.column})"
+    
+    def __repr__(self):
+        return self.__str__()
+
+
+class TokenTable:
+    """Tabla columnar de tokens que se comporta como una secuencia de solo lectura"""
+    
+    def __init__(self, text: str, token_types: Sequence):
+        """
+        Args:
+            text: Texto del que se recortan los lexemas
+            token_types: Tipos de token indexados por su código
+        """
+        self.text = text
+        self.token_types = tuple(token_types)
+        self._type_codes = {token_type: code for code, token_type in enumerate(self.token_types)}
+        
+        # Columnas: una entrada por token
+        self.starts = array('q')
+        self.ends = array('q')
+        self.lines = array('q')
+        self.columns = array('q')
+        self.type_codes = array('b')
+        self.pattern_ids = array('h')   # -1 si el token no tiene patrón
+        
+        # Nombres de patrón en orden de primera aparición
+        self.pattern_names: List[str] = []
+        self._pattern_ids: Dict[str, int] = {}
+    
+    def append(self, start: int, end: int, line: int, column: int,
+               token_type, pattern_name: Optional[str] = None):
+        """
+        Agrega un token al final de la tabla
+        
+        Args:
+            start: Posición inicial del lexema en el texto
+            end: Posición final (exclusiva)
+            line: Línea del token
+            column: Columna del token
+            token_type: Tipo del token
+            pattern_name: Patrón reconocido, si existe
+        """
+        if pattern_name is None:
+            pattern_id = -1
+        else:
+            pattern_id = self._pattern_ids.get(pattern_name)
+            if pattern_id is None:
+                pattern_id = self._pattern_ids[pattern_name] = len(self.pattern_names)
+                self.pattern_names.append(pattern_name)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.lines.append(line)
+        self.columns.append(column)
+        self.type_codes.append(self._type_codes[token_type])
+        self.pattern_ids.append(pattern_id)
+    
+    def lexeme(self, index: int) -> str:
+        """Recorta del texto el lexema del token en la posición dada"""
+        return self.text[self.starts[index]:self.ends[index]]
+    
+    def __len__(self) -> int:
+        return len(self.starts)
+    
+    def __bool__(self) -> bool:
+        return len(self.starts) > 0
+    
+    def __getitem__(self, index: Union[int, slice]) -> Union[TokenView, List[TokenView]]:
+        if isinstance(index, slice):
+            return [TokenView(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("índice de token fuera de rango")
+        return TokenView(self, index)
+    
+    def __iter__(self) -> Iterator[TokenView]:
+        for index in range(len(self)):
+            yield TokenView(self, index)
+    
+    def column_array(self, name: str) -> 'np.ndarray':
+        """
+        Obtiene una columna como arreglo de NumPy sin copiar los datos
+        
+        Args:
+            name: 'starts', 'ends', 'lines', 'columns', 'type_codes' o 'pattern_ids'
+        
+        Returns:
+            np.ndarray: Vista de la columna
+        
+        Raises:
+            ImportError: Si NumPy no está instalado
+        """
+        if np is None:
+            raise ImportError("column_array requiere NumPy; use la columna como array")
+        column = getattr(self, name)
+        dtype = {'q': np.int64, 'b': np.int8, 'h': np.int16}[column.typecode]
+        return np.frombuffer(column, dtype=dtype) if len(column) else np.empty(0, dtype=dtype)
+    
+    def _mask(self, name: str, value: int) -> Sequence:
+        """Máscara de los tokens cuya columna vale value (bytearray de 0/1 sin NumPy)"""
+        if np is not None:
+            return self.column_array(name) == value
+        return bytearray(item == value for item in getattr(self, name))
+    
+    def type_mask(self, token_type) -> Sequence:
+        """Máscara booleana de los tokens de un tipo"""
+        return self._mask('type_codes', self._type_codes.get(token_type, -1))
+    
+    def pattern_mask(self, pattern_name: str) -> Sequence:
+        """Máscara booleana de los tokens de un patrón"""
+        return self._mask('pattern_ids', self._pattern_ids.get(pattern_name, -2))
+    
+    def select(self, mask: Sequence) -> List[TokenView]:
+        """
+        Obtiene las vistas de los tokens marcados en una máscara
+        
+        Args:
+            mask: Máscara booleana con una entrada por token
+        
+        Returns:
+            List[TokenView]: Tokens seleccionados en orden de aparición
+        """
+        if np is None:
+            return [TokenView(self, index) for index in compress(range(len(self)), mask)]
+        return [TokenView(self, int(index)) for index in np.flatnonzero(mask)]
+    
+    def count_by_type(self) -> Dict[object, int]:
+        """Cantidad de tokens de cada tipo"""
+        if np is None:
+            counts = Counter(self.type_codes)
+        else:
+            counts = np.bincount(self.column_array('type_codes'), minlength=len(self.token_types))
+        return {token_type: int(counts[code]) for code, token_type in enumerate(self.token_types)}
+    
+    def count_by_pattern(self) -> Dict[str, int]:
+        """Cantidad de tokens de cada patrón, en orden de primera aparición"""
+        if np is None:
+            counts = Counter(self.pattern_ids)
+        else:
+            pattern_ids = self.column_array('pattern_ids')
+            counts = np.bincount(pattern_ids[pattern_ids >= 0], minlength=len(self.pattern_names))
+        return {name: int(counts[pattern_id]) for pattern_id, name in enumerate(self.pattern_names)}
+    
+    def memory_usage(self) -> int:
+        """
+        Calcula los bytes ocupados por las columnas (sin contar el texto)
+        
+        Returns:
+            int: Tamaño en bytes
+        """
+        return sum(column.itemsize * len(column) for column in
+                   (self.starts, self.ends, self.lines, self.columns,
+                    self.type_codes, self.pattern_ids))
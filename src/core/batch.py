@@ -0,0 +1,236 @@
+"""
+Batch: Non-interactive analysis of many documents for pipelines
+"""
+
+import fnmatch
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, IO, Iterable, Iterator, Optional, Tuple
+
+from ..analysis.statistics import StatisticsAnalyzer
+from .model import TextModel
+
+
+# Name used for the document read from standard input
+STDIN_DOCUMENT = '-'
+
+# Model reused by every document analyzed in the same process
+_WORKER_MODEL = None
+
+
+def iter_documents(source: str, pattern: str = '*') -> Iterator[str]:
+    """
+    List the documents to analyze
+    
+    Args:
+        source: A directory (walked recursively, in sorted order), a file,
+            or '-' for standard input
+        pattern: Shell-style filter applied to file names inside a directory
+    
+    Yields:
+        str: Path of each document, or '-' for standard input
+    """
+    if source == STDIN_DOCUMENT:
+        yield STDIN_DOCUMENT
+        return
+    if not os.path.isdir(source):
+        if not os.path.isfile(source):
+            raise FileNotFoundError(f"Input not found: {source}")
+        yield source
+        return
+    for root, directories, files in os.walk(source):
+        directories.sort()
+        for name in sorted(files):
+            if fnmatch.fnmatch(name, pattern):
+                yield os.path.join(root, name)
+
+
+def _get_worker_model() -> TextModel:
+    """Get the model of this process, creating it on first use"""
+    global _WORKER_MODEL
+    if _WORKER_MODEL is None:
+        _WORKER_MODEL = TextModel()
+    return _WORKER_MODEL
+
+
+def analyze_document(document: str, advanced: bool = False, graphs: bool = False,
+                     text: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Analyze one document and summarize the result as a JSON-serializable dict
+    
+    Files are analyzed through a memory map (see TextModel.set_file), so
+    their content is never loaded as a single string.
+    
+    Args:
+        document: Path of the document, or '-' when text is given
+        advanced: Include the advanced statistics
+        graphs: Also generate the graphs (implies advanced)
+        text: Content of the document, used instead of reading the path
+    
+    Returns:
+        Dict[str, Any]: Token counts, pattern counts and timing, or an
+        'error' entry if the document could not be analyzed
+    """
+    model = _get_worker_model()
+    analyzer = model.lexical_analyzer
+    if advanced or graphs:
+        # A fresh statistics analyzer per document: documents are independent,
+        # and a shared one would keep every analysis in its history
+        model.statistics_analyzer = StatisticsAnalyzer(model.statistics_analyzer.approximate)
+    start = time.perf_counter()
+    try:
+        if text is not None:
+            if advanced or graphs:
+                model.set_text(text)
+            else:
+                analyzer.analyze(text)
+            size = len(text.encode('utf-8'))
+        else:
+            if advanced or graphs:
+                model.set_file(document)
+            else:
+                analyzer.analyze_file(document)
+            size = os.path.getsize(document)
+    except (OSError, UnicodeDecodeError) as error:
+        return {'document': document, 'error': str(error)}
+    
+    stats = analyzer.get_statistics()
+    result = {
+        'document': document,
+        'bytes': size,
+        'characters': analyzer.current_position,
+        'lines': analyzer.current_line,
+        'total_tokens': stats.get('total_tokens', 0),
+        'valid_tokens': stats.get('valid_tokens', 0),
+        'invalid_tokens': stats.get('invalid_tokens', 0),
+        'punctuation_tokens': stats.get('punctuation_tokens', 0),
+        'valid_percentage': stats.get('valid_percentage', 0),
+        'pattern_counts': stats.get('pattern_counts', {}),
+    }
+    if advanced or graphs:
+        result['advanced'] = model.advanced_stats
+    if graphs:
+        result['graphs'] = model.generate_graphs()
+    result['elapsed_ms'] = (time.perf_counter() - start) * 1000
+    return result
+
+
+def _analyze_path(arguments: Tuple[str, bool, bool]) -> Dict[str, Any]:
+    """Unpack the arguments of a pool task"""
+    document, advanced, graphs = arguments
+    return analyze_document(document, advanced, graphs)
+
+
+def run_batch(documents: Iterable[str], jobs: int = 1, advanced: bool = False,
+              graphs: bool = False, stdin: IO = None) -> Iterator[Dict[str, Any]]:
+    """
+    Analyze documents, yielding each result in input order as soon as it is ready
+    
+    Args:
+        documents: Paths from iter_documents
+        jobs: Number of worker processes (1 analyzes in this process)
+        advanced: Include the advanced statistics
+        graphs: Also generate the graphs
+        stdin: Stream read for the '-' document (defaults to sys.stdin)
+    
+    Yields:
+        Dict[str, Any]: Result of analyze_document for each document
+    """
+    tasks = []
+    for document in documents:
+        if document == STDIN_DOCUMENT:
+            text = (stdin or sys.stdin).read()
+            yield analyze_document(STDIN_DOCUMENT, advanced, graphs, text=text)
+        else:
+            tasks.append((document, advanced, graphs))
+    
+    if jobs == 1 or len(tasks) < 2:
+        for task in tasks:
+            yield _analyze_path(task)
+        return
+    
+    with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as executor:
+        # Small chunks keep the output streaming while amortizing the IPC cost
+        chunk_size = max(1, min(16, len(tasks) // (jobs * 4)))
+        yield from executor.map(_analyze_path, tasks, chunksize=chunk_size)
+
+
+def format_result(result: Dict[str, Any], output_format: str) -> str:
+    """
+    Render one result as a line of output
+    
+    Args:
+        result: Result of analyze_document
+        output_format: 'jsonl' or 'text'
+    
+    Returns:
+        str: Line without the trailing newline
+    """
+    if output_format == 'jsonl':
+        return json.dumps(result, ensure_ascii=False, default=str)
+    if 'error' in result:
+        return f"{result['document']}: ERROR {result['error']}"
+    patterns = ', '.join(f"{name}={count}" for name, count in result['pattern_counts'].items())
+    return (f"{result['document']}: {result['total_tokens']} tokens, "
+            f"{result['valid_tokens']} valid ({result['valid_percentage']:.1f}%)"
+            + (f" [{patterns}]" if patterns else ""))
+
+
+def main(source: str, jobs: Optional[int] = None, output_format: str = 'jsonl',
+         pattern: str = '*', advanced: bool = False, graphs: bool = False,
+         output: IO = None, report: IO = None) -> int:
+    """
+    Run the batch analysis and write one line per document
+    
+    Args:
+        source: Directory, file or '-' (see iter_documents)
+        jobs: Worker processes (None uses every available core)
+        output_format: 'jsonl' or 'text'
+        pattern: File name filter for directories
+        advanced: Include the advanced statistics
+        graphs: Also generate the graphs
+        output: Stream for the results (defaults to sys.stdout)
+        report: Stream for the throughput summary (defaults to sys.stderr)
+    
+    Returns:
+        int: Exit status, 1 if any document failed and 2 if the input does not exist
+    """
+    output = output or sys.stdout
+    report = report or sys.stderr
+    jobs = jobs or os.cpu_count() or 1
+    
+    if source != STDIN_DOCUMENT and not os.path.exists(source):
+        report.write(f"Input not found: {source}\n")
+        return 2
+    
+    start = time.perf_counter()
+    documents = total_bytes = total_tokens = failures = 0
+    results = run_batch(iter_documents(source, pattern), jobs, advanced, graphs)
+    try:
+        for result in results:
+            output.write(format_result(result, output_format) + '\n')
+            output.flush()
+            documents += 1
+            if 'error' in result:
+                failures += 1
+                continue
+            total_bytes += result['bytes']
+            total_tokens += result['total_tokens']
+    except BrokenPipeError:
+        # The reader stopped early (e.g. `| head`): stop quietly
+        results.close()
+        if output is sys.stdout:
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    elapsed = time.perf_counter() - start
+    
+    rate = 1 / elapsed if elapsed > 0 else 0
+    report.write(f"{documents} documents, {total_bytes / 1_000_000:.2f} MB, "
+                 f"{total_tokens} tokens in {elapsed:.2f} s "
+                 f"({documents * rate:.1f} docs/s, {total_bytes / 1_000_000 * rate:.2f} MB/s, "
+                 f"{jobs} jobs)"
+                 + (f", {failures} failed" if failures else "") + '\n')
+    return 1 if failures else 0
@@ -5,9 +5,10 @@ Model: Handles the data and business logic for text analysis and pattern validat
 from ..analysis.lexical_analyzer import LexicalAnalyzer, Token, TokenType
 from ..patterns.patterns import PatternValidator
 from ..analysis.statistics import StatisticsAnalyzer
-from ..visualization.graphs import GraphGenerator
+from ..analysis.accumulators import TextAccumulator, TokenAccumulator
+from ..analysis.corpus_index import CorpusIndex
 from ..visualization.reports import ReportGenerator
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 
 class TextModel:
@@ -18,23 +19,183 @@ class TextModel:
         self.lexical_analyzer = LexicalAnalyzer()
         self.pattern_validator = PatternValidator()
         self.statistics_analyzer = StatisticsAnalyzer()
-        self.graph_generator = GraphGenerator()
+        self._graph_generator = None
         self.report_generator = ReportGenerator()
-        self.tokens = []
         self.analysis_results = {}
         self.advanced_stats = {}
-    
-    def set_text(self, text):
-        """Store the text and trigger lexical analysis"""
+        # Editable totals behind advanced_stats, kept up to date by apply_edit
+        self._text_totals = None
+        self._token_totals = None
+        self.corpus_index = CorpusIndex()
+    
+    @property
+    def graph_generator(self):
+        """Graph generator, created on first use so matplotlib is only imported when needed"""
+        if self._graph_generator is None:
+            from ..visualization.graphs import GraphGenerator
+            self._graph_generator = GraphGenerator()
+        return self._graph_generator
+    
+    @property
+    def tokens(self):
+        """Tokens of the last analysis, owned by the lexical analyzer"""
+        return self.lexical_analyzer.tokens
+    
+    @property
+    def advanced_stats(self) -> Dict[str, Any]:
+        """
+        Advanced statistics, recomputed on first access after an edit
+        
+        Edits change the same analysis, so the result is not added to the
+        statistics history again.
+        """
+        if self._advanced_stats is None:
+            text_totals, token_totals = self._text_totals, self._token_totals
+            if token_totals is None:
+                text_totals, token_totals = self._accumulate_totals()
+            self._advanced_stats = self.statistics_analyzer.analyze_accumulators(
+                text_totals, token_totals, self.analysis_results, record=False
+            )
+        return self._advanced_stats
+    
+    @advanced_stats.setter
+    def advanced_stats(self, value: Dict[str, Any]):
+        self._advanced_stats = value
+    
+    def set_text(self, text, workers: int = 1, columnar: bool = False):
+        """
+        Store the text and trigger lexical analysis
+        
+        With workers other than 1 the text is split on line boundaries and
+        analyzed in that many processes (None uses every available core).
+        With columnar=True the tokens are kept in a TokenTable instead of a
+        list of Token objects (single process only).
+        """
         self.text = text
+        self._text_totals = self._token_totals = None
         # Perform lexical analysis automatically when text is set
-        self.tokens = self.lexical_analyzer.analyze(text)
+        if columnar:
+            self.lexical_analyzer.analyze_columnar(text)
+        elif workers == 1:
+            self.lexical_analyzer.analyze(text)
+        else:
+            self.lexical_analyzer.analyze_parallel(text, workers)
         self.analysis_results = self.lexical_analyzer.get_statistics()
         # Perform advanced statistical analysis
         self.advanced_stats = self.statistics_analyzer.analyze_results(
             self.tokens, text, self.analysis_results
         )
     
+    def set_file(self, path: str, chunk_size: int = 1 << 20):
+        """
+        Analyze a UTF-8 file through a memory map instead of loading it as a string
+        
+        The text itself is not kept: advanced statistics are computed from
+        accumulators fed with the tokens and with the file read in chunks.
+        """
+        self.text = ""
+        self._text_totals = self._token_totals = None
+        self.lexical_analyzer.analyze_file(path)
+        self.analysis_results = self.lexical_analyzer.get_statistics()
+        
+        approximate = self.statistics_analyzer.approximate
+        text_totals = TextAccumulator(approximate)
+        # newline='' keeps '\r' characters, exactly as the memory-mapped scan sees them
+        with open(path, encoding='utf-8', newline='') as handle:
+            for chunk in iter(lambda: handle.read(chunk_size), ''):
+                text_totals.update(chunk)
+        token_totals = TokenAccumulator(approximate)
+        token_totals.update(self.tokens)
+        self.advanced_stats = self.statistics_analyzer.analyze_accumulators(
+            text_totals, token_totals, self.analysis_results
+        )
+    
+    def apply_edit(self, offset: int, delete_len: int, insert_text: str) -> Dict[str, Any]:
+        """
+        Apply an edit to the stored text without reanalyzing all of it
+        
+        Only the tokens around the edit are re-lexed (see
+        LexicalAnalyzer.apply_edit) and the basic statistics come from counts
+        updated with the removed and inserted tokens. The totals behind the
+        advanced statistics are updated the same way, from the edited text and
+        tokens only, and the statistics are derived from them the next time
+        they are requested. The one exception is the tokens-per-line count: an
+        edit that adds or removes line breaks renumbers every later line, so it
+        is counted again from the tokens.
+        
+        Args:
+            offset: Position where the edit starts
+            delete_len: Number of characters removed from offset
+            insert_text: Text inserted at offset
+        
+        Returns:
+            Dict[str, Any]: Updated basic statistics
+        """
+        old_text = self.text
+        _, removed, inserted = self.lexical_analyzer.apply_edit(offset, delete_len, insert_text)
+        self.text = self.lexical_analyzer.text
+        # The analyzer keeps its counts up to date, so this does not walk the tokens
+        self.analysis_results = self.lexical_analyzer.get_statistics()
+        
+        if self._token_totals is not None:
+            self._text_totals.replace(old_text, offset, delete_len, insert_text)
+            self._token_totals.remove(removed)
+            self._token_totals.update(inserted)
+            # Statistics break ties by first appearance, which the edit may have moved
+            if removed or inserted:
+                self._token_totals.reorder(*self.lexical_analyzer.get_first_appearance_order())
+            if insert_text.count('\n') != old_text.count('\n', offset, offset + delete_len):
+                line_counts = {}
+                for token in self.tokens:
+                    line_counts[token.line] = line_counts.get(token.line, 0) + 1
+                self._token_totals.line_counts = line_counts
+        self._advanced_stats = None
+        return self.analysis_results
+    
+    def _accumulate_totals(self):
+        """
+        Accumulate the totals of the current text and tokens from scratch
+        
+        In exact mode they are editable, so apply_edit can keep them up to
+        date; approximate totals cannot forget values and are rebuilt after
+        every edit instead.
+        """
+        approximate = self.statistics_analyzer.approximate
+        text_totals = TextAccumulator(approximate, editable=not approximate)
+        text_totals.update(self.text)
+        token_totals = TokenAccumulator(approximate, editable=not approximate)
+        token_totals.update(self.tokens)
+        if not approximate:
+            self._text_totals, self._token_totals = text_totals, token_totals
+        return text_totals, token_totals
+    
+    def add_to_corpus(self, document_id: str):
+        """
+        Add the tokens of the current analysis to the corpus index
+        
+        Call it after set_text or set_file for each document; the index can
+        then be queried or saved without analyzing the documents again.
+        """
+        self.corpus_index.add_document(document_id, self.tokens)
+    
+    def search_corpus(self, lexeme: str) -> Dict[str, List[int]]:
+        """Find the documents (and token offsets) containing a lexeme"""
+        return self.corpus_index.lookup(lexeme)
+    
+    def search_corpus_prefix(self, prefix: str, limit: int = None) -> Dict[str, Dict[str, List[int]]]:
+        """Find the indexed lexemes starting with a prefix"""
+        return self.corpus_index.prefix_lookup(prefix, limit)
+    
+    def save_corpus_index(self, filepath: str = None) -> str:
+        """Save the corpus index as gzip-compressed JSON"""
+        if not filepath:
+            filepath = "data/outputs/corpus_index.json.gz"
+        return self.corpus_index.save(filepath)
+    
+    def load_corpus_index(self, filepath: str):
+        """Replace the corpus index with one saved earlier"""
+        self.corpus_index = CorpusIndex.load(filepath)
+    
     def get_text(self):
         """Retrieve the stored text"""
         return self.text
@@ -69,6 +230,22 @@ class TextModel:
         """Get tokens that match a specific pattern"""
         return self.lexical_analyzer.get_tokens_by_pattern(pattern_name)
     
+    def get_token_at(self, offset: int) -> Optional[Token]:
+        """Get the token covering a text offset, or None between tokens"""
+        return self.lexical_analyzer.get_token_at(offset)
+    
+    def get_tokens_in_range(self, start: int, end: int) -> List[Token]:
+        """Get the tokens overlapping the offset range [start, end)"""
+        return self.lexical_analyzer.get_tokens_in_range(start, end)
+    
+    def get_tokens_in_lines(self, first_line: int, last_line: int) -> List[Token]:
+        """Get the tokens on lines first_line to last_line, both included"""
+        return self.lexical_analyzer.get_tokens_in_lines(first_line, last_line)
+    
+    def get_analysis_generation(self) -> int:
+        """Get a counter that changes whenever the tokens change, to detect stale pages"""
+        return self.lexical_analyzer.generation
+    
     def get_analysis_statistics(self) -> Dict[str, Any]:
         """Get statistical information about the analysis"""
         return self.analysis_results
@@ -99,20 +276,11 @@ class TextModel:
     
     def get_pattern_summary(self) -> Dict[str, int]:
         """Get summary of how many tokens were found for each pattern"""
-        summary = {}
-        valid_tokens = self.get_valid_tokens()
-        
-        for token in valid_tokens:
-            if token.pattern_name in summary:
-                summary[token.pattern_name] += 1
-            else:
-                summary[token.pattern_name] = 1
-        
-        return summary
+        return self.lexical_analyzer.get_pattern_counts()
     
     def has_valid_patterns(self) -> bool:
         """Check if any valid patterns were found in the text"""
-        return len(self.get_valid_tokens()) > 0
+        return self.lexical_analyzer.count_tokens_by_type(TokenType.VALID_PATTERN) > 0
     
     def get_error_tokens(self) -> List[Token]:
         """Get tokens that couldn't be classified (invalid or unknown)"""
@@ -0,0 +1,436 @@
+"""
+Server: Local asyncio service that analyzes and validates text for many producers
+
+Requests are JSON objects, one per line (JSON lines), or the body of an HTTP
+POST. Each request carries an "op":
+    
+    {"id": 1, "op": "analyze", "text": "...", "advanced": false}
+    {"id": 2, "op": "validate", "value": "user@test.com", "pattern": "email"}
+    {"id": 3, "op": "validate", "values": ["a@b.co", "x"], "pattern": "email"}
+    {"id": 4, "op": "patterns"}
+    {"id": 5, "op": "ping"}
+
+and gets one response line: {"id": 1, "ok": true, "result": {...}} or
+{"id": 1, "ok": false, "error": "..."}. Responses on a JSON-lines
+connection may come back out of order; the id ties them to their request.
+"""
+
+import asyncio
+import json
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import batch
+
+
+# Largest accepted request line or HTTP body
+MAX_REQUEST_BYTES = 16 * 1024 * 1024
+
+_HTTP_METHODS = (b'GET ', b'POST ', b'PUT ', b'HEAD ', b'DELETE ', b'OPTIONS ')
+_HTTP_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+                 413: 'Payload Too Large', 503: 'Service Unavailable', 504: 'Gateway Timeout'}
+
+
+class RequestError(Exception):
+    """A request that cannot be served; the message is returned to the client"""
+    
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+def _warm_worker():
+    """Pool initializer: build the worker model, compiling every pattern, before the first request"""
+    model = batch._get_worker_model()
+    # The pattern registry compiles on first use, so an analysis alone leaves
+    # most patterns, the combined alternation and the prefilters uncompiled
+    for validator in (model.pattern_validator, model.lexical_analyzer.pattern_validator):
+        for pattern_name in validator.patterns:
+            validator.registry.compile(pattern_name)
+            validator.get_prefilter(pattern_name)
+        validator.combined_pattern
+    model.lexical_analyzer.analyze("warm-up user@test.com 192.168.0.1")
+
+
+def _worker_analyze(text: str, advanced: bool) -> Dict[str, Any]:
+    """Analyze a text in a worker process"""
+    result = batch.analyze_document(batch.STDIN_DOCUMENT, advanced=advanced, text=text)
+    result.pop('document', None)
+    return result
+
+
+def _worker_validate(value: str, pattern_name: str) -> Dict[str, Any]:
+    """Validate a value against one pattern in a worker process"""
+    model = batch._get_worker_model()
+    if pattern_name not in model.pattern_validator.patterns:
+        raise RequestError(f"Unknown pattern: {pattern_name}")
+    return {'valid': model.validate_single_pattern(value, pattern_name)}
+
+
+def _worker_validate_many(values: List[str], pattern_name: str) -> Dict[str, Any]:
+    """Validate a batch of values against one pattern in a worker process"""
+    model = batch._get_worker_model()
+    if pattern_name not in model.pattern_validator.patterns:
+        raise RequestError(f"Unknown pattern: {pattern_name}")
+    bitmap, counts = model.pattern_validator.validate_many(values, pattern_name)
+    return {'valid': [bool(flag) for flag in bitmap], 'counts': counts}
+
+
+def _worker_patterns() -> Dict[str, Any]:
+    """List the available patterns in a worker process"""
+    model = batch._get_worker_model()
+    return {'patterns': {name: model.get_pattern_description(name)
+                         for name in model.get_available_patterns()}}
+
+
+class AnalysisServer:
+    """
+    JSON-lines and HTTP server that runs the analysis in a pool of worker processes
+    
+    Accepted requests wait in a bounded queue. When it is full, reading from
+    the connections pauses, so producers feel the backpressure through TCP
+    instead of the server buffering without limit. Every request has a
+    deadline that covers both the wait and the work.
+    """
+    
+    def __init__(self, host: str = '127.0.0.1', port: int = 8765,
+                 workers: Optional[int] = None, queue_size: int = 64,
+                 timeout: float = 30.0):
+        """
+        Args:
+            host: Address to listen on
+            port: Port to listen on (0 picks a free port, see self.port)
+            workers: Worker processes (None uses every available core)
+            queue_size: Requests that can wait for a worker before reading pauses
+            timeout: Seconds allowed for each request
+        """
+        self.host = host
+        self.port = port
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.requests_served = 0
+        self.requests_failed = 0
+        self._executor = None
+        self._queue = None
+        self._dispatchers = []
+        self._server = None
+        self._connections = set()
+        self._stopping = None
+    
+    async def start(self):
+        """Start the worker pool, wait until every worker is ready and start listening"""
+        loop = asyncio.get_running_loop()
+        # Every worker process warms itself up as it starts, so no request pays
+        # for the compilation; the tasks below only make the pool start them now
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker)
+        await asyncio.gather(*(loop.run_in_executor(self._executor, os.getpid)
+                               for _ in range(self.workers)))
+        
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._stopping = asyncio.Event()
+        self._dispatchers = [loop.create_task(self._dispatch()) for _ in range(self.workers)]
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port,
+                                                  limit=MAX_REQUEST_BYTES)
+        self.port = self._server.sockets[0].getsockname()[1]
+    
+    async def stop(self, grace: float = 10.0):
+        """
+        Stop gracefully: stop accepting connections, let the queued and running
+        requests finish (up to `grace` seconds) and shut the worker pool down
+        
+        Args:
+            grace: Seconds to wait for pending requests
+        """
+        if self._server is None:
+            return
+        self._stopping.set()
+        self._server.close()
+        await self._server.wait_closed()
+        
+        # Connections stop reading new requests once _stopping is set and
+        # finish the ones already accepted
+        if self._connections:
+            await asyncio.wait(list(self._connections), timeout=grace)
+        for connection in self._connections:
+            connection.cancel()
+        for dispatcher in self._dispatchers:
+            dispatcher.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        self._executor.shutdown(wait=True)
+        self._server = None
+    
+    async def serve_forever(self):
+        """Run until SIGINT or SIGTERM, then stop gracefully"""
+        await self.start()
+        loop = asyncio.get_running_loop()
+        finished = asyncio.Event()
+        for signal_number in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signal_number, finished.set)
+            except (NotImplementedError, RuntimeError):
+                pass  # Not available on this platform; Ctrl+C still raises
+        print(f"Serving on {self.host}:{self.port} with {self.workers} workers", flush=True)
+        try:
+            await finished.wait()
+        finally:
+            await self.stop()
+    
+    async def _dispatch(self):
+        """Take queued requests and run them in the pool, one at a time per worker"""
+        loop = asyncio.get_running_loop()
+        while True:
+            function, arguments, future = await self._queue.get()
+            try:
+                if future.done():
+                    continue    # The client already gave up on this request
+                try:
+                    result = await loop.run_in_executor(self._executor, function, *arguments)
+                except Exception as error:
+                    if not future.done():
+                        future.set_exception(error)
+                else:
+                    if not future.done():
+                        future.set_result(result)
+            finally:
+                self._queue.task_done()
+    
+    async def submit(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run a request and return its result
+        
+        Args:
+            request: Decoded request with its "op" and arguments
+        
+        Returns:
+            Dict[str, Any]: Result of the operation
+        
+        Raises:
+            RequestError: If the request is invalid, fails or times out
+        """
+        future, deadline = await self._enqueue(request)
+        return await self._result(future, deadline)
+    
+    async def _enqueue(self, request: Any) -> Tuple[asyncio.Future, float]:
+        """
+        Put a request in the queue, waiting for room if it is full
+        
+        Returns:
+            Tuple[asyncio.Future, float]: Future of the result and the loop
+            time when the request expires
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        function, arguments = self._parse_request(request)
+        future = loop.create_future()
+        if function is None:
+            future.set_result({'pong': True})
+            return future, deadline
+        try:
+            # Waiting for room in the queue counts against the deadline too
+            await asyncio.wait_for(self._queue.put((function, arguments, future)), self.timeout)
+        except asyncio.TimeoutError:
+            raise RequestError(f"Server busy: no worker available within {self.timeout} s", 503)
+        return future, deadline
+    
+    async def _result(self, future: asyncio.Future, deadline: float) -> Dict[str, Any]:
+        """Wait for a queued request until its deadline"""
+        remaining = deadline - asyncio.get_running_loop().time()
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), max(remaining, 0))
+        except asyncio.TimeoutError:
+            future.cancel()
+            raise RequestError(f"Request timed out after {self.timeout} s", 504)
+        except RequestError:
+            raise
+        except Exception as error:
+            raise RequestError(f"{type(error).__name__}: {error}")
+    
+    @staticmethod
+    def _parse_request(request: Any) -> Tuple[Any, tuple]:
+        """Map a request to the worker function and its arguments"""
+        if not isinstance(request, dict):
+            raise RequestError("The request must be a JSON object")
+        operation = request.get('op')
+        if operation == 'analyze':
+            text = request.get('text')
+            if not isinstance(text, str):
+                raise RequestError("'analyze' needs a 'text' string")
+            return _worker_analyze, (text, bool(request.get('advanced', False)))
+        if operation == 'validate' and 'values' in request:
+            values, pattern_name = request['values'], request.get('pattern')
+            if (not isinstance(values, list) or not isinstance(pattern_name, str)
+                    or not all(isinstance(value, str) for value in values)):
+                raise RequestError("'validate' needs a 'values' list of strings and a 'pattern'")
+            return _worker_validate_many, (values, pattern_name)
+        if operation == 'validate':
+            value, pattern_name = request.get('value'), request.get('pattern')
+            if not isinstance(value, str) or not isinstance(pattern_name, str):
+                raise RequestError("'validate' needs 'value' and 'pattern' strings")
+            return _worker_validate, (value, pattern_name)
+        if operation == 'patterns':
+            return _worker_patterns, ()
+        if operation == 'ping':
+            return None, ()
+        raise RequestError(f"Unknown op: {operation!r}")
+    
+    async def _respond(self, request_id: Any, request: Any) -> Tuple[int, Dict[str, Any]]:
+        """Run a request and build its response with an HTTP-like status"""
+        try:
+            result = await self.submit(request)
+        except RequestError as error:
+            return self._failure(request_id, error)
+        return self._success(request_id, result)
+    
+    def _success(self, request_id: Any, result: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        self.requests_served += 1
+        return 200, {'id': request_id, 'ok': True, 'result': result}
+    
+    def _failure(self, request_id: Any, error: RequestError) -> Tuple[int, Dict[str, Any]]:
+        self.requests_failed += 1
+        return error.status, {'id': request_id, 'ok': False, 'error': str(error)}
+    
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            try:
+                first_line = await reader.readline()
+            except ValueError:
+                await self._write_line(writer, {'ok': False, 'error': "Request too large"})
+                return
+            if first_line.startswith(_HTTP_METHODS):
+                await self._handle_http(first_line, reader, writer)
+            else:
+                await self._handle_json_lines(first_line, reader, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+    
+    async def _handle_json_lines(self, line: bytes, reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter):
+        """Serve one request per line until the client closes or the server stops"""
+        write_lock = asyncio.Lock()
+        pending = set()
+        
+        async def answer(request_id, future, deadline):
+            try:
+                result = await self._result(future, deadline)
+            except RequestError as error:
+                _, response = self._failure(request_id, error)
+            else:
+                _, response = self._success(request_id, result)
+            async with write_lock:
+                await self._write_line(writer, response)
+        
+        while line:
+            if line.strip():
+                request_id = None
+                try:
+                    try:
+                        request = json.loads(line)
+                    except ValueError:
+                        raise RequestError("Invalid JSON")
+                    if isinstance(request, dict):
+                        request_id = request.get('id')
+                    # Backpressure: this waits while the queue is full, so the
+                    # next line is not read until a worker frees a slot
+                    future, deadline = await self._enqueue(request)
+                except RequestError as error:
+                    _, response = self._failure(request_id, error)
+                    async with write_lock:
+                        await self._write_line(writer, response)
+                else:
+                    task = asyncio.ensure_future(answer(request_id, future, deadline))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+            try:
+                line = await self._next_line(reader)
+            except ValueError:
+                async with write_lock:
+                    await self._write_line(writer, {'id': None, 'ok': False,
+                                                    'error': "Request too large"})
+                break
+        if pending:
+            await asyncio.wait(pending)
+    
+    async def _next_line(self, reader: asyncio.StreamReader) -> bytes:
+        """Read the next line, or return b'' as soon as the server starts stopping"""
+        if self._stopping.is_set():
+            return b''
+        read = asyncio.ensure_future(reader.readline())
+        stopping = asyncio.ensure_future(self._stopping.wait())
+        await asyncio.wait((read, stopping), return_when=asyncio.FIRST_COMPLETED)
+        stopping.cancel()
+        if read.done():
+            return read.result()
+        read.cancel()
+        return b''
+    
+    async def _handle_http(self, request_line: bytes, reader: asyncio.StreamReader,
+                           writer: asyncio.StreamWriter):
+        """Serve a single HTTP/1.1 request: POST /analyze, /validate or any op; GET /patterns"""
+        method, path = request_line.decode('latin-1').split()[:2]
+        headers = {}
+        while True:
+            header = await reader.readline()
+            if header in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = header.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        
+        operation = path.strip('/').split('?')[0]
+        if method == 'GET' and operation in ('patterns', 'ping'):
+            status, response = await self._respond(None, {'op': operation})
+        elif method != 'POST':
+            status, response = 405, {'ok': False, 'error': "Use POST with a JSON body"}
+        else:
+            length = headers.get('content-length', '0') or '0'
+            length = int(length) if length.isdigit() else -1
+            if length < 0:
+                status, response = 400, {'ok': False, 'error': "Invalid Content-Length"}
+            elif length > MAX_REQUEST_BYTES:
+                status, response = 413, {'ok': False, 'error': "Request too large"}
+            else:
+                body = await reader.readexactly(length)
+                try:
+                    request = json.loads(body) if body else {}
+                except ValueError:
+                    status, response = 400, {'ok': False, 'error': "Invalid JSON"}
+                else:
+                    if isinstance(request, dict) and operation:
+                        request.setdefault('op', operation)
+                    request_id = request.get('id') if isinstance(request, dict) else None
+                    status, response = await self._respond(request_id, request)
+        
+        body = json.dumps(response, ensure_ascii=False, default=str).encode('utf-8')
+        writer.write(f"HTTP/1.1 {status} {_HTTP_REASONS.get(status, '')}\r\n"
+                     f"Content-Type: application/json; charset=utf-8\r\n"
+                     f"Content-Length: {len(body)}\r\n"
+                     f"Connection: close\r\n\r\n".encode('latin-1') + body)
+        await writer.drain()
+    
+    @staticmethod
+    async def _write_line(writer: asyncio.StreamWriter, response: Dict[str, Any]):
+        writer.write(json.dumps(response, ensure_ascii=False, default=str).encode('utf-8') + b'\n')
+        await writer.drain()
+
+
+def main(host: str = '127.0.0.1', port: int = 8765, workers: Optional[int] = None,
+         queue_size: int = 64, timeout: float = 30.0) -> int:
+    """
+    Run the server until interrupted
+    
+    Returns:
+        int: Exit status
+    """
+    server = AnalysisServer(host, port, workers, queue_size, timeout)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    return 0
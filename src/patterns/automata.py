@@ -0,0 +1,788 @@
+"""
+Automata: Compilación de expresiones regulares a autómatas finitos deterministas
+Implementa la construcción de Thompson (regex -> AFN), la construcción de
+subconjuntos (AFN -> AFD) y la minimización de Hopcroft. Las tablas de
+transición se guardan en arreglos compactos y se recorren sin retroceso.
+"""
+
+from array import array
+from bisect import bisect_right
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from .patterns import PatternValidator
+
+
+class UnsupportedPatternError(ValueError):
+    """La expresión usa construcciones que no son regulares o no están soportadas"""
+
+
+# Predicados Unicode equivalentes a las clases de `re` para patrones str
+_PREDICATES = {
+    'd': lambda c: c.isdecimal(),
+    'w': lambda c: c.isalnum() or c == '_',
+    's': lambda c: c.isspace(),
+}
+
+# Combinaciones posibles de (\w, \d, \s) para caracteres no ASCII
+_PREDICATE_COMBOS = ((False, False, False), (True, False, False),
+                     (True, True, False), (False, False, True))
+
+
+# ---------------------------------------------------------------------------
+# Conjuntos de caracteres
+# ---------------------------------------------------------------------------
+
+def _charset(ranges=(), classes=(), negated=False) -> Tuple:
+    """Crea un conjunto de caracteres hashable: (rangos, clases, negado)"""
+    return (tuple(sorted(ranges)), frozenset(classes), negated)
+
+
+def _charset_contains(charset: Tuple, char: str) -> bool:
+    """Indica si un carácter pertenece a un conjunto"""
+    ranges, classes, negated = charset
+    code = ord(char)
+    inside = any(low <= code <= high for low, high in ranges)
+    if not inside:
+        for name in classes:
+            hit = _PREDICATES[name.lower()](char)
+            if hit != name.isupper():
+                inside = True
+                break
+    return inside != negated
+
+
+_ANY_CHAR = _charset(negated=True)
+_DOT = _charset([(10, 10)], negated=True)
+_NEWLINE = _charset([(10, 10)])
+_EMPTY = ('repeat', ('set', _ANY_CHAR), 0, 0)
+
+_ESCAPE_CLASSES = {'d': 'd', 'D': 'D', 'w': 'w', 'W': 'W', 's': 's', 'S': 'S'}
+_ESCAPE_CHARS = {'n': '\n', 't': '\t', 'r': '\r', 'f': '\f', 'v': '\v', 'a': '\a'}
+
+
+# ---------------------------------------------------------------------------
+# Analizador sintáctico de expresiones regulares
+# ---------------------------------------------------------------------------
+
+class _RegexParser:
+    """
+    Analizador descendente recursivo para el subconjunto regular de `re`
+    
+    Produce un árbol de tuplas: ('set', conjunto), ('cat', [nodos]),
+    ('alt', [nodos]), ('repeat', nodo, mínimo, máximo|None), ('look', nodo).
+    """
+    
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self.index = 0
+    
+    def parse(self) -> Tuple[object, bool]:
+        """
+        Analiza el patrón completo
+        
+        Returns:
+            Tuple: (árbol, anclado_al_final)
+        """
+        pattern = self.pattern
+        if pattern.startswith('^'):
+            self.index = 1
+        self.anchored = self.index == 1
+        anchored_end = False
+        if pattern.endswith('$'):
+            backslashes = len(pattern[:-1]) - len(pattern[:-1].rstrip('\\'))
+            if backslashes % 2 == 0:
+                pattern = pattern[:-1]
+                anchored_end = True
+                self.anchored = True
+        self.pattern = pattern
+        
+        node = self._parse_alternation(top_level=True)
+        if self.index != len(self.pattern):
+            raise UnsupportedPatternError(f"Paréntesis sin abrir en la posición {self.index}")
+        return node, anchored_end
+    
+    def _peek(self) -> Optional[str]:
+        return self.pattern[self.index] if self.index < len(self.pattern) else None
+    
+    def _next(self) -> str:
+        if self.index >= len(self.pattern):
+            raise UnsupportedPatternError("Fin inesperado del patrón")
+        char = self.pattern[self.index]
+        self.index += 1
+        return char
+    
+    def _parse_alternation(self, top_level: bool = False):
+        branches = [self._parse_sequence(top_level)]
+        while self._peek() == '|':
+            if top_level and self.anchored:
+                # Las anclas ^/$ pertenecen a una sola rama, no a todo el patrón
+                raise UnsupportedPatternError("Alternación en el nivel superior del patrón")
+            self.index += 1
+            branches.append(self._parse_sequence())
+        return branches[0] if len(branches) == 1 else ('alt', branches)
+    
+    def _parse_sequence(self, top_level: bool = False):
+        items = []
+        while self._peek() is not None and self._peek() not in '|)':
+            if self.pattern.startswith('(?=', self.index):
+                if not top_level or any(item[0] != 'look' for item in items):
+                    raise UnsupportedPatternError("Solo se soportan lookaheads al inicio del patrón")
+                self.index += 3
+                inner = self._parse_alternation()
+                if self._next() != ')':
+                    raise UnsupportedPatternError("Lookahead sin cerrar")
+                items.append(('look', inner))
+                continue
+            items.append(self._parse_quantified())
+        if not items:
+            return _EMPTY
+        if len(items) == 1:
+            return items[0]
+        return ('cat', items)
+    
+    def _parse_quantified(self):
+        node = self._parse_atom()
+        while True:
+            char = self._peek()
+            if char == '*':
+                self.index += 1
+                node = ('repeat', node, 0, None)
+            elif char == '+':
+                self.index += 1
+                node = ('repeat', node, 1, None)
+            elif char == '?':
+                self.index += 1
+                node = ('repeat', node, 0, 1)
+            elif char == '{' and self._looks_like_bounds():
+                node = ('repeat', node) + self._parse_bounds()
+            else:
+                return node
+            # Los cuantificadores perezosos o posesivos no cambian el lenguaje
+            if self._peek() in ('?', '+'):
+                self.index += 1
+    
+    def _looks_like_bounds(self) -> bool:
+        end = self.pattern.find('}', self.index)
+        if end == -1:
+            return False
+        body = self.pattern[self.index + 1:end]
+        parts = body.split(',')
+        if len(parts) == 1:
+            return parts[0].isdigit()
+        return len(parts) == 2 and (parts[0] == '' or parts[0].isdigit()) and (parts[1] == '' or parts[1].isdigit())
+    
+    def _parse_bounds(self) -> Tuple[int, Optional[int]]:
+        end = self.pattern.index('}', self.index)
+        body = self.pattern[self.index + 1:end]
+        self.index = end + 1
+        if ',' not in body:
+            return int(body), int(body)
+        low, high = body.split(',')
+        return (int(low) if low else 0), (int(high) if high else None)
+    
+    def _parse_atom(self):
+        char = self._next()
+        if char == '(':
+            if self.pattern.startswith('?:', self.index):
+                self.index += 2
+            elif self.pattern.startswith('?P<', self.index):
+                self.index = self.pattern.index('>', self.index) + 1
+            elif self._peek() == '?':
+                raise UnsupportedPatternError(f"Grupo especial no soportado en la posición {self.index}")
+            node = self._parse_alternation()
+            if self._next() != ')':
+                raise UnsupportedPatternError("Grupo sin cerrar")
+            return node
+        if char == '[':
+            return ('set', self._parse_class())
+        if char == '.':
+            return ('set', _DOT)
+        if char == '\\':
+            return ('set', self._parse_escape(in_class=False))
+        if char in '^$':
+            raise UnsupportedPatternError("Anclas en medio del patrón no soportadas")
+        if char in '*+?':
+            raise UnsupportedPatternError("Cuantificador sin operando")
+        return ('set', _charset([(ord(char), ord(char))]))
+    
+    def _parse_escape(self, in_class: bool) -> Tuple:
+        char = self._next()
+        if char in _ESCAPE_CLASSES:
+            return _charset(classes=[_ESCAPE_CLASSES[char]])
+        if char in _ESCAPE_CHARS:
+            code = ord(_ESCAPE_CHARS[char])
+        elif char == 'x':
+            code = int(self._take(2), 16)
+        elif char == 'u':
+            code = int(self._take(4), 16)
+        elif char == 'U':
+            code = int(self._take(8), 16)
+        elif char == 'b' and in_class:
+            code = 8
+        elif char.isalnum():
+            raise UnsupportedPatternError(f"Escape \\{char} no soportado")
+        else:
+            code = ord(char)
+        return _charset([(code, code)])
+    
+    def _take(self, count: int) -> str:
+        value = self.pattern[self.index:self.index + count]
+        if len(value) != count:
+            raise UnsupportedPatternError("Escape incompleto")
+        self.index += count
+        return value
+    
+    def _parse_class(self) -> Tuple:
+        negated = False
+        if self._peek() == '^':
+            negated = True
+            self.index += 1
+        ranges, classes = [], []
+        first = True
+        while True:
+            char = self._next()
+            if char == ']' and not first:
+                break
+            first = False
+            if char == '\\':
+                item = self._parse_escape(in_class=True)
+                if item[1]:
+                    classes.extend(item[1])
+                    continue
+                low = item[0][0][0]
+            else:
+                low = ord(char)
+            # Rango a-z, salvo que el guion sea el último carácter de la clase
+            if self._peek() == '-' and self.pattern[self.index + 1:self.index + 2] not in ('', ']'):
+                self.index += 1
+                end_char = self._next()
+                if end_char == '\\':
+                    item = self._parse_escape(in_class=True)
+                    if item[1]:
+                        raise UnsupportedPatternError("Rango con clase de caracteres")
+                    high = item[0][0][0]
+                else:
+                    high = ord(end_char)
+                if high < low:
+                    raise UnsupportedPatternError("Rango invertido en clase de caracteres")
+                ranges.append((low, high))
+            else:
+                ranges.append((low, low))
+        return _charset(ranges, classes, negated)
+
+
+def parse_regex(pattern: str) -> Tuple[object, bool]:
+    """
+    Convierte una expresión regular en su árbol sintáctico
+    
+    Args:
+        pattern: Expresión regular en la sintaxis de `re`
+    
+    Returns:
+        Tuple: (árbol, anclado_al_final)
+    
+    Raises:
+        UnsupportedPatternError: Si la expresión no es regular o no está soportada
+    """
+    return _RegexParser(pattern).parse()
+
+
+def _collect_charsets(node, found: set):
+    """Recolecta todos los conjuntos de caracteres del árbol"""
+    kind = node[0]
+    if kind == 'set':
+        found.add(node[1])
+    elif kind in ('cat', 'alt'):
+        for child in node[1]:
+            _collect_charsets(child, found)
+    else:
+        _collect_charsets(node[1], found)
+
+
+# ---------------------------------------------------------------------------
+# Alfabeto comprimido en clases de equivalencia
+# ---------------------------------------------------------------------------
+
+class Alphabet:
+    """
+    Partición de los caracteres en clases de equivalencia
+    
+    Dos caracteres están en la misma clase si pertenecen exactamente a los
+    mismos conjuntos del patrón; así la tabla tiene una columna por clase.
+    """
+    
+    def __init__(self, charsets):
+        self.charsets = sorted(charsets, key=repr)
+        vectors = {}
+        self.members = []
+        
+        def class_for(vector) -> int:
+            if vector not in vectors:
+                vectors[vector] = len(vectors)
+                self.members.append(frozenset(i for i, bit in enumerate(vector) if bit))
+            return vectors[vector]
+        
+        # Tabla directa para ASCII
+        self.ascii_map = bytearray(128)
+        for code in range(128):
+            char = chr(code)
+            self.ascii_map[code] = class_for(tuple(_charset_contains(cs, char) for cs in self.charsets))
+        
+        # Fuera de ASCII la pertenencia depende del segmento de rangos y de los
+        # predicados Unicode, así que basta enumerar segmentos x combinaciones
+        boundaries = {128}
+        for ranges, _, _ in self.charsets:
+            for low, high in ranges:
+                if high >= 128:
+                    boundaries.add(max(low, 128))
+                    boundaries.add(high + 1)
+        self.boundaries = sorted(b for b in boundaries if b <= 0x110000)
+        self._segment_classes = []
+        for start in self.boundaries:
+            for word, digit, space in _PREDICATE_COMBOS:
+                vector = []
+                for ranges, classes, negated in self.charsets:
+                    inside = any(low <= start <= high for low, high in ranges)
+                    for name in classes:
+                        hit = {'w': word, 'd': digit, 's': space}[name.lower()]
+                        if hit != name.isupper():
+                            inside = True
+                    vector.append(inside != negated)
+                self._segment_classes.append(class_for(tuple(vector)))
+        self.size = len(vectors)
+        self._cache = {}
+        self._charset_index = {cs: i for i, cs in enumerate(self.charsets)}
+    
+    def class_of(self, char: str) -> int:
+        """Obtiene la clase de equivalencia de un carácter"""
+        code = ord(char)
+        if code < 128:
+            return self.ascii_map[code]
+        cls = self._cache.get(char)
+        if cls is None:
+            segment = bisect_right(self.boundaries, code) - 1
+            word = char.isalnum() or char == '_'
+            combo = 3 if char.isspace() else (2 if char.isdecimal() else (1 if word else 0))
+            cls = self._segment_classes[segment * 4 + combo]
+            self._cache[char] = cls
+        return cls
+    
+    def classes_of_charset(self, charset: Tuple) -> List[int]:
+        """Clases de equivalencia contenidas en un conjunto"""
+        index = self._charset_index[charset]
+        return [cls for cls, members in enumerate(self.members) if index in members]
+
+
+# ---------------------------------------------------------------------------
+# Construcción de Thompson y de subconjuntos
+# ---------------------------------------------------------------------------
+
+class _NFA:
+    """Autómata finito no determinista con transiciones épsilon"""
+    
+    def __init__(self):
+        self.epsilon = []
+        self.edges = []
+    
+    def new_state(self) -> int:
+        self.epsilon.append([])
+        self.edges.append([])
+        return len(self.edges) - 1
+    
+    def build(self, node) -> Tuple[int, int]:
+        """Construcción de Thompson: retorna (inicio, aceptación) del fragmento"""
+        kind = node[0]
+        if kind == 'set':
+            start, end = self.new_state(), self.new_state()
+            self.edges[start].append((node[1], end))
+            return start, end
+        if kind == 'cat':
+            start, end = self.build(node[1][0])
+            for child in node[1][1:]:
+                child_start, child_end = self.build(child)
+                self.epsilon[end].append(child_start)
+                end = child_end
+            return start, end
+        if kind == 'alt':
+            start, end = self.new_state(), self.new_state()
+            for child in node[1]:
+                child_start, child_end = self.build(child)
+                self.epsilon[start].append(child_start)
+                self.epsilon[child_end].append(end)
+            return start, end
+        if kind == 'repeat':
+            _, child, minimum, maximum = node
+            start = end = self.new_state()
+            for _ in range(minimum):
+                child_start, child_end = self.build(child)
+                self.epsilon[end].append(child_start)
+                end = child_end
+            if maximum is None:
+                loop_start, loop_end = self.build(child)
+                exit_state = self.new_state()
+                self.epsilon[end] += [loop_start, exit_state]
+                self.epsilon[loop_end] += [loop_start, exit_state]
+                end = exit_state
+            else:
+                exit_state = self.new_state()
+                for _ in range(maximum - minimum):
+                    child_start, child_end = self.build(child)
+                    self.epsilon[end] += [child_start, exit_state]
+                    end = child_end
+                self.epsilon[end].append(exit_state)
+                end = exit_state
+            return start, end
+        raise UnsupportedPatternError(f"Nodo no soportado: {kind}")
+    
+    def closure(self, states) -> frozenset:
+        stack = list(states)
+        seen = set(stack)
+        while stack:
+            for target in self.epsilon[stack.pop()]:
+                if target not in seen:
+                    seen.add(target)
+                    stack.append(target)
+        return frozenset(seen)
+
+
+def _determinize(nfa: _NFA, start: int, accept: int, alphabet: Alphabet) -> Tuple[List[List[int]], List[bool]]:
+    """Construcción de subconjuntos: retorna un AFD completo (tabla y aceptación)"""
+    charset_classes = {}
+    for edges in nfa.edges:
+        for charset, _ in edges:
+            if charset not in charset_classes:
+                charset_classes[charset] = alphabet.classes_of_charset(charset)
+    
+    start_set = nfa.closure([start])
+    index = {start_set: 0}
+    states = [start_set]
+    table, accepting = [], []
+    position = 0
+    while position < len(states):
+        current = states[position]
+        position += 1
+        buckets = {}
+        for state in current:
+            for charset, target in nfa.edges[state]:
+                for cls in charset_classes[charset]:
+                    buckets.setdefault(cls, set()).add(target)
+        row = []
+        for cls in range(alphabet.size):
+            targets = nfa.closure(buckets[cls]) if cls in buckets else frozenset()
+            if targets not in index:
+                index[targets] = len(states)
+                states.append(targets)
+            row.append(index[targets])
+        table.append(row)
+        accepting.append(accept in current)
+    return table, accepting
+
+
+def _product(tables: List[List[List[int]]], labels_list: List[List[int]], combine) -> Tuple[List[List[int]], List[int]]:
+    """Producto sincrónico de varios AFD completos con etiquetas combinadas"""
+    start = tuple(0 for _ in tables)
+    index = {start: 0}
+    states = [start]
+    table, labels = [], []
+    position = 0
+    nclasses = len(tables[0][0])
+    while position < len(states):
+        current = states[position]
+        position += 1
+        row = []
+        for cls in range(nclasses):
+            target = tuple(component[state][cls] for component, state in zip(tables, current))
+            if target not in index:
+                index[target] = len(states)
+                states.append(target)
+            row.append(index[target])
+        table.append(row)
+        labels.append(combine([component_labels[state] for component_labels, state in zip(labels_list, current)]))
+    return table, labels
+
+
+def _minimize(table: List[List[int]], labels: List[int]) -> Tuple[List[List[int]], List[int], int]:
+    """
+    Minimización de Hopcroft por refinamiento de particiones
+    
+    Args:
+        table: AFD completo, con el estado inicial en 0
+        labels: Etiqueta de aceptación de cada estado (-1 si no acepta)
+    
+    Returns:
+        Tuple: (tabla mínima, etiquetas, estado inicial)
+    """
+    nstates = len(table)
+    nclasses = len(table[0])
+    
+    inverse = [[[] for _ in range(nstates)] for _ in range(nclasses)]
+    for state, row in enumerate(table):
+        for cls, target in enumerate(row):
+            inverse[cls][target].append(state)
+    
+    groups = {}
+    for state, label in enumerate(labels):
+        groups.setdefault(label, set()).add(state)
+    blocks = list(groups.values())
+    block_of = [0] * nstates
+    for number, block in enumerate(blocks):
+        for state in block:
+            block_of[state] = number
+    
+    largest = max(range(len(blocks)), key=lambda number: len(blocks[number]))
+    pending = set(range(len(blocks))) - {largest}
+    
+    while pending:
+        splitter = blocks[pending.pop()]
+        for cls in range(nclasses):
+            predecessors = set()
+            for target in splitter:
+                predecessors.update(inverse[cls][target])
+            if not predecessors:
+                continue
+            touched = {}
+            for state in predecessors:
+                touched.setdefault(block_of[state], set()).add(state)
+            for number, inside in touched.items():
+                block = blocks[number]
+                if len(inside) == len(block):
+                    continue
+                outside = block - inside
+                blocks[number] = inside
+                blocks.append(outside)
+                new_number = len(blocks) - 1
+                for state in outside:
+                    block_of[state] = new_number
+                if number in pending:
+                    pending.add(new_number)
+                else:
+                    pending.add(number if len(inside) <= len(outside) else new_number)
+    
+    # Renumerar en orden de recorrido desde el inicial para una tabla compacta
+    order = {block_of[0]: 0}
+    queue = deque([block_of[0]])
+    representatives = {}
+    for state in range(nstates):
+        representatives.setdefault(block_of[state], state)
+    minimal_table, minimal_labels = [], []
+    while queue:
+        number = queue.popleft()
+        state = representatives[number]
+        row = []
+        for target in table[state]:
+            target_block = block_of[target]
+            if target_block not in order:
+                order[target_block] = len(order)
+                queue.append(target_block)
+            row.append(order[target_block])
+        minimal_table.append(row)
+        minimal_labels.append(labels[state])
+    return minimal_table, minimal_labels, 0
+
+
+# ---------------------------------------------------------------------------
+# AFD compilado
+# ---------------------------------------------------------------------------
+
+class DFA:
+    """Autómata finito determinista con tabla de transiciones compacta"""
+    
+    def __init__(self, table: List[List[int]], labels: List[int], alphabet: Alphabet):
+        self.alphabet = alphabet
+        self.nclasses = alphabet.size
+        self.state_count = len(table)
+        typecode = 'H' if self.state_count < 65536 else 'I'
+        self.transitions = array(typecode, (target for row in table for target in row))
+        self.labels = array('b' if max(labels) < 128 else 'h', labels)
+        self.start = 0
+        # Estado sumidero: no acepta y todas sus transiciones vuelven a él
+        self.dead = -1
+        for state, row in enumerate(table):
+            if labels[state] < 0 and all(target == state for target in row):
+                self.dead = state
+                break
+    
+    def run(self, text: str) -> int:
+        """
+        Recorre el texto sin retroceso
+        
+        Args:
+            text: Texto completo a reconocer
+        
+        Returns:
+            int: Etiqueta del estado final (-1 si no es aceptado)
+        """
+        transitions = self.transitions
+        nclasses = self.nclasses
+        ascii_map = self.alphabet.ascii_map
+        class_of = self.alphabet.class_of
+        dead = self.dead
+        state = self.start
+        for char in text:
+            code = ord(char)
+            state = transitions[state * nclasses + (ascii_map[code] if code < 128 else class_of(char))]
+            if state == dead:
+                return -1
+        return self.labels[state]
+    
+    def fullmatch(self, text: str) -> bool:
+        """Indica si el texto completo pertenece al lenguaje del autómata"""
+        return self.run(text) >= 0
+    
+    def memory_usage(self) -> int:
+        """Bytes ocupados por las tablas del autómata"""
+        return (self.transitions.itemsize * len(self.transitions) +
+                self.labels.itemsize * len(self.labels) + len(self.alphabet.ascii_map))
+
+
+def _pattern_tables(pattern: str, alphabet: Alphabet) -> Tuple[List[List[int]], List[int]]:
+    """Compila una expresión a un AFD mínimo sobre un alfabeto dado"""
+    tree, anchored_end = parse_regex(pattern)
+    items = tree[1] if tree[0] == 'cat' else [tree]
+    looks = [item[1] for item in items if item[0] == 'look']
+    body = [item for item in items if item[0] != 'look']
+    if not body:
+        tree = _EMPTY
+    else:
+        tree = body[0] if len(body) == 1 else ('cat', body)
+    
+    # Sin '$' final, `re.match` acepta cualquier continuación; con '$', un
+    # único salto de línea al final también coincide
+    if anchored_end:
+        components = [('cat', [tree, ('repeat', ('set', _NEWLINE), 0, 1)])]
+    else:
+        components = [('cat', [tree, ('repeat', ('set', _ANY_CHAR), 0, None)])]
+    # (?=X) al inicio equivale a intersectar con X seguido de cualquier cosa
+    components += [('cat', [look, ('repeat', ('set', _ANY_CHAR), 0, None)]) for look in looks]
+    
+    tables, labels_list = [], []
+    for component in components:
+        nfa = _NFA()
+        start, accept = nfa.build(component)
+        table, accepting = _determinize(nfa, start, accept, alphabet)
+        labels = [0 if flag else -1 for flag in accepting]
+        table, labels, _ = _minimize(table, labels)
+        tables.append(table)
+        labels_list.append(labels)
+    
+    if len(tables) > 1:
+        table, labels = _product(tables, labels_list,
+                                 lambda values: 0 if all(v >= 0 for v in values) else -1)
+        table, labels, _ = _minimize(table, labels)
+        return table, labels
+    return tables[0], labels_list[0]
+
+
+def _alphabet_for(patterns: List[str]) -> Alphabet:
+    charsets = {_ANY_CHAR, _NEWLINE}
+    for pattern in patterns:
+        tree, _ = parse_regex(pattern)
+        _collect_charsets(tree, charsets)
+    return Alphabet(charsets)
+
+
+def compile_dfa(pattern: str) -> DFA:
+    """
+    Compila una expresión regular a un AFD mínimo
+    
+    Args:
+        pattern: Expresión regular (con la semántica de `re.match`)
+    
+    Returns:
+        DFA: Autómata listo para reconocer textos completos
+    
+    Raises:
+        UnsupportedPatternError: Si la expresión no puede expresarse como AFD
+    """
+    alphabet = _alphabet_for([pattern])
+    table, labels = _pattern_tables(pattern, alphabet)
+    return DFA(table, labels, alphabet)
+
+
+# Autómatas ya compilados, compartidos por todos los clasificadores del proceso
+_CLASSIFIER_CACHE = {}
+
+
+class DFAClassifier:
+    """
+    Clasificador de lexemas basado en un único AFD producto de todos los patrones
+    
+    Cada estado del AFD producto se etiqueta con el primer patrón (en orden de
+    prioridad) que acepta, así una sola pasada lineal clasifica el lexema. Los
+    patrones que no pueden compilarse se evalúan con `re` respetando su prioridad.
+    """
+    
+    def __init__(self, pattern_validator: PatternValidator):
+        self.pattern_validator = pattern_validator
+        self._load()
+    
+    def _load(self):
+        """Obtiene (o compila) el autómata del conjunto de patrones actual"""
+        pattern_validator = self.pattern_validator
+        self._version = pattern_validator.version
+        names = pattern_validator.get_available_patterns()
+        key = tuple((name, pattern_validator.patterns[name]) for name in names)
+        cached = _CLASSIFIER_CACHE.get(key)
+        if cached is None:
+            cached = self._compile(names, pattern_validator.patterns)
+            _CLASSIFIER_CACHE[key] = cached
+        self.dfa, self.pattern_names, self.fallback = cached
+    
+    @staticmethod
+    def _compile(names: List[str], patterns: Dict[str, str]):
+        supported, fallback = [], []
+        for priority, name in enumerate(names):
+            try:
+                parse_regex(patterns[name])
+                supported.append(name)
+            except UnsupportedPatternError:
+                fallback.append((priority, name))
+        
+        if not supported:
+            return None, [], fallback
+        
+        alphabet = _alphabet_for([patterns[name] for name in supported])
+        tables, labels_list = [], []
+        for index, name in enumerate(supported):
+            table, labels = _pattern_tables(patterns[name], alphabet)
+            tables.append(table)
+            labels_list.append([index if label >= 0 else -1 for label in labels])
+        
+        def first_accepting(values):
+            for value in values:
+                if value >= 0:
+                    return value
+            return -1
+        
+        table, labels = _product(tables, labels_list, first_accepting)
+        table, labels, _ = _minimize(table, labels)
+        # Prioridad global de cada patrón compilado, para combinar con los de respaldo
+        priorities = {name: priority for priority, name in enumerate(names)}
+        return DFA(table, labels, alphabet), [(priorities[name], name) for name in supported], fallback
+    
+    def classify(self, text: str) -> Optional[str]:
+        """
+        Clasifica un texto con una pasada lineal del AFD
+        
+        Args:
+            text: Texto a clasificar
+        
+        Returns:
+            Optional[str]: Nombre del primer patrón que coincide, None si ninguno
+        """
+        if self._version != self.pattern_validator.version:
+            self._load()
+        
+        text = text.strip()
+        best_priority, best_name = len(self.pattern_names) + len(self.fallback), None
+        if self.dfa is not None:
+            label = self.dfa.run(text)
+            if label >= 0:
+                best_priority, best_name = self.pattern_names[label]
+        for priority, name in self.fallback:
+            if priority > best_priority:
+                break
+            if self.pattern_validator.validate_pattern(text, name):
+                return name
+        return best_name
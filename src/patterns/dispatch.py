@@ -0,0 +1,252 @@
+"""
+Dispatch: Tabla de despacho por forma del lexema
+Descarta los patrones imposibles según una firma barata del texto antes de
+evaluar cualquier expresión regular
+"""
+
+from typing import Dict, Optional, Tuple
+from .patterns import PatternValidator
+
+
+# Composición del lexema
+KIND_DIGITS = 0    # Solo dígitos
+KIND_ALPHA = 1     # Solo letras
+KIND_ALNUM = 2     # Letras y dígitos
+KIND_MIXED = 3     # Contiene otros caracteres
+
+# Clase del primer carácter
+FIRST_DIGIT = 0
+FIRST_UPPER = 1
+FIRST_LOWER = 2
+FIRST_SIGN = 3
+FIRST_OTHER = 4
+
+# Caracteres relevantes presentes en el lexema
+HAS_AT = 1 << 7
+HAS_DOT = 1 << 8
+HAS_SLASH = 1 << 9
+HAS_COLON = 1 << 10
+
+ALL_KINDS = (KIND_DIGITS, KIND_ALPHA, KIND_ALNUM, KIND_MIXED)
+ALL_FIRST = (FIRST_DIGIT, FIRST_UPPER, FIRST_LOWER, FIRST_SIGN, FIRST_OTHER)
+ALL_BUCKETS = (0, 1, 2, 3)
+
+_FIRST_CLASS = {}
+_FIRST_CLASS.update((c, FIRST_DIGIT) for c in '0123456789')
+_FIRST_CLASS.update((c, FIRST_UPPER) for c in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ')
+_FIRST_CLASS.update((c, FIRST_LOWER) for c in 'abcdefghijklmnopqrstuvwxyz')
+_FIRST_CLASS.update((c, FIRST_SIGN) for c in '+-')
+
+# Cubeta de longitud: 0 (<6), 1 (6-7), 2 (8-10), 3 (11+)
+_LENGTH_BUCKET = (0, 0, 0, 0, 0, 0, 1, 1, 2, 2, 2)
+
+# Restricciones de forma necesarias (nunca suficientes) para cada patrón.
+# Un patrón sin regla, por ejemplo uno agregado por el usuario, nunca se descarta.
+SHAPE_RULES = {
+    'email': {'kinds': (KIND_MIXED,), 'buckets': (1, 2, 3),
+              'requires': HAS_AT | HAS_DOT, 'excludes': HAS_SLASH | HAS_COLON},
+    'telefono': {'kinds': (KIND_DIGITS, KIND_MIXED), 'buckets': (2, 3),
+                 'first': (FIRST_DIGIT, FIRST_SIGN),
+                 'excludes': HAS_AT | HAS_DOT | HAS_SLASH | HAS_COLON},
+    'fecha': {'kinds': (KIND_MIXED,), 'buckets': (2,), 'first': (FIRST_DIGIT,),
+              'excludes': HAS_AT | HAS_DOT | HAS_COLON},
+    'cedula': {'kinds': (KIND_DIGITS,), 'buckets': (2,), 'first': (FIRST_DIGIT,)},
+    'url': {'kinds': (KIND_MIXED,), 'buckets': (2, 3), 'first': (FIRST_LOWER,),
+            'requires': HAS_SLASH | HAS_COLON, 'excludes': HAS_AT},
+    'codigo_postal': {'kinds': (KIND_DIGITS,), 'buckets': (1,), 'first': (FIRST_DIGIT,)},
+    'ip_address': {'kinds': (KIND_MIXED,), 'buckets': (1, 2, 3), 'first': (FIRST_DIGIT,),
+                   'requires': HAS_DOT, 'excludes': HAS_AT | HAS_SLASH | HAS_COLON},
+    'placa_vehiculo': {'kinds': (KIND_ALNUM, KIND_MIXED), 'buckets': (1,),
+                       'first': (FIRST_UPPER,),
+                       'excludes': HAS_AT | HAS_DOT | HAS_SLASH | HAS_COLON},
+    'password_segura': {'kinds': (KIND_MIXED,), 'buckets': (2, 3),
+                        'first': (FIRST_DIGIT, FIRST_UPPER, FIRST_LOWER, FIRST_OTHER),
+                        'excludes': HAS_DOT | HAS_SLASH | HAS_COLON},
+    'numero_entero': {'kinds': (KIND_DIGITS, KIND_MIXED), 'first': (FIRST_DIGIT, FIRST_SIGN),
+                      'excludes': HAS_AT | HAS_DOT | HAS_SLASH | HAS_COLON},
+    'numero_decimal': {'kinds': (KIND_DIGITS, KIND_MIXED),
+                       'first': (FIRST_DIGIT, FIRST_SIGN, FIRST_OTHER),
+                       'excludes': HAS_AT | HAS_SLASH | HAS_COLON},
+}
+
+
+def compute_signature(text: str) -> int:
+    """
+    Calcula la firma de forma de un lexema
+    
+    La firma combina en un entero la composición de caracteres, la clase del
+    primer carácter, la cubeta de longitud y la presencia de '@', '.', '/' y ':'.
+    
+    Args:
+        text: Lexema ya recortado
+    
+    Returns:
+        int: Firma de forma
+    """
+    if text.isdigit():
+        signature = KIND_DIGITS
+    elif text.isalpha():
+        signature = KIND_ALPHA
+    elif text.isalnum():
+        signature = KIND_ALNUM
+    else:
+        signature = KIND_MIXED
+    
+    length = len(text)
+    first = _FIRST_CLASS.get(text[0], FIRST_OTHER) if length else FIRST_OTHER
+    signature |= first << 2
+    signature |= (_LENGTH_BUCKET[length] if length < 11 else 3) << 5
+    
+    if '@' in text:
+        signature |= HAS_AT
+    if '.' in text:
+        signature |= HAS_DOT
+    if '/' in text:
+        signature |= HAS_SLASH
+    if ':' in text:
+        signature |= HAS_COLON
+    
+    return signature
+
+
+def signature_allows(signature: int, rule: Dict) -> bool:
+    """
+    Indica si un lexema con la firma dada podría cumplir una regla de forma
+    
+    Args:
+        signature: Firma calculada con compute_signature
+        rule: Regla de SHAPE_RULES
+    
+    Returns:
+        bool: False si el patrón es imposible para esa firma
+    """
+    if (signature & 3) not in rule.get('kinds', ALL_KINDS):
+        return False
+    if ((signature >> 2) & 7) not in rule.get('first', ALL_FIRST):
+        return False
+    if ((signature >> 5) & 3) not in rule.get('buckets', ALL_BUCKETS):
+        return False
+    requires = rule.get('requires', 0)
+    if signature & requires != requires:
+        return False
+    if signature & rule.get('excludes', 0):
+        return False
+    return True
+
+
+class ShapeDispatcher:
+    """Capa de despacho que clasifica lexemas evaluando solo los patrones posibles"""
+    
+    def __init__(self, pattern_validator: PatternValidator):
+        self.pattern_validator = pattern_validator
+        # firma -> (patrones candidatos, expresión fusionada de los candidatos).
+        # La tabla vive en el registro de patrones, así la comparten todos los
+        # despachadores cuyos validadores usan el mismo registro.
+        self.dispatch_table = pattern_validator.registry.get_cache('dispatch')
+        self.signature_counts = {}
+        self._version = pattern_validator.version
+    
+    def get_candidates(self, text: str) -> Tuple[str, ...]:
+        """
+        Obtiene los patrones que podrían coincidir con un texto
+        
+        Args:
+            text: Texto a evaluar
+        
+        Returns:
+            Tuple[str, ...]: Patrones candidatos en orden de prioridad
+        """
+        return self._lookup(compute_signature(text.strip()))[0]
+    
+    def classify(self, text: str) -> Optional[str]:
+        """
+        Clasifica un texto evaluando únicamente los patrones candidatos
+        
+        Args:
+            text: Texto a clasificar
+        
+        Returns:
+            Optional[str]: Nombre del primer patrón que coincide, None si ninguno
+        """
+        if self._version != self.pattern_validator.version:
+            self._reset()
+        
+        text = text.strip()
+        signature = compute_signature(text)
+        counts = self.signature_counts
+        counts[signature] = counts.get(signature, 0) + 1
+        
+        entry = self.dispatch_table.get(signature)
+        if entry is None:
+            entry = self._lookup(signature)
+        
+        combined = entry[1]
+        if combined is None:
+            return None
+        match = combined.match(text)
+        return match.lastgroup if match else None
+    
+    def _reset(self):
+        """Toma la tabla de la versión actual de los patrones y descarta los contadores"""
+        self.dispatch_table = self.pattern_validator.registry.get_cache('dispatch')
+        self.signature_counts = {}
+        self._version = self.pattern_validator.version
+    
+    def _lookup(self, signature: int) -> Tuple[Tuple[str, ...], object]:
+        """Obtiene (y memoriza) la entrada de la tabla para una firma"""
+        if self._version != self.pattern_validator.version:
+            self._reset()
+        entry = self.dispatch_table.get(signature)
+        if entry is None:
+            # Las reglas de forma solo describen las definiciones originales
+            custom = self.pattern_validator.custom_patterns
+            candidates = tuple(
+                name for name in self.pattern_validator.get_available_patterns()
+                if name in custom or name not in SHAPE_RULES
+                or signature_allows(signature, SHAPE_RULES[name])
+            )
+            combined = None
+            if candidates:
+                # Las firmas con los mismos candidatos comparten la expresión
+                combined = self.pattern_validator.build_combined_pattern(list(candidates))
+            entry = (candidates, combined)
+            self.dispatch_table[signature] = entry
+        return entry
+    
+    def get_skip_counters(self) -> Dict[str, int]:
+        """
+        Obtiene cuántas veces se descartó cada patrón sin evaluar su expresión
+        
+        Returns:
+            Dict[str, int]: Descartes por patrón
+        """
+        skips = {name: 0 for name in self.pattern_validator.get_available_patterns()}
+        for signature, count in self.signature_counts.items():
+            candidates = self._lookup(signature)[0]
+            for name in skips:
+                if name not in candidates:
+                    skips[name] += count
+        return skips
+    
+    def get_dispatch_statistics(self) -> Dict[str, object]:
+        """
+        Resume el trabajo ahorrado por la tabla de despacho
+        
+        Returns:
+            Dict[str, object]: Lexemas evaluados, evaluaciones evitadas y descartes por patrón
+        """
+        skips = self.get_skip_counters()
+        total = sum(self.signature_counts.values())
+        no_candidates = sum(
+            count for signature, count in self.signature_counts.items()
+            if not self._lookup(signature)[0]
+        )
+        total_checks = total * len(skips)
+        return {
+            'lexemes_classified': total,
+            'regex_calls_avoided': no_candidates,
+            'pattern_checks_skipped': sum(skips.values()),
+            'skip_ratio': sum(skips.values()) / total_checks if total_checks else 0,
+            'distinct_signatures': len(self.signature_counts),
+            'skips_by_pattern': skips,
+        }
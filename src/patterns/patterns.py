@@ -1,56 +1,178 @@
 """
 Patterns: Módulo de expresiones regulares para validación de patrones
-Contiene las definiciones de patrones comunes para análisis léxico
+Valida, clasifica y busca texto con los patrones comunes para análisis léxico
+(definidos en registry.py)
 """
 
 import re
-from typing import Dict, List, Tuple
+from itertools import islice
+from types import MappingProxyType
+from typing import AbstractSet, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .registry import CompiledPatterns, PatternRegistry, get_default_registry
+
+
+# Valores por bloque en validate_many: acota la memoria con generadores largos
+VALIDATE_CHUNK_SIZE = 65536
+
+# Signos que siempre cortan un token (los mismos que separa el analizador léxico)
+TOKEN_PUNCTUATION = ',;!?()[]{}"\''
+
+# Límites de una coincidencia en modo búsqueda: no puede estar pegada a otro
+# carácter de token por ninguno de sus dos lados,
+# ni empezar o terminar con un espacio (un token nunca lo hace)
+_TOKEN_CHAR = '[^\\s' + re.escape(TOKEN_PUNCTUATION) + ']'
+# Signos que cierran una frase: al final de una coincidencia quedan fuera de
+# ella ('escriba a user@test.com.' encuentra 'user@test.com')
+SENTENCE_PUNCTUATION = '.,;:'
+SEARCH_START = f'(?<!{_TOKEN_CHAR})(?=\\S)'
+SEARCH_END = f'(?<=[^\\s{SENTENCE_PUNCTUATION}])(?=[{SENTENCE_PUNCTUATION}]?(?!{_TOKEN_CHAR}))'
+
+
+def to_search_pattern(pattern: str) -> str:
+    """
+    Convierte un patrón anclado (^...$) en uno para buscar dentro de un texto
+    
+    Quita las anclas exteriores. El '.' fuera de clases pasa a ser cualquier
+    carácter de token, para que un lookahead como (?=.*\\d) no mire más allá
+    del token donde empieza la coincidencia, y '\\s' pasa a ser solo espacio o
+    tabulador, para que una coincidencia no cruce saltos de línea. Los límites
+    SEARCH_START y SEARCH_END se agregan al combinar los patrones.
+    
+    Args:
+        pattern: Expresión regular anclada de self.patterns
+    
+    Returns:
+        str: Cuerpo de la expresión sin anclas
+    """
+    parts = []
+    in_class = False
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char == '\\':
+            escape = pattern[index:index + 2]
+            if escape == '\\s':
+                escape = ' \\t' if in_class else '[ \\t]'
+            parts.append(escape)
+            index += 2
+            continue
+        if in_class:
+            if char == ']' and not parts[-1].endswith('['):
+                in_class = False
+        elif char == '[':
+            in_class = True
+        elif char == '.':
+            char = _TOKEN_CHAR
+        elif char == '^' and index == 0:
+            char = ''
+        elif char == '$' and index == len(pattern) - 1:
+            char = ''
+        parts.append(char)
+        index += 1
+    return ''.join(parts)
+
+
+# Marca de un prefiltro que todavía no se derivó
+_NOT_BUILT = object()
+
+
+# Fracción de valores distintos por encima de la cual validate_many deja de
+# agrupar valores repetidos (agruparlos solo compensa si hay repeticiones)
+DEDUPLICATE_MAX_RATIO = 0.5
 
 
 class PatternValidator:
     """Clase que contiene las expresiones regulares y métodos de validación"""
     
-    def __init__(self):
-        # Definición de patrones mediante expresiones regulares
-        self.patterns = {
-            # Correo electrónico: usuario@dominio.extension
-            'email': r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$',
-            
-            # Teléfono colombiano: formatos +57, 57, 3xx xxx xxxx, etc.
-            'telefono': r'^(\+57|57)?[\s\-]?[3][0-9]{2}[\s\-]?[0-9]{3}[\s\-]?[0-9]{4}$',
-            
-            # Fecha: dd/mm/yyyy, dd-mm-yyyy, yyyy/mm/dd
-            'fecha': r'^(?:(?:0?[1-9]|[12][0-9]|3[01])[\/\-](?:0?[1-9]|1[012])[\/\-](?:19|20)\d{2}|(?:19|20)\d{2}[\/\-](?:0?[1-9]|1[012])[\/\-](?:0?[1-9]|[12][0-9]|3[01]))$',
-            
-            # Cédula colombiana: 8-10 dígitos
-            'cedula': r'^[1-9][0-9]{7,9}$',
-            
-            # URL: http://... o https://...
-            'url': r'^https?:\/\/(?:[-\w.])+(?:\:[0-9]+)?(?:\/(?:[\w\/_.])*(?:\?(?:[\w&=%.])*)?(?:\#(?:[\w.])*)?)?$',
-            
-            # Código postal colombiano: 6 dígitos
-            'codigo_postal': r'^[0-9]{6}$',
-            
-            # IP Address: xxx.xxx.xxx.xxx
-            'ip_address': r'^(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)$',
-            
-            # Placa de vehículo colombiano: ABC123 o ABC-123
-            'placa_vehiculo': r'^[A-Z]{3}[\-\s]?[0-9]{3}$',
-            
-            # Contraseña segura: min 8 chars, mayúscula, minúscula, número y carácter especial
-            'password_segura': r'^(?=.*[a-z])(?=.*[A-Z])(?=.*\d)(?=.*[@$!%*?&])[A-Za-z\d@$!%*?&]{8,}$',
-            
-            # Número entero
-            'numero_entero': r'^[+-]?[0-9]+$',
-            
-            # Número decimal
-            'numero_decimal': r'^[+-]?[0-9]*\.?[0-9]+$',
-        }
+    def __init__(self, registry: Optional[PatternRegistry] = None):
+        """
+        Args:
+            registry: Registro de patrones a usar. Por defecto se usa el
+                registro compartido por todo el proceso (get_default_registry),
+                así los validadores no compilan nada al crearse; add_pattern
+                pasa entonces a una copia propia para no cambiar los patrones
+                de los demás. Con un registro explícito, add_pattern lo
+                modifica para todos los que lo comparten.
+        """
+        self.registry = registry if registry is not None else get_default_registry()
+        self._copy_on_write = registry is None
+    
+    @property
+    def patterns(self) -> Mapping[str, str]:
+        """
+        Definición de patrones mediante expresiones regulares, en orden de prioridad
         
-        # Compilar expresiones regulares para mejor rendimiento
-        self.compiled_patterns = {
-            name: re.compile(pattern) for name, pattern in self.patterns.items()
-        }
+        Es una vista de solo lectura del registro: los cambios pasan por
+        add_pattern, que actualiza la versión y no afecta a otros validadores.
+        """
+        return MappingProxyType(self.registry.patterns)
+    
+    @property
+    def compiled_patterns(self) -> Mapping[str, 're.Pattern']:
+        """Expresiones compiladas por nombre (cada una se compila al pedirla)"""
+        return CompiledPatterns(self.registry)
+    
+    @property
+    def combined_pattern(self) -> 're.Pattern':
+        """
+        Clasificador fusionado: una sola alternación con grupos nombrados
+        que respeta el orden de prioridad de self.patterns
+        """
+        return self.registry.combined_pattern or self.registry.get_combined_pattern()
+    
+    @property
+    def version(self) -> int:
+        """
+        Versión del conjunto de patrones: cambia cada vez que se agrega o
+        redefine un patrón, para invalidar cachés derivadas
+        """
+        return self.registry.version
+    
+    @property
+    def custom_patterns(self) -> AbstractSet[str]:
+        """Patrones agregados con add_pattern (copia de solo lectura)"""
+        return frozenset(self.registry.custom_patterns)
+    
+    @property
+    def custom_descriptions(self) -> Mapping[str, str]:
+        """Descripciones de los patrones agregados con add_pattern (solo lectura)"""
+        return MappingProxyType(self.registry.custom_descriptions)
+    
+    def build_combined_pattern(self, pattern_names: List[str]) -> 're.Pattern':
+        """
+        Construye una alternación precompilada con un grupo nombrado por patrón
+        
+        Cada rama conserva sus propias anclas, así que usada con match() la
+        alternación se comporta como validate_pattern sobre cada patrón en orden.
+        La alternación de cada combinación de patrones se guarda en el registro
+        y la reutilizan todos los validadores que lo comparten.
+        
+        Args:
+            pattern_names: Patrones a combinar, en orden de prioridad
+        
+        Returns:
+            re.Pattern: Expresión combinada para usar con match
+        """
+        return self.registry.combine(pattern_names)
+    
+    def add_pattern(self, pattern_name: str, pattern: str, description: str = None):
+        """
+        Agrega o redefine un patrón de validación
+        
+        Args:
+            pattern_name: Nombre del patrón (identificador válido de Python)
+            pattern: Expresión regular del patrón
+            description: Descripción opcional del patrón
+        
+        Raises:
+            ValueError: Si el nombre no es un identificador válido
+            re.error: Si la expresión regular no compila
+        """
+        if self._copy_on_write:
+            self.registry = self.registry.copy()
+            self._copy_on_write = False
+        self.registry.register(pattern_name, pattern, description)
     
     def validate_pattern(self, text: str, pattern_name: str) -> bool:
         """
@@ -63,10 +185,226 @@ class PatternValidator:
         Returns:
             bool: True si el texto cumple el patrón, False en caso contrario
         """
-        if pattern_name not in self.compiled_patterns:
+        registry = self.registry
+        compiled = registry.compiled.get(pattern_name) or registry.compile(pattern_name)
+        if compiled is None:
             return False
         
-        return bool(self.compiled_patterns[pattern_name].match(text.strip()))
+        text = text.strip()
+        prefilter = registry.prefilters.get(pattern_name, _NOT_BUILT)
+        if prefilter is _NOT_BUILT:
+            prefilter = self.get_prefilter(pattern_name)
+        if prefilter is not None:
+            # Equivale a prefilter.accepts(text), sin el costo de otra llamada
+            prefilter.checked += 1
+            if not prefilter.check(text):
+                prefilter.rejected += 1
+                return False
+        return bool(compiled.match(text))
+    
+    def get_prefilter(self, pattern_name: str):
+        """
+        Obtiene el prefiltro de un patrón, derivándolo la primera vez
+        
+        El prefiltro verifica condiciones necesarias del patrón (longitud,
+        prefijo, literales y caracteres obligatorios) con operaciones de str,
+        para descartar textos sin ejecutar la expresión regular.
+        
+        Args:
+            pattern_name: Nombre del patrón
+        
+        Returns:
+            Optional[Prefilter]: Prefiltro del patrón, o None si el patrón no
+            existe o no tiene condiciones que valga la pena verificar
+        """
+        prefilters = self.registry.prefilters
+        if pattern_name not in prefilters:
+            if pattern_name not in self.patterns:
+                return None
+            # Importación diferida: prefilter usa el analizador de automata,
+            # que a su vez importa este módulo
+            from .prefilter import build_prefilter
+            prefilters[pattern_name] = build_prefilter(self.patterns[pattern_name])
+        return prefilters[pattern_name]
+    
+    def get_prefilter_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Obtiene cuántas veces los prefiltros evitaron ejecutar la expresión regular
+        
+        Returns:
+            Dict[str, Dict[str, float]]: Por patrón con prefiltro, los textos
+            verificados, los descartados y el porcentaje descartado
+        """
+        return {name: prefilter.get_stats() for name, prefilter in self.registry.prefilters.items()
+                if prefilter is not None}
+    
+    def validate_many(self, values: Iterable[str],
+                      pattern_name: str) -> Tuple[bytearray, Dict[str, int]]:
+        """
+        Valida muchos valores contra un mismo patrón
+        
+        Equivale a llamar validate_pattern con cada valor, pero la búsqueda del
+        patrón se hace una sola vez y el recorte y la validación corren en
+        bucles de C (map) por bloques de VALIDATE_CHUNK_SIZE valores, así que
+        acepta generadores sin cargarlos completos. Mientras haya muchos
+        valores repetidos, cada valor distinto de un bloque se valida una sola
+        vez y el resultado se reparte entre sus repeticiones; en cuanto un
+        bloque casi no tiene repeticiones, los siguientes se validan valor a valor.
+        
+        Args:
+            values: Valores a validar (cualquier iterable de str)
+            pattern_name: Nombre del patrón a usar
+        
+        Returns:
+            Tuple[bytearray, Dict[str, int]]: Un byte por valor (1 si cumple el
+            patrón, 0 si no; con NumPy, np.frombuffer(resultado, dtype=bool))
+            y los conteos 'total', 'valid', 'invalid' y 'distinct_checked'
+        """
+        compiled = self.registry.compile(pattern_name)
+        match = compiled.match if compiled is not None else None
+        prefilter = self.get_prefilter(pattern_name)
+        results = bytearray()
+        checked = 0
+        deduplicate = True
+        iterator = iter(values)
+        
+        while True:
+            chunk = list(map(str.strip, islice(iterator, VALIDATE_CHUNK_SIZE)))
+            if not chunk:
+                break
+            if match is None:
+                # Patrón inexistente: ningún valor es válido
+                results.extend(bytes(len(chunk)))
+                continue
+            if prefilter is not None:
+                # La expresión solo se ejecuta con los valores que pasan el prefiltro
+                distinct = dict.fromkeys(chunk, False)
+                candidates = prefilter.select(list(distinct) if deduplicate else chunk)
+                distinct.update(zip(candidates, map(bool, map(match, candidates))))
+                results.extend(map(distinct.__getitem__, chunk))
+                checked += len(distinct) if deduplicate else len(chunk)
+                deduplicate = len(distinct) <= DEDUPLICATE_MAX_RATIO * len(chunk)
+            elif deduplicate:
+                distinct = dict.fromkeys(chunk)
+                verdicts = dict(zip(distinct, map(bool, map(match, distinct))))
+                results.extend(map(verdicts.__getitem__, chunk))
+                checked += len(distinct)
+                # Sin repeticiones suficientes, agrupar cuesta más de lo que ahorra
+                deduplicate = len(distinct) <= DEDUPLICATE_MAX_RATIO * len(chunk)
+            else:
+                results.extend(map(bool, map(match, chunk)))
+                checked += len(chunk)
+        
+        valid = results.count(1)
+        return results, {
+            'total': len(results),
+            'valid': valid,
+            'invalid': len(results) - valid,
+            'distinct_checked': checked,
+        }
+    
+    def classify(self, text: str) -> Optional[str]:
+        """
+        Clasifica un texto con una sola llamada al clasificador fusionado
+        
+        Equivale a recorrer get_available_patterns() y quedarse con el primer
+        patrón que valide, pero evalúa todos los patrones en un único match.
+        
+        Args:
+            text: Texto a clasificar
+        
+        Returns:
+            Optional[str]: Nombre del primer patrón que coincide, None si ninguno
+        """
+        match = self.combined_pattern.match(text.strip())
+        return match.lastgroup if match else None
+    
+    def classify_bytes(self, data: bytes) -> Optional[str]:
+        """
+        Clasifica un lexema ASCII en bytes con la alternación compilada en bytes
+        
+        Para datos ASCII las clases \\d, \\w y \\s de un patrón en bytes
+        coinciden con las del patrón en texto, así que el resultado es el mismo
+        que classify() sobre el texto decodificado.
+        
+        Args:
+            data: Lexema en bytes, solo caracteres ASCII
+        
+        Returns:
+            Optional[str]: Nombre del primer patrón que coincide, None si ninguno
+        """
+        registry = self.registry
+        if registry.combined_bytes_pattern is None:
+            try:
+                registry.combined_bytes_pattern = re.compile(
+                    self.combined_pattern.pattern.encode('ascii'))
+            except UnicodeEncodeError:
+                # Un patrón con caracteres no ASCII solo puede evaluarse como texto
+                registry.combined_bytes_pattern = False
+        if registry.combined_bytes_pattern is False:
+            return self.classify(data.decode('ascii'))
+        
+        match = registry.combined_bytes_pattern.match(data.strip())
+        return match.lastgroup if match else None
+    
+    def get_search_pattern(self, pattern_names: Optional[Tuple[str, ...]] = None) -> 're.Pattern':
+        """
+        Obtiene la expresión en modo búsqueda de uno o varios patrones
+        
+        Es una alternación con un grupo nombrado por patrón, en orden de
+        prioridad, sin anclas y rodeada de los límites de token, para recorrer
+        un texto completo con finditer.
+        
+        Args:
+            pattern_names: Patrones a incluir (por defecto, todos)
+        
+        Returns:
+            re.Pattern: Expresión compilada (se reutiliza entre llamadas)
+        """
+        if pattern_names is None:
+            pattern_names = tuple(self.patterns)
+        search_patterns = self.registry.get_cache('search')
+        compiled = search_patterns.get(pattern_names)
+        if compiled is None:
+            alternatives = '|'.join(f'(?P<{name}>{to_search_pattern(self.patterns[name])})'
+                                    for name in pattern_names)
+            compiled = re.compile(f'{SEARCH_START}(?:{alternatives or "(?!)"}){SEARCH_END}')
+            search_patterns[pattern_names] = compiled
+        return compiled
+    
+    def find_pattern_spans(self, text: str,
+                           pattern_names: Optional[List[str]] = None) -> List[Tuple[str, int, int, str]]:
+        """
+        Encuentra en un solo recorrido todas las apariciones de los patrones en un texto
+        
+        No divide el texto en tokens: una única búsqueda con finditer prueba en
+        cada inicio de token los patrones en orden de prioridad y se queda con
+        el primero que coincide, como classify(). Una coincidencia puede abarcar
+        espacios si el patrón los admite (p. ej. '+57 300 123 4567'), pero no
+        saltos de línea, y un signo de SENTENCE_PUNCTUATION que cierra la
+        frase queda fuera de ella. Cada coincidencia se confirma con el patrón anclado,
+        así que todo texto retornado también lo acepta validate_pattern.
+        
+        Args:
+            text: Texto donde buscar
+            pattern_names: Patrones a buscar (por defecto, todos)
+        
+        Returns:
+            List[Tuple[str, int, int, str]]: (patrón, inicio, fin, texto) de cada
+            aparición, en orden de aparición
+        """
+        if pattern_names is not None:
+            pattern_names = tuple(name for name in pattern_names if name in self.patterns)
+            if not pattern_names:
+                return []
+        search = self.get_search_pattern(pattern_names)
+        compile_pattern = self.registry.compile
+        spans = []
+        for match in search.finditer(text):
+            lexeme = match.group()
+            if lexeme and compile_pattern(match.lastgroup).fullmatch(lexeme):
+                spans.append((match.lastgroup, match.start(), match.end(), lexeme))
+        return spans
     
     def find_all_patterns(self, text: str, pattern_name: str) -> List[str]:
         """
@@ -79,15 +417,16 @@ class PatternValidator:
         Returns:
             List[str]: Lista de coincidencias encontradas
         """
-        if pattern_name not in self.compiled_patterns:
-            return []
-        
-        return self.compiled_patterns[pattern_name].findall(text)
+        return [lexeme for _, _, _, lexeme in self.find_pattern_spans(text, [pattern_name])]
     
     def analyze_text_patterns(self, text: str) -> Dict[str, List[str]]:
         """
         Analiza un texto y encuentra todos los patrones válidos
         
+        Cada patrón se busca por separado, así que una aparición se informa en
+        todos los patrones que la reconocen (p. ej. '630001' como código postal
+        y como número entero), no solo en el de mayor prioridad.
+        
         Args:
             text: Texto a analizar
         
@@ -95,19 +434,10 @@ class PatternValidator:
             Dict[str, List[str]]: Diccionario con patrones encontrados
         """
         results = {}
-        
-        # Dividir el texto en posibles tokens (palabras, números, símbolos)
-        tokens = re.findall(r'\S+', text)
-        
-        for pattern_name in self.patterns.keys():
-            matches = []
-            for token in tokens:
-                if self.validate_pattern(token, pattern_name):
-                    matches.append(token)
-            
+        for pattern_name in self.patterns:
+            matches = self.find_all_patterns(text, pattern_name)
             if matches:
                 results[pattern_name] = matches
-        
         return results
     
     def get_pattern_description(self, pattern_name: str) -> str:
@@ -120,21 +450,7 @@ class PatternValidator:
         Returns:
             str: Descripción del patrón
         """
-        descriptions = {
-            'email': 'Dirección de correo electrónico válida',
-            'telefono': 'Número telefónico colombiano',
-            'fecha': 'Fecha en formato dd/mm/yyyy, dd-mm-yyyy o yyyy/mm/dd',
-            'cedula': 'Cédula de ciudadanía colombiana (8-10 dígitos)',
-            'url': 'URL válida con protocolo HTTP o HTTPS',
-            'codigo_postal': 'Código postal colombiano (6 dígitos)',
-            'ip_address': 'Dirección IP válida (formato IPv4)',
-            'placa_vehiculo': 'Placa de vehículo colombiano (ABC123)',
-            'password_segura': 'Contraseña segura (8+ chars, mayús, minus, número, especial)',
-            'numero_entero': 'Número entero (con o sin signo)',
-            'numero_decimal': 'Número decimal (con o sin signo)',
-        }
-        
-        return descriptions.get(pattern_name, 'Patrón no definido')
+        return self.registry.get_description(pattern_name)
     
     def get_pattern_examples(self, pattern_name: str) -> List[str]:
         """
@@ -146,21 +462,7 @@ class PatternValidator:
         Returns:
             List[str]: Lista de ejemplos válidos para el patrón
         """
-        examples = {
-            'email': ['usuario@ejemplo.com', 'test.email@dominio.co', 'admin@universidad.edu.co'],
-            'telefono': ['3001234567', '+57 300 123 4567', '57-315-555-0123'],
-            'fecha': ['25/12/2024', '2024/01/15', '01-06-2025'],
-            'cedula': ['12345678', '1234567890', '987654321'],
-            'url': ['https://www.google.com', 'http://localhost:8080', 'https://github.com/user/repo'],
-            'codigo_postal': ['630001', '660001', '170001'],
-            'ip_address': ['192.168.1.1', '127.0.0.1', '8.8.8.8'],
-            'placa_vehiculo': ['ABC123', 'XYZ-789', 'DEF 456'],
-            'password_segura': ['MiPassword123!', 'Segura2024@', 'Clave#Fuerte9'],
-            'numero_entero': ['123', '-456', '+789'],
-            'numero_decimal': ['123.45', '-67.89', '+3.14159'],
-        }
-        
-        return examples.get(pattern_name, [])
+        return self.registry.get_examples(pattern_name)
     
     def get_available_patterns(self) -> List[str]:
         """
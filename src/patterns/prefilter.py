@@ -0,0 +1,333 @@
+"""
+Prefilter: Condiciones necesarias de un patrón verificadas antes del motor de regex
+Deriva del árbol sintáctico de cada expresión (ver automata.parse_regex) la
+longitud mínima y máxima, el prefijo y el sufijo fijos, los literales y
+caracteres obligatorios, y descarta con operaciones de str los lexemas que no
+pueden coincidir, sin llegar a ejecutar la expresión regular
+"""
+
+from itertools import compress
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from .automata import UnsupportedPatternError, parse_regex
+
+
+# Tamaño máximo de una clase de caracteres que se exige como "al menos uno de"
+# (las clases más grandes casi nunca descartan nada)
+MAX_CHAR_SET_SIZE = 64
+
+
+class _Requirements:
+    """Lo que toda coincidencia de un nodo del árbol contiene con seguridad"""
+    
+    __slots__ = ('min_length', 'max_length', 'exact', 'prefix', 'suffix',
+                 'literals', 'counts', 'char_sets')
+    
+    def __init__(self, min_length: int = 0, max_length: Optional[int] = 0,
+                 exact: Optional[str] = '', prefix: str = '', suffix: str = '',
+                 literals: FrozenSet[str] = frozenset(), counts: Dict[str, int] = None,
+                 char_sets: FrozenSet[FrozenSet[str]] = frozenset()):
+        self.min_length = min_length
+        self.max_length = max_length    # None si no tiene límite
+        self.exact = exact              # Único texto posible, o None
+        self.prefix = prefix
+        self.suffix = suffix
+        self.literals = literals        # Subcadenas obligatorias
+        self.counts = counts or {}      # Carácter -> apariciones mínimas
+        self.char_sets = char_sets      # Conjuntos de los que aparece al menos uno
+
+
+def _explicit_chars(charset: Tuple) -> Optional[FrozenSet[str]]:
+    """Caracteres de una clase sin negar y sin \\d, \\w ni \\s, si es pequeña"""
+    ranges, classes, negated = charset
+    if negated or classes:
+        return None
+    if sum(high - low + 1 for low, high in ranges) > MAX_CHAR_SET_SIZE:
+        return None
+    return frozenset(chr(code) for low, high in ranges for code in range(low, high + 1))
+
+
+def _common_prefix(values) -> str:
+    first, last = min(values), max(values)
+    size = 0
+    while size < len(first) and size < len(last) and first[size] == last[size]:
+        size += 1
+    return first[:size]
+
+
+def _common_suffix(values) -> str:
+    return _common_prefix([value[::-1] for value in values])[::-1]
+
+
+def _requirements(node) -> _Requirements:
+    """Calcula recursivamente las condiciones necesarias de un nodo"""
+    kind = node[0]
+    if kind == 'set':
+        chars = _explicit_chars(node[1])
+        if chars is not None and len(chars) == 1:
+            char = next(iter(chars))
+            return _Requirements(1, 1, char, char, char, counts={char: 1})
+        return _Requirements(1, 1, None, char_sets=frozenset([chars]) if chars else frozenset())
+    
+    if kind == 'cat':
+        parts = [_requirements(child) for child in node[1]]
+        literals, counts, char_sets = set(), {}, set()
+        run, exact = '', True
+        for part in parts:
+            literals |= part.literals
+            char_sets |= part.char_sets
+            for char, count in part.counts.items():
+                counts[char] = counts.get(char, 0) + count
+            if part.exact is not None:
+                run += part.exact
+            else:
+                # El literal en curso termina en el primer carácter variable
+                literals.add(run + part.prefix)
+                run = part.suffix
+                exact = False
+        literals.add(run)
+        
+        prefix = ''
+        for part in parts:
+            if part.exact is None:
+                prefix += part.prefix
+                break
+            prefix += part.exact
+        suffix = ''
+        for part in reversed(parts):
+            if part.exact is None:
+                suffix = part.suffix + suffix
+                break
+            suffix = part.exact + suffix
+        
+        maximums = [part.max_length for part in parts]
+        return _Requirements(sum(part.min_length for part in parts),
+                             None if None in maximums else sum(maximums),
+                             run if exact else None, prefix, suffix,
+                             frozenset(literals), counts, frozenset(char_sets))
+    
+    if kind == 'alt':
+        parts = [_requirements(child) for child in node[1]]
+        exacts = {part.exact for part in parts}
+        counts = {}
+        for char in set.intersection(*(set(part.counts) for part in parts)):
+            counts[char] = min(part.counts[char] for part in parts)
+        maximums = [part.max_length for part in parts]
+        return _Requirements(min(part.min_length for part in parts),
+                             None if None in maximums else max(maximums),
+                             parts[0].exact if len(exacts) == 1 else None,
+                             _common_prefix([part.prefix for part in parts]),
+                             _common_suffix([part.suffix for part in parts]),
+                             frozenset.intersection(*(part.literals for part in parts)),
+                             counts,
+                             frozenset.intersection(*(part.char_sets for part in parts)))
+    
+    if kind == 'repeat':
+        _, child, minimum, maximum = node
+        part = _requirements(child)
+        if maximum is None or part.max_length is None:
+            max_length = None
+        else:
+            max_length = part.max_length * maximum
+        if minimum == 0:
+            return _Requirements(0, max_length, '' if maximum == 0 else None)
+        if part.exact is not None:
+            exact = part.exact * minimum if minimum == maximum else None
+            prefix = suffix = part.exact * minimum
+        else:
+            exact, prefix, suffix = None, part.prefix, part.suffix
+        return _Requirements(part.min_length * minimum, max_length, exact, prefix, suffix,
+                             part.literals,
+                             {char: count * minimum for char, count in part.counts.items()},
+                             part.char_sets)
+    
+    raise UnsupportedPatternError(f"Nodo no soportado: {kind}")
+
+
+class Prefilter:
+    """
+    Condiciones necesarias para que un texto coincida con un patrón
+    
+    check() retorna False solo si el texto no puede coincidir, así que validar
+    con el prefiltro y luego con la expresión da el mismo resultado que usar
+    solo la expresión. accepts() y select() además llevan la cuenta de cuántas
+    veces se evitó ejecutar la expresión regular.
+    """
+    
+    def __init__(self, min_length: int = 0, max_length: Optional[int] = None,
+                 prefix: str = '', suffix: str = '', literals: Tuple[str, ...] = (),
+                 counts: Tuple[Tuple[str, int], ...] = (),
+                 char_sets: Tuple[FrozenSet[str], ...] = ()):
+        """
+        Args:
+            min_length: Longitud mínima del texto
+            max_length: Longitud máxima del texto (None si no tiene límite)
+            prefix: Texto con que empieza toda coincidencia
+            suffix: Texto con que termina toda coincidencia
+            literals: Subcadenas que toda coincidencia contiene
+            counts: (carácter, apariciones mínimas) de toda coincidencia
+            char_sets: Conjuntos de los que toda coincidencia tiene al menos un carácter
+        """
+        self.min_length = min_length
+        self.max_length = max_length
+        self.prefix = prefix
+        self.suffix = suffix
+        self.literals = literals
+        self.counts = counts
+        self.char_sets = char_sets
+        self.check = self._compile_check()
+        self.checked = 0
+        self.rejected = 0
+    
+    def _compile_check(self) -> Callable[[str], bool]:
+        """
+        Genera una función con todas las condiciones en una sola expresión
+        
+        Las constantes quedan dentro del código de la función, así que cada
+        verificación es una operación de str en C (len, startswith, in, count)
+        sin recorrer listas de condiciones. Las condiciones más baratas van
+        primero; los conjuntos de caracteres, que recorren todo el texto, al final.
+        """
+        conditions = []
+        if self.max_length is None:
+            if self.min_length:
+                conditions.append(f'len(text) >= {self.min_length}')
+        elif self.min_length == self.max_length:
+            conditions.append(f'len(text) == {self.min_length}')
+        else:
+            conditions.append(f'{self.min_length} <= len(text) <= {self.max_length}')
+        if self.prefix:
+            conditions.append(f'text.startswith({self.prefix!r})')
+        if self.suffix:
+            conditions.append(f'text.endswith({self.suffix!r})')
+        conditions.extend(f'{literal!r} in text' for literal in self.literals)
+        conditions.extend(f'{char!r} in text' if count == 1 else f'text.count({char!r}) >= {count}'
+                          for char, count in self.counts)
+        namespace = {f'_chars{index}': chars for index, chars in enumerate(self.char_sets)}
+        conditions.extend(f'not {name}.isdisjoint(text)' for name in namespace)
+        # Los conjuntos se pasan como valores por defecto (variables locales)
+        defaults = ''.join(f', {name}={name}' for name in namespace)
+        return eval(f"lambda text{defaults}: {' and '.join(conditions) or 'True'}", namespace)
+    
+    def accepts(self, text: str) -> bool:
+        """
+        Indica si un texto (ya recortado, como en validate_pattern) puede coincidir
+        
+        Args:
+            text: Texto a verificar
+        
+        Returns:
+            bool: False si el texto seguro no coincide con el patrón
+        """
+        self.checked += 1
+        if self.check(text):
+            return True
+        self.rejected += 1
+        return False
+    
+    def select(self, texts: List[str]) -> List[str]:
+        """
+        Filtra un lote de textos, dejando solo los que pueden coincidir
+        
+        Args:
+            texts: Textos ya recortados
+        
+        Returns:
+            List[str]: Textos que pasan todas las condiciones, en el mismo orden
+        """
+        selected = list(compress(texts, map(self.check, texts)))
+        self.checked += len(texts)
+        self.rejected += len(texts) - len(selected)
+        return selected
+    
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Obtiene las métricas del prefiltro
+        
+        Returns:
+            Dict[str, float]: Textos verificados, descartados sin ejecutar la
+            expresión y porcentaje descartado
+        """
+        return {
+            'checked': self.checked,
+            'rejected': self.rejected,
+            'rejected_percentage': self.rejected / self.checked * 100 if self.checked else 0,
+        }
+    
+    def describe(self) -> Dict[str, object]:
+        """Condiciones del prefiltro, en un formato legible"""
+        return {
+            'min_length': self.min_length,
+            'max_length': self.max_length,
+            'prefix': self.prefix,
+            'suffix': self.suffix,
+            'literals': list(self.literals),
+            'counts': dict(self.counts),
+            'char_sets': [''.join(sorted(chars)) for chars in self.char_sets],
+        }
+
+
+def build_prefilter(pattern: str) -> Optional[Prefilter]:
+    """
+    Deriva el prefiltro de una expresión regular
+    
+    Args:
+        pattern: Expresión regular (con la semántica de `re.match`)
+    
+    Returns:
+        Optional[Prefilter]: Prefiltro del patrón, o None si la expresión no
+        puede analizarse (ver UnsupportedPatternError) o no impone ninguna
+        condición útil
+    """
+    try:
+        tree, anchored_end = parse_regex(pattern)
+        items = tree[1] if tree[0] == 'cat' else [tree]
+        looks = [_requirements(item[1]) for item in items if item[0] == 'look']
+        body = [item for item in items if item[0] != 'look']
+        if not body:
+            main = _Requirements()
+        else:
+            main = _requirements(body[0] if len(body) == 1 else ('cat', body))
+    except (UnsupportedPatternError, RecursionError):
+        return None
+    
+    # Sin '$' final la coincidencia puede ser solo un prefijo del texto
+    max_length = main.max_length if anchored_end else None
+    suffix = main.suffix if anchored_end else ''
+    # Un lookahead al inicio coincide con un prefijo del texto: sus
+    # condiciones (salvo la longitud máxima) también valen para el texto
+    min_length = max([main.min_length] + [look.min_length for look in looks])
+    literals = set(main.literals).union(*(look.literals for look in looks))
+    counts = dict(main.counts)
+    for look in looks:
+        for char, count in look.counts.items():
+            counts[char] = max(counts.get(char, 0), count)
+    char_sets = set(main.char_sets).union(*(look.char_sets for look in looks))
+    
+    # Quitar las condiciones que otras ya garantizan
+    known = [main.prefix, suffix] + list(literals)
+    literals = sorted((literal for literal in literals
+                       if len(literal) > 1 and not any(literal in other and literal != other
+                                                       for other in known)
+                       and literal not in (main.prefix, suffix)),
+                      key=len, reverse=True)
+    for literal in known:
+        if len(literal) == 1:
+            counts.setdefault(literal, 1)
+    kept = [main.prefix, suffix] + literals
+    counts = tuple(sorted((char, count) for char, count in counts.items()
+                          if not any(other.count(char) >= count for other in kept)))
+    guaranteed = set(''.join(kept)) | {char for char, _ in counts}
+    # Un conjunto que contiene a otro exigido no agrega nada
+    char_sets = sorted((chars for chars in char_sets if chars.isdisjoint(guaranteed)),
+                       key=lambda chars: (len(chars), sorted(chars)))
+    char_sets = tuple(chars for index, chars in enumerate(char_sets)
+                      if not any(other < chars for other in char_sets[:index]))
+    
+    # Si solo quedan conjuntos de caracteres, recorrer el texto buscándolos
+    # cuesta más que la expresión regular que se quería evitar
+    if (min_length <= 1 and max_length is None and not main.prefix and not suffix
+            and not literals and not counts):
+        return None
+    return Prefilter(min_length, max_length, main.prefix, suffix,
+                     tuple(literals), counts, char_sets)
@@ -0,0 +1,270 @@
+"""
+Registry: Registro de patrones compartido por todo el proceso
+Guarda las definiciones de los patrones, compila cada expresión la primera vez
+que se usa y conserva las estructuras derivadas (alternaciones, prefiltros,
+tablas de despacho) para que todos los validadores, analizadores y modelos
+del proceso las reutilicen. Cada cambio en los patrones asigna una versión
+nueva y vacía las cachés derivadas.
+"""
+
+import re
+from itertools import count
+from typing import Dict, Iterator, List, Mapping, Optional
+
+
+# Definición de patrones mediante expresiones regulares, en orden de prioridad
+DEFAULT_PATTERNS = {
+    # Correo electrónico: usuario@dominio.extension
+    'email': r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$',
+    
+    # Teléfono colombiano: formatos +57, 57, 3xx xxx xxxx, etc.
+    'telefono': r'^(\+57|57)?[\s\-]?[3][0-9]{2}[\s\-]?[0-9]{3}[\s\-]?[0-9]{4}$',
+    
+    # Fecha: dd/mm/yyyy, dd-mm-yyyy, yyyy/mm/dd
+    'fecha': r'^(?:(?:0?[1-9]|[12][0-9]|3[01])[\/\-](?:0?[1-9]|1[012])[\/\-](?:19|20)\d{2}|(?:19|20)\d{2}[\/\-](?:0?[1-9]|1[012])[\/\-](?:0?[1-9]|[12][0-9]|3[01]))$',
+    
+    # Cédula colombiana: 8-10 dígitos
+    'cedula': r'^[1-9][0-9]{7,9}$',
+    
+    # URL: http://... o https://...
+    'url': r'^https?:\/\/(?:[-\w.])+(?:\:[0-9]+)?(?:\/(?:[\w\/_.])*(?:\?(?:[\w&=%.])*)?(?:\#(?:[\w.])*)?)?$',
+    
+    # Código postal colombiano: 6 dígitos
+    'codigo_postal': r'^[0-9]{6}$',
+    
+    # IP Address: xxx.xxx.xxx.xxx
+    'ip_address': r'^(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)$',
+    
+    # Placa de vehículo colombiano: ABC123 o ABC-123
+    'placa_vehiculo': r'^[A-Z]{3}[\-\s]?[0-9]{3}$',
+    
+    # Contraseña segura: min 8 chars, mayúscula, minúscula, número y carácter especial
+    'password_segura': r'^(?=.*[a-z])(?=.*[A-Z])(?=.*\d)(?=.*[@$!%*?&])[A-Za-z\d@$!%*?&]{8,}$',
+    
+    # Número entero
+    'numero_entero': r'^[+-]?[0-9]+$',
+    
+    # Número decimal
+    'numero_decimal': r'^[+-]?[0-9]*\.?[0-9]+$',
+}
+
+PATTERN_DESCRIPTIONS = {
+    'email': 'Dirección de correo electrónico válida',
+    'telefono': 'Número telefónico colombiano',
+    'fecha': 'Fecha en formato dd/mm/yyyy, dd-mm-yyyy o yyyy/mm/dd',
+    'cedula': 'Cédula de ciudadanía colombiana (8-10 dígitos)',
+    'url': 'URL válida con protocolo HTTP o HTTPS',
+    'codigo_postal': 'Código postal colombiano (6 dígitos)',
+    'ip_address': 'Dirección IP válida (formato IPv4)',
+    'placa_vehiculo': 'Placa de vehículo colombiano (ABC123)',
+    'password_segura': 'Contraseña segura (8+ chars, mayús, minus, número, especial)',
+    'numero_entero': 'Número entero (con o sin signo)',
+    'numero_decimal': 'Número decimal (con o sin signo)',
+}
+
+PATTERN_EXAMPLES = {
+    'email': ('usuario@ejemplo.com', 'test.email@dominio.co', 'admin@universidad.edu.co'),
+    'telefono': ('3001234567', '+57 300 123 4567', '57-315-555-0123'),
+    'fecha': ('25/12/2024', '2024/01/15', '01-06-2025'),
+    'cedula': ('12345678', '1234567890', '987654321'),
+    'url': ('https://www.google.com', 'http://localhost:8080', 'https://github.com/user/repo'),
+    'codigo_postal': ('630001', '660001', '170001'),
+    'ip_address': ('192.168.1.1', '127.0.0.1', '8.8.8.8'),
+    'placa_vehiculo': ('ABC123', 'XYZ-789', 'DEF 456'),
+    'password_segura': ('MiPassword123!', 'Segura2024@', 'Clave#Fuerte9'),
+    'numero_entero': ('123', '-456', '+789'),
+    'numero_decimal': ('123.45', '-67.89', '+3.14159'),
+}
+
+# Versiones de todos los registros del proceso: nunca se repiten, así una caché
+# marcada con una versión no puede confundirse con la de otro registro
+_VERSIONS = count()
+
+# Registro con los patrones por defecto, creado la primera vez que se pide
+_DEFAULT_REGISTRY = None
+
+
+class PatternRegistry:
+    """Definiciones de patrones, sus expresiones compiladas y sus cachés derivadas"""
+    
+    def __init__(self, patterns: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            patterns: Patrones iniciales en orden de prioridad (por defecto,
+                DEFAULT_PATTERNS). No se compilan hasta usarlos.
+        """
+        self.patterns = dict(DEFAULT_PATTERNS if patterns is None else patterns)
+        self.custom_patterns = set()
+        self.custom_descriptions = {}
+        # Expresiones compiladas hasta ahora (ver compile)
+        self.compiled = {}
+        # Prefiltros derivados de cada patrón (None si no hay condiciones útiles)
+        self.prefilters = {}
+        # Alternación de todos los patrones (ver get_combined_pattern) y su
+        # versión en bytes (False si algún patrón no es ASCII)
+        self.combined_pattern = None
+        self.combined_bytes_pattern = None
+        self.version = next(_VERSIONS)
+        self._caches = {}
+    
+    def compile(self, pattern_name: str) -> Optional['re.Pattern']:
+        """
+        Obtiene la expresión compilada de un patrón, compilándola la primera vez
+        
+        Args:
+            pattern_name: Nombre del patrón
+        
+        Returns:
+            Optional[re.Pattern]: Expresión compilada, o None si el patrón no existe
+        """
+        compiled = self.compiled.get(pattern_name)
+        if compiled is None:
+            pattern = self.patterns.get(pattern_name)
+            if pattern is None:
+                return None
+            compiled = self.compiled[pattern_name] = re.compile(pattern)
+        return compiled
+    
+    def register(self, pattern_name: str, pattern: str, description: str = None):
+        """
+        Agrega o redefine un patrón y pasa a una versión nueva
+        
+        Args:
+            pattern_name: Nombre del patrón (identificador válido de Python)
+            pattern: Expresión regular del patrón
+            description: Descripción opcional del patrón
+        
+        Raises:
+            ValueError: Si el nombre no es un identificador válido
+            re.error: Si la expresión regular no compila
+        """
+        if not pattern_name.isidentifier():
+            raise ValueError(f"Nombre de patrón inválido: {pattern_name}")
+        
+        compiled = re.compile(pattern)
+        self.patterns[pattern_name] = pattern
+        self.compiled[pattern_name] = compiled
+        self.custom_patterns.add(pattern_name)
+        if description:
+            self.custom_descriptions[pattern_name] = description
+        self.prefilters.pop(pattern_name, None)
+        self.combined_pattern = None
+        self.combined_bytes_pattern = None
+        self.version = next(_VERSIONS)
+        self._caches = {}
+    
+    def combine(self, pattern_names: List[str]) -> 're.Pattern':
+        """
+        Obtiene la alternación con un grupo nombrado por patrón, compilándola una vez
+        
+        Args:
+            pattern_names: Patrones a combinar, en orden de prioridad
+        
+        Returns:
+            re.Pattern: Expresión combinada para usar con match
+        """
+        combined_patterns = self.get_cache('combined')
+        key = tuple(pattern_names)
+        combined = combined_patterns.get(key)
+        if combined is None:
+            alternatives = [f'(?P<{name}>{self.patterns[name]})' for name in key]
+            combined = re.compile('|'.join(alternatives) or r'(?!)')
+            combined_patterns[key] = combined
+        return combined
+    
+    def get_combined_pattern(self) -> 're.Pattern':
+        """Obtiene la alternación de todos los patrones en orden de prioridad"""
+        if self.combined_pattern is None:
+            self.combined_pattern = self.combine(list(self.patterns))
+        return self.combined_pattern
+    
+    def get_cache(self, name: str) -> dict:
+        """
+        Obtiene una caché de estructuras derivadas de los patrones actuales
+        
+        Las cachés se descartan en cada cambio de versión: quien guarde una
+        referencia debe volver a pedirla cuando cambie self.version.
+        
+        Args:
+            name: Nombre de la caché (p. ej. 'combined' o 'dispatch')
+        
+        Returns:
+            dict: Caché compartida por todos los usuarios del registro
+        """
+        cache = self._caches.get(name)
+        if cache is None:
+            cache = self._caches[name] = {}
+        return cache
+    
+    def copy(self) -> 'PatternRegistry':
+        """
+        Crea un registro independiente con los mismos patrones
+        
+        Las expresiones ya compiladas se reutilizan; las cachés derivadas no.
+        
+        Returns:
+            PatternRegistry: Copia con una versión nueva
+        """
+        registry = PatternRegistry(self.patterns)
+        registry.custom_patterns = set(self.custom_patterns)
+        registry.custom_descriptions = dict(self.custom_descriptions)
+        registry.compiled = dict(self.compiled)
+        return registry
+    
+    def get_description(self, pattern_name: str) -> str:
+        """
+        Obtiene la descripción de un patrón
+        
+        Args:
+            pattern_name: Nombre del patrón
+        
+        Returns:
+            str: Descripción del patrón
+        """
+        if pattern_name in self.custom_descriptions:
+            return self.custom_descriptions[pattern_name]
+        return PATTERN_DESCRIPTIONS.get(pattern_name, 'Patrón no definido')
+    
+    def get_examples(self, pattern_name: str) -> List[str]:
+        """
+        Obtiene ejemplos válidos de un patrón
+        
+        Args:
+            pattern_name: Nombre del patrón
+        
+        Returns:
+            List[str]: Ejemplos del patrón (lista vacía si no hay)
+        """
+        return list(PATTERN_EXAMPLES.get(pattern_name, ()))
+
+
+class CompiledPatterns(Mapping):
+    """Vista de solo lectura nombre -> expresión compilada de un registro"""
+    
+    def __init__(self, registry: PatternRegistry):
+        self.registry = registry
+    
+    def __getitem__(self, pattern_name: str) -> 're.Pattern':
+        compiled = self.registry.compile(pattern_name)
+        if compiled is None:
+            raise KeyError(pattern_name)
+        return compiled
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.registry.patterns)
+    
+    def __len__(self) -> int:
+        return len(self.registry.patterns)
+
+
+def get_default_registry() -> PatternRegistry:
+    """
+    Obtiene el registro compartido por todo el proceso
+    
+    Returns:
+        PatternRegistry: Registro con DEFAULT_PATTERNS, creado en la primera llamada
+    """
+    global _DEFAULT_REGISTRY
+    if _DEFAULT_REGISTRY is None:
+        _DEFAULT_REGISTRY = PatternRegistry()
+    return _DEFAULT_REGISTRY
@@ -0,0 +1,76 @@
+"""
+Accumulators Test: Conteo vectorizado de caracteres frente a Counter y acumuladores editables
+"""
+
+import sys
+import os
+from collections import Counter
+
+import pytest
+
+# Agregar el directorio padre al path para poder importar src
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.analysis import accumulators
+from src.analysis.accumulators import (TextAccumulator, TokenAccumulator, VECTORIZE_MIN_LENGTH,
+                                       _count_characters_vectorized, count_characters)
+
+
+TEXTS = {
+    'ascii': "Hola mundo, user@test.com 192.168.1.1\n\tfin!",
+    'bmp': "Canción ñandú — «cita» 日本語 ٣٤٥ x　y",
+    'astral': "emoji 😀👍🏽 𝔘𝔫𝔦𝔠𝔬𝔡𝔢 🇨🇴 fin",
+    'surrogate': "par \ud800 suelto",
+}
+
+
+@pytest.mark.parametrize('name', sorted(TEXTS))
+def test_vectorized_count_matches_counter(name):
+    pytest.importorskip('numpy')
+    text = TEXTS[name]
+    assert _count_characters_vectorized(text) == Counter(text)
+    # Por encima del umbral count_characters toma el camino de NumPy
+    long_text = text * (VECTORIZE_MIN_LENGTH // len(text) + 1)
+    assert len(long_text) >= VECTORIZE_MIN_LENGTH
+    assert count_characters(long_text) == Counter(long_text)
+
+
+def test_count_falls_back_to_counter_without_numpy(monkeypatch):
+    text = ''.join(TEXTS.values()) * 100
+    expected = TextAccumulator()
+    expected.update(text)
+    
+    monkeypatch.setattr(accumulators, 'np', None)
+    assert count_characters(text) == Counter(text)
+    fallback = TextAccumulator()
+    fallback.update(text)
+    assert fallback.char_counts == expected.char_counts
+    assert fallback.class_counts() == expected.class_counts()
+
+
+@pytest.mark.parametrize('edit', [(0, 0, "Uno "), (5, 3, ""), (4, 1, ""), (9, 0, " x y"),
+                                  (0, 17, "todo nuevo"), (16, 1, "\n\nA a")])
+def test_text_replace_matches_accumulating_the_edited_text(edit):
+    text = "hola Hola\nmundo 1"
+    offset, delete_len, insert_text = edit
+    edited = text[:offset] + insert_text + text[offset + delete_len:]
+    totals = TextAccumulator(editable=True)
+    totals.update(text)
+    totals.replace(text, offset, delete_len, insert_text)
+    expected = TextAccumulator()
+    expected.update(edited)
+    assert totals.char_counts == expected.char_counts
+    assert totals.word_count == expected.word_count == len(edited.split())
+    assert set(totals.unique_words) == expected.unique_words
+
+
+def test_only_editable_accumulators_forget_values():
+    with pytest.raises(ValueError):
+        TextAccumulator().replace("a b", 0, 1, "")
+    with pytest.raises(ValueError):
+        TokenAccumulator().remove([])
+    with pytest.raises(ValueError):
+        TokenAccumulator(approximate=True, editable=True)
+    with pytest.raises(ValueError):
+        TextAccumulator().merge(TextAccumulator(editable=True))
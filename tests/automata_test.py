@@ -0,0 +1,103 @@
+"""
+Automata Test: El motor de autómatas (Thompson, subconjuntos, Hopcroft y producto)
+reconoce exactamente lo mismo que `re`
+"""
+
+import sys
+import os
+import re
+import random
+
+import pytest
+
+# Agregar el directorio padre al path para poder importar src
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.patterns.patterns import PatternValidator
+from src.patterns.automata import DFAClassifier, UnsupportedPatternError, compile_dfa
+from test_cases import get_test_cases
+
+
+# Patrones propios que ejercitan alternaciones, repeticiones acotadas,
+# lookaheads, clases negadas y un patrón no regular (referencia hacia atrás)
+CUSTOM_PATTERNS = {
+    'version': r'^v(?:\d+\.){2}\d+(?:-rc\d+)?$',
+    'codigo': r'ab(?:cd|ce)[0-9]+',
+    'hex': r'^(?:0x)?[0-9A-Fa-f]{2,6}$',
+    'clave': r'^(?=.*\d)(?=.*[A-Z])[^\s@]{4,10}$',
+    'palabra': r'^\w+(?:-\w+)*$',
+    'repetido': r'^(\w)\1+$',
+}
+
+
+def _samples():
+    """Ejemplos válidos e inválidos de los casos de prueba, más variantes al azar"""
+    samples = ['', 'v1.2.3', 'v10.0.1-rc2', 'abcd12', 'abce7xyz', '0xFF', 'Ab1cd', 'aaaa',
+               'foo-bar_9', '٣٤٥', 'ñandú', 'ab\u3000cd', 'x\n', 'a@b.co\n']
+    for cases in get_test_cases().values():
+        samples += cases['validos'] + cases['invalidos']
+    rng = random.Random(3)
+    alphabet = "abcXYZh0139@.:/-_+$!%*?& \nñ٣"
+    for _ in range(6000):
+        text = list(rng.choice(samples))
+        for _ in range(rng.randint(1, 3)):
+            position = rng.randint(0, len(text))
+            if rng.random() < 0.5 or not text:
+                text.insert(position, rng.choice(alphabet))
+            else:
+                del text[min(position, len(text) - 1)]
+        samples.append(''.join(text))
+    return samples
+
+
+SAMPLES = _samples()
+
+
+def _validator():
+    validator = PatternValidator()
+    for name, pattern in CUSTOM_PATTERNS.items():
+        validator.add_pattern(name, pattern)
+    return validator
+
+
+@pytest.mark.parametrize('pattern, text', [
+    (r'^[a-z]+@[a-z]+\.co$', 'a@b.co\n'),
+    (r'^[a-z]+@[a-z]+\.co$', 'a@b.co\n\n'),
+    (r'^[a-z]+@[a-z]+\.co$', 'a@b.co\r\n'),
+    (r'^\d{3}$', '123\n'),
+    (r'^\d{3}$', '\n'),
+    (r'^\d{3}', '123\nabc'),
+    (r'^.+$', 'abc\n'),
+])
+def test_end_anchor_accepts_one_trailing_newline_like_re(pattern, text):
+    assert compile_dfa(pattern).fullmatch(text) == bool(re.match(pattern, text))
+
+
+@pytest.mark.parametrize('name', list(_validator().patterns))
+def test_dfa_matches_re(name):
+    pattern = _validator().patterns[name]
+    try:
+        dfa = compile_dfa(pattern)
+    except UnsupportedPatternError:
+        # Solo la referencia hacia atrás queda fuera del subconjunto regular
+        assert name == 'repetido'
+        return
+    compiled = re.compile(pattern)
+    for sample in SAMPLES:
+        assert dfa.fullmatch(sample) == bool(compiled.match(sample)), (name, sample)
+
+
+def test_dfa_classifier_matches_validator():
+    validator = _validator()
+    classifier = DFAClassifier(validator)
+    # El patrón no regular se evalúa con re respetando su prioridad
+    assert [name for _, name in classifier.fallback] == ['repetido']
+    for sample in SAMPLES:
+        assert classifier.classify(sample) == validator.classify(sample), sample
+    
+    # Tras add_pattern el clasificador se reconstruye con el nuevo conjunto
+    validator.add_pattern('numero_entero', r'^[0-9]{1,3}$')
+    for sample in SAMPLES:
+        assert classifier.classify(sample) == validator.classify(sample), sample
@@ -0,0 +1,35 @@
+"""
+Batch Test: Análisis no interactivo de documentos desde la línea de comandos
+"""
+
+import sys
+import os
+
+import pytest
+
+# Agregar el directorio padre al path para poder importar src
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from main import build_parser
+from src.core import batch
+
+
+@pytest.mark.parametrize('command', ['analyze', 'serve'])
+def test_jobs_must_be_a_positive_integer(command, capsys):
+    arguments = [command, '--input', '-'] if command == 'analyze' else [command]
+    assert build_parser().parse_args(arguments + ['--jobs', '3']).jobs == 3
+    for value in ('0', '-2', 'muchos'):
+        with pytest.raises(SystemExit):
+            build_parser().parse_args(arguments + ['--jobs', value])
+        assert 'entero positivo' in capsys.readouterr().err
+
+
+def test_advanced_batch_does_not_accumulate_history():
+    for i in range(5):
+        result = batch.analyze_document(batch.STDIN_DOCUMENT, advanced=True,
+                                        text=f"documento {i} user{i}@test.com")
+        assert result['pattern_counts'] == {'email': 1, 'numero_entero': 1}
+        assert result['advanced']['token_analysis']['total_tokens'] == 3
+    history = batch._get_worker_model().statistics_analyzer.analysis_history
+    assert len(history) == 1 and history.spilled_count == 0
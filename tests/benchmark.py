@@ -0,0 +1,582 @@
+"""
+Benchmark: Mediciones de rendimiento de los componentes del análisis léxico
+Ejecutar con: python tests/benchmark.py
+"""
+
+import re
+import sys
+import os
+import time
+import tempfile
+import tracemalloc
+import statistics
+from collections import Counter
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+
+# Agregar el directorio padre al path para poder importar src
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.patterns.patterns import PatternValidator
+from src.patterns.dispatch import ShapeDispatcher
+from src.patterns.automata import compile_dfa, DFAClassifier
+from src.analysis.statistics import StatisticsAnalyzer
+from src.analysis.position_index import PositionIndex
+from src.analysis.corpus_index import CorpusIndex
+from src.analysis.accumulators import TextAccumulator, _count_characters_vectorized
+from src.core.model import TextModel
+from src.analysis.lexical_analyzer import (LexicalAnalyzer, TokenType, PUNCTUATION_CHARS,
+                                           _TOKEN_SCANNER, _NEWLINE)
+from test_cases import get_performance_test_text, get_test_cases
+
+
+def _measure(function, repeat: int = 5) -> float:
+    """Retorna el mejor tiempo (en segundos) de varias ejecuciones"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _sample_lexemes():
+    """Lexemas representativos: los tokens del texto de rendimiento"""
+    return get_performance_test_text().split() * 20
+
+
+def benchmark_classifier():
+    """Compara el bucle patrón por patrón contra el clasificador fusionado"""
+    print("\n=== CLASIFICADOR: BUCLE vs FUSIONADO ===")
+    validator = PatternValidator()
+    lexemes = _sample_lexemes()
+    
+    def loop_classifier():
+        for lexeme in lexemes:
+            for pattern_name in validator.get_available_patterns():
+                if validator.validate_pattern(lexeme, pattern_name):
+                    break
+    
+    def fused_classifier():
+        for lexeme in lexemes:
+            validator.classify(lexeme)
+    
+    loop_time = _measure(loop_classifier)
+    fused_time = _measure(fused_classifier)
+    
+    print(f"  • Lexemas clasificados: {len(lexemes):,}")
+    print(f"  • Bucle por patrón: {loop_time * 1000:.1f} ms")
+    print(f"  • Clasificador fusionado: {fused_time * 1000:.1f} ms")
+    print(f"  • Aceleración: {loop_time / fused_time:.1f}x")
+
+
+def benchmark_dispatch():
+    """Mide el efecto de la tabla de despacho por forma"""
+    print("\n=== DESPACHO POR FORMA DEL LEXEMA ===")
+    validator = PatternValidator()
+    dispatcher = ShapeDispatcher(validator)
+    lexemes = _sample_lexemes()
+    
+    fused_time = _measure(lambda: [validator.classify(lexeme) for lexeme in lexemes])
+    dispatch_time = _measure(lambda: [dispatcher.classify(lexeme) for lexeme in lexemes])
+    stats = dispatcher.get_dispatch_statistics()
+    
+    print(f"  • Clasificador fusionado: {fused_time * 1000:.1f} ms")
+    print(f"  • Fusionado con despacho: {dispatch_time * 1000:.1f} ms")
+    print(f"  • Evaluaciones de patrón descartadas: {stats['skip_ratio']:.1%}")
+    print(f"  • Lexemas sin ningún candidato: {stats['regex_calls_avoided']:,}")
+    for pattern_name, skips in stats['skips_by_pattern'].items():
+        print(f"    - {pattern_name}: {skips:,} descartes")
+
+
+def benchmark_dfa():
+    """Compara el AFD compilado contra `re` para cada patrón"""
+    print("\n=== MOTOR AFD vs re ===")
+    validator = PatternValidator()
+    samples = []
+    for category in get_test_cases().values():
+        samples.extend(category['validos'] + category['invalidos'])
+    samples = samples * 200
+    
+    print(f"  {'Patrón':<16} {'Estados':>7} {'Clases':>6} {'Bytes':>6} {'re (ms)':>8} {'AFD (ms)':>9}")
+    for pattern_name in validator.get_available_patterns():
+        start = time.perf_counter()
+        dfa = compile_dfa(validator.patterns[pattern_name])
+        compile_time = time.perf_counter() - start
+        regex = validator.compiled_patterns[pattern_name]
+        regex_time = _measure(lambda: [regex.match(sample) for sample in samples])
+        dfa_time = _measure(lambda: [dfa.fullmatch(sample) for sample in samples])
+        print(f"  {pattern_name:<16} {dfa.state_count:>7} {dfa.nclasses:>6} {dfa.memory_usage():>6} "
+              f"{regex_time * 1000:>8.1f} {dfa_time * 1000:>9.1f}  (compilado en {compile_time * 1000:.0f} ms)")
+    
+    classifier = DFAClassifier(validator)
+    lexemes = _sample_lexemes()
+    fused_time = _measure(lambda: [validator.classify(lexeme) for lexeme in lexemes])
+    dfa_time = _measure(lambda: [classifier.classify(lexeme) for lexeme in lexemes])
+    print(f"  • AFD producto de todos los patrones: {classifier.dfa.state_count} estados, "
+          f"{classifier.dfa.nclasses} clases, {classifier.dfa.memory_usage():,} bytes")
+    print(f"  • Clasificación con re fusionado: {fused_time * 1000:.1f} ms")
+    print(f"  • Clasificación con AFD: {dfa_time * 1000:.1f} ms")
+
+
+def benchmark_cache():
+    """Mide la caché LRU de clasificaciones sobre un corpus con repeticiones"""
+    print("\n=== CACHÉ LRU DE CLASIFICACIONES ===")
+    text = get_performance_test_text() * 5
+    
+    for cache_size in (0, 4096):
+        analyzer = LexicalAnalyzer(cache_size=cache_size)
+        elapsed = _measure(lambda: analyzer.analyze(text), repeat=3)
+        cache = analyzer.get_statistics()['cache']
+        print(f"  • Capacidad {cache_size:>5}: {elapsed * 1000:.1f} ms "
+              f"(aciertos {cache['hit_ratio']:.1%}, desalojos {cache['evictions']:,})")
+
+
+def _legacy_scan(text: str) -> int:
+    """Recorrido carácter a carácter equivalente al escáner anterior (sin clasificar)"""
+    position, line, column, count = 0, 1, 1, 0
+    while position < len(text):
+        while position < len(text) and text[position].isspace():
+            if text[position] == '\n':
+                line += 1
+                column = 1
+            else:
+                column += 1
+            position += 1
+        if position >= len(text):
+            break
+        end = position
+        while end < len(text) and not text[end].isspace() and text[end] not in PUNCTUATION_CHARS:
+            end += 1
+        end = max(end, position + 1)
+        column += end - position
+        position = end
+        count += 1
+    return count
+
+
+def _finditer_scan(text: str) -> int:
+    """Recorrido del escáner actual: finditer + búsqueda binaria de líneas (sin clasificar)"""
+    newlines = [match.start() for match in _NEWLINE.finditer(text)]
+    line_index, count = 0, 0
+    for match in _TOKEN_SCANNER.finditer(text):
+        start = match.start()
+        line_index = bisect_right(newlines, start, line_index)
+        column = start - newlines[line_index - 1] if line_index else start + 1
+        count += 1
+    return count
+
+
+def benchmark_scanner():
+    """Compara el recorrido carácter a carácter con el escáner basado en finditer"""
+    print("\n=== ESCÁNER: CARÁCTER A CARÁCTER vs FINDITER ===")
+    samples = {
+        'texto denso en patrones': get_performance_test_text() * 200,
+        'texto con líneas largas': ("    " + "palabra " * 12 + "admin@test.com\n") * 25000,
+    }
+    for label, text in samples.items():
+        megabytes = len(text) / 1_000_000
+        legacy_time = _measure(lambda: _legacy_scan(text), repeat=1)
+        scanner_time = _measure(lambda: _finditer_scan(text), repeat=3)
+        print(f"  • {label} ({megabytes:.1f} MB, {_finditer_scan(text):,} tokens):")
+        print(f"    - Carácter a carácter: {megabytes / legacy_time:.1f} MB/s")
+        print(f"    - finditer + bisect: {megabytes / scanner_time:.1f} MB/s "
+              f"({legacy_time / scanner_time:.1f}x)")
+    
+    text = samples['texto denso en patrones']
+    analyzer = LexicalAnalyzer()
+    analyze_time = _measure(lambda: analyzer.analyze(text), repeat=1)
+    print(f"  • analyze() completo con clasificación: {len(text) / 1_000_000 / analyze_time:.1f} MB/s")
+
+
+def benchmark_stream():
+    """Verifica que el análisis por bloques use memoria constante"""
+    print("\n=== ANÁLISIS POR BLOQUES (STREAMING) ===")
+    block = get_performance_test_text()
+    for repetitions in (50, 200):
+        with tempfile.TemporaryFile('w+', encoding='utf-8') as handle:
+            for _ in range(repetitions):
+                handle.write(block)
+            size = handle.tell()
+            handle.seek(0)
+            
+            analyzer = LexicalAnalyzer()
+            tracemalloc.start()
+            start = time.perf_counter()
+            count = sum(1 for _ in analyzer.analyze_stream(handle, chunk_size=65536))
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        
+        print(f"  • {size / 1_000_000:.1f} MB: {count:,} tokens en {elapsed:.2f} s, "
+              f"pico de memoria {peak / 1024:.0f} KiB")
+
+
+def benchmark_mmap():
+    """Compara leer el archivo completo contra el análisis sobre un mapa de memoria"""
+    print("\n=== ARCHIVO COMPLETO vs MAPA DE MEMORIA ===")
+    block = get_performance_test_text()
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', suffix='.txt', delete=False) as handle:
+        for _ in range(400):
+            handle.write(block)
+        path = handle.name
+    size = os.path.getsize(path)
+    
+    def read_and_analyze():
+        with open(path, encoding='utf-8') as source:
+            return sum(1 for _ in LexicalAnalyzer().analyze(source.read()))
+    
+    def mapped_analyze():
+        return sum(1 for _ in LexicalAnalyzer().iter_file(path))
+    
+    try:
+        for label, function in (('read() + analyze()', read_and_analyze),
+                                ('mmap + iter_file()', mapped_analyze)):
+            tracemalloc.start()
+            start = time.perf_counter()
+            count = function()
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"  • {label}: {size / 1_000_000:.1f} MB, {count:,} tokens en {elapsed:.2f} s, "
+                  f"pico de memoria {peak / 1024:.0f} KiB")
+    finally:
+        os.unlink(path)
+
+
+def benchmark_parallel():
+    """Mide la escala del análisis por fragmentos en varios procesos"""
+    print("\n=== ANÁLISIS EN PARALELO POR FRAGMENTOS ===")
+    text = get_performance_test_text() * 400
+    sequential_time = _measure(lambda: LexicalAnalyzer().analyze(text), repeat=1)
+    print(f"  • Secuencial: {sequential_time:.2f} s ({len(text) / 1_000_000:.1f} MB)")
+    for workers in sorted({2, 4, max(2, os.cpu_count() or 2)}):
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Calentar el grupo de procesos antes de medir
+            LexicalAnalyzer().analyze_parallel(text[:600000], workers, executor)
+            elapsed = _measure(lambda: LexicalAnalyzer().analyze_parallel(text, workers, executor),
+                               repeat=1)
+        print(f"  • {workers} procesos: {elapsed:.2f} s ({sequential_time / elapsed:.1f}x)")
+
+
+def benchmark_token_table():
+    """Compara la lista de objetos Token con la tabla columnar"""
+    print("\n=== LISTA DE TOKENS vs TABLA COLUMNAR ===")
+    text = get_performance_test_text() * 80
+    for label, method in (('Lista de Token', 'analyze'), ('TokenTable', 'analyze_columnar')):
+        analyzer = LexicalAnalyzer()
+        tracemalloc.start()
+        start = time.perf_counter()
+        tokens = getattr(analyzer, method)(text)
+        elapsed = time.perf_counter() - start
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        filter_time = _measure(lambda: analyzer.get_tokens_by_pattern('email'), repeat=3)
+        print(f"  • {label}: {len(tokens):,} tokens, {retained / 1_000_000:.1f} MB retenidos, "
+              f"análisis {elapsed:.2f} s, filtro por patrón {filter_time * 1000:.1f} ms")
+
+
+class _UnslottedToken:
+    """Token con __dict__ por instancia, como antes de usar __slots__"""
+    
+    def __init__(self, lexeme, token_type, pattern_name=None, position=0, line=1, column=1):
+        self.lexeme = lexeme
+        self.token_type = token_type
+        self.pattern_name = pattern_name
+        self.position = position
+        self.line = line
+        self.column = column
+
+
+def benchmark_token_memory(target_tokens: int = 1_000_000):
+    """Mide los bytes por token de LexicalAnalyzer.tokens en un corpus sintético"""
+    print("\n=== MEMORIA POR TOKEN ===")
+    block = get_performance_test_text()
+    block_tokens = len(LexicalAnalyzer().analyze(block))
+    text = block * (target_tokens // block_tokens + 1)
+    
+    analyzer = LexicalAnalyzer()
+    tracemalloc.start()
+    tokens = analyzer.analyze(text)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  • Corpus: {len(text) / 1_000_000:.1f} MB, {len(tokens):,} tokens")
+    print(f"  • analyze() completo: {retained / len(tokens):.0f} bytes/token "
+          f"(incluye lexemas y caché)")
+    
+    # Costo de los objetos y la lista, con los mismos lexemas compartidos
+    for label, token_class in (('Token sin __slots__ (antes)', _UnslottedToken),
+                               ('Token con __slots__ (ahora)', type(tokens[0]))):
+        tracemalloc.start()
+        rebuilt = [token_class(t.lexeme, t.token_type, t.pattern_name, t.position, t.line, t.column)
+                   for t in tokens]
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"  • {label}: {retained / len(rebuilt):.0f} bytes/token")
+        del rebuilt
+
+
+def _legacy_statistics(tokens, text: str) -> dict:
+    """Recorridos de la versión anterior de analyze_results (una pasada por métrica)"""
+    words, lines = text.split(), text.split('\n')
+    lengths = [len(token.lexeme) for token in tokens]
+    valid = [t for t in tokens if t.pattern_name]
+    pattern_counts = Counter(t.pattern_name for t in valid)
+    return {
+        'text': (len(words), statistics.mean([len(w) for w in words]) if words else 0,
+                 statistics.mean([len(line) for line in lines]), text.count(' '),
+                 sum(1 for c in text if not c.isalnum() and not c.isspace()),
+                 sum(1 for c in text if c.isupper()), sum(1 for c in text if c.islower()),
+                 sum(1 for c in text if c.isdigit())),
+        'tokens': (statistics.mean(lengths), statistics.median(lengths), min(lengths), max(lengths),
+                   statistics.stdev(lengths), len(set(t.lexeme for t in tokens)),
+                   len(set(t.lexeme for t in tokens))),
+        'patterns': {name: (statistics.mean([len(t.lexeme) for t in valid if t.pattern_name == name]),
+                            len(set(t.lexeme for t in valid if t.pattern_name == name)))
+                     for name in pattern_counts},
+        'coverage': len([t for t in tokens if t.pattern_name]),
+        'types': Counter(t.token_type.value for t in tokens),
+        'lines': (len(set(t.line for t in tokens)), max(t.line for t in tokens)),
+        'complexity': (len(set(text.lower().split())), len(text.split()), len(text.split()),
+                       sum(len(w) for w in text.split()),
+                       len(set(t.pattern_name for t in tokens if t.pattern_name))),
+    }
+
+
+def benchmark_statistics():
+    """Compara los recorridos múltiples anteriores con los acumuladores de una pasada"""
+    print("\n=== ESTADÍSTICAS: RECORRIDOS MÚLTIPLES vs UNA PASADA ===")
+    text = get_performance_test_text() * 200
+    analyzer = LexicalAnalyzer()
+    tokens = analyzer.analyze(text)
+    basic_stats = analyzer.get_statistics()
+    
+    legacy_time = _measure(lambda: _legacy_statistics(tokens, text), repeat=3)
+    single_pass_time = _measure(
+        lambda: StatisticsAnalyzer().analyze_results(tokens, text, basic_stats), repeat=3)
+    print(f"  • {len(text) / 1_000_000:.1f} MB, {len(tokens):,} tokens")
+    print(f"  • Recorridos múltiples: {legacy_time * 1000:.0f} ms")
+    print(f"  • Acumuladores de una pasada: {single_pass_time * 1000:.0f} ms "
+          f"({legacy_time / single_pass_time:.1f}x)")
+
+
+def benchmark_text_properties():
+    """Compara las sumas carácter a carácter, Counter y el conteo vectorizado con NumPy"""
+    print("\n=== PROPIEDADES DEL TEXTO: PYTHON vs NUMPY ===")
+    text = get_performance_test_text() * 400 + "Ñandú café € 😀\n"
+    
+    def generator_sums():
+        return (sum(1 for c in text if c.isupper()), sum(1 for c in text if c.islower()),
+                sum(1 for c in text if c.isdigit()),
+                sum(1 for c in text if not c.isalnum() and not c.isspace()))
+    
+    def class_counts(counter_function):
+        accumulator = TextAccumulator()
+        accumulator.char_counts = counter_function(text)
+        return accumulator.class_counts()
+    
+    generator_time = _measure(generator_sums, repeat=1)
+    counter_time = _measure(lambda: class_counts(Counter), repeat=3)
+    numpy_time = _measure(lambda: class_counts(_count_characters_vectorized), repeat=3)
+    print(f"  • {len(text) / 1_000_000:.1f} MB (con caracteres no ASCII)")
+    print(f"  • Sumas por generador (4 recorridos): {generator_time * 1000:.0f} ms")
+    print(f"  • Counter + clases por carácter distinto: {counter_time * 1000:.0f} ms")
+    print(f"  • NumPy bincount + clases por carácter distinto: {numpy_time * 1000:.0f} ms "
+          f"({generator_time / numpy_time:.1f}x)")
+
+
+def benchmark_edits(keystrokes: int = 200):
+    """Compara el análisis completo con apply_edit al escribir sobre un documento de 1 MB"""
+    print("\n=== EDICIONES: REANÁLISIS COMPLETO vs INCREMENTAL ===")
+    base = get_performance_test_text()
+    text = base * (1_000_000 // len(base) + 1)
+    model = TextModel()
+    model.set_text(text)
+    
+    full_time = _measure(lambda: model.lexical_analyzer.analyze(model.text), repeat=1)
+    offset = len(text) // 2
+    start = time.perf_counter()
+    for i in range(keystrokes):
+        model.apply_edit(offset + i, 0, "a" if i % 6 else " ")
+    edit_time = (time.perf_counter() - start) / keystrokes
+    print(f"  • {len(text) / 1_000_000:.1f} MB, {len(model.tokens):,} tokens")
+    print(f"  • Reanálisis completo: {full_time * 1000:.0f} ms")
+    print(f"  • apply_edit por tecla: {edit_time * 1_000_000:.0f} µs "
+          f"({full_time / edit_time:.0f}x)")
+
+
+def benchmark_token_queries():
+    """Compara los filtros lineales sobre la lista de tokens con los índices por tipo y patrón"""
+    print("\n=== CONSULTAS: RECORRIDO LINEAL vs ÍNDICES ===")
+    text = get_performance_test_text() * 200
+    analyzer = LexicalAnalyzer()
+    tokens = analyzer.analyze(text)
+    pattern_names = list(analyzer.get_pattern_counts())
+    
+    def linear_queries():
+        [t for t in tokens if t.token_type == TokenType.VALID_PATTERN]
+        [t for t in tokens if t.token_type == TokenType.INVALID_TOKEN]
+        for name in pattern_names:
+            [t for t in tokens if t.token_type == TokenType.VALID_PATTERN and t.pattern_name == name]
+    
+    def indexed_queries():
+        analyzer.get_tokens_by_type(TokenType.VALID_PATTERN)
+        analyzer.get_tokens_by_type(TokenType.INVALID_TOKEN)
+        for name in pattern_names:
+            analyzer.get_tokens_by_pattern(name)
+    
+    linear_time = _measure(linear_queries, repeat=3)
+    indexed_time = _measure(indexed_queries, repeat=3)
+    statistics_time = _measure(analyzer.get_statistics, repeat=100)
+    print(f"  • {len(tokens):,} tokens, {len(pattern_names)} patrones")
+    print(f"  • Filtros lineales: {linear_time * 1000:.1f} ms")
+    print(f"  • Índices: {indexed_time * 1000:.1f} ms ({linear_time / indexed_time:.1f}x)")
+    print(f"  • get_statistics() con conteos mantenidos: {statistics_time * 1_000_000:.0f} µs")
+
+
+def benchmark_position_queries():
+    """Compara los filtros lineales por línea y posición con el índice posicional"""
+    print("\n=== CONSULTAS POSICIONALES: RECORRIDO LINEAL vs BISECCIÓN ===")
+    text = get_performance_test_text() * 200
+    analyzer = LexicalAnalyzer()
+    tokens = analyzer.analyze(text)
+    middle_line = analyzer.current_line // 2
+    middle_offset = len(text) // 2
+    
+    def linear_queries():
+        [t for t in tokens if middle_line <= t.line <= middle_line + 200]
+        [t for t in tokens if t.position <= middle_offset < t.position + len(t.lexeme)]
+    
+    def indexed_queries():
+        analyzer.get_tokens_in_lines(middle_line, middle_line + 200)
+        analyzer.get_token_at(middle_offset)
+    
+    build_time = _measure(lambda: PositionIndex.from_tokens(tokens), repeat=3)
+    linear_time = _measure(linear_queries, repeat=3)
+    indexed_time = _measure(indexed_queries, repeat=100)
+    print(f"  • {len(tokens):,} tokens, {analyzer.current_line:,} líneas")
+    print(f"  • Construcción del índice: {build_time * 1000:.0f} ms (una vez por análisis)")
+    print(f"  • Filtros lineales: {linear_time * 1000:.1f} ms")
+    print(f"  • Bisección: {indexed_time * 1_000_000:.0f} µs ({linear_time / indexed_time:.0f}x)")
+
+
+def benchmark_corpus_index(documents: int = 300):
+    """Compara buscar un lexema re-analizando el corpus con consultar el índice invertido"""
+    print("\n=== CORPUS: RE-ANÁLISIS vs ÍNDICE INVERTIDO ===")
+    base = get_performance_test_text()
+    corpus = {f"doc{i}": f"Contacto: cliente{i}@empresa.com\n" + base for i in range(documents)}
+    analyzer = LexicalAnalyzer()
+    
+    def search_by_analysis(lexeme):
+        return [document_id for document_id, text in corpus.items()
+                if any(token.lexeme == lexeme for token in analyzer.analyze(text))]
+    
+    def build_index():
+        index = CorpusIndex()
+        for document_id, text in corpus.items():
+            index.add_document(document_id, analyzer.analyze(text))
+        return index
+    
+    analysis_time = _measure(lambda: search_by_analysis("cliente7@empresa.com"), repeat=1)
+    build_time = _measure(build_index, repeat=1)
+    index = build_index()
+    lookup_time = _measure(lambda: index.documents_containing("cliente7@empresa.com"), repeat=100)
+    prefix_time = _measure(lambda: index.prefix_lookup("cliente1", limit=20), repeat=100)
+    with tempfile.TemporaryDirectory() as directory:
+        path = index.save(os.path.join(directory, "corpus.json.gz"))
+        size = os.path.getsize(path)
+        load_time = _measure(lambda: CorpusIndex.load(path), repeat=3)
+    print(f"  • {documents} documentos, {len(index):,} lexemas indexados")
+    print(f"  • Búsqueda re-analizando el corpus: {analysis_time * 1000:.0f} ms")
+    print(f"  • Construcción del índice (una vez): {build_time * 1000:.0f} ms")
+    print(f"  • Búsqueda exacta: {lookup_time * 1_000_000:.1f} µs, por prefijo: {prefix_time * 1_000_000:.0f} µs")
+    print(f"  • En disco: {size / 1024:.0f} KiB (gzip), carga en {load_time * 1000:.0f} ms")
+
+
+def benchmark_validate_many(count: int = 300_000):
+    """Compara validate_pattern valor por valor con validate_many sobre el mismo lote"""
+    print("\n=== VALIDACIÓN MASIVA: validate_pattern vs validate_many ===")
+    validator = PatternValidator()
+    unique = [f" usuario{i}@correo.com" if i % 3 == 0 else str(10_000_000 + i * 7919)
+              if i % 3 == 1 else f"Nombre {i}\n" for i in range(count)]
+    repeated = [unique[(i * 7919) % 2000] for i in range(count)]
+    for label, values in (("valores distintos", unique), ("valores repetidos", repeated)):
+        print(f"  • {count:,} {label}:")
+        for pattern_name in ('email', 'cedula', 'password_segura'):
+            single_time = _measure(
+                lambda: [validator.validate_pattern(value, pattern_name) for value in values], repeat=3)
+            bulk_time = _measure(lambda: validator.validate_many(values, pattern_name), repeat=3)
+            print(f"    - {pattern_name}: {single_time * 1000:.0f} ms -> {bulk_time * 1000:.0f} ms "
+                  f"({single_time / bulk_time:.1f}x)")
+
+
+def benchmark_pattern_search(repeat_text: int = 100):
+    """Compara validar cada palabra con cada patrón contra la búsqueda sin tokenizar"""
+    print("\n=== BÚSQUEDA DE PATRONES: palabra por palabra vs finditer en modo búsqueda ===")
+    validator = PatternValidator()
+    text = get_performance_test_text() * repeat_text
+    
+    def per_token():
+        tokens = re.findall(r'\S+', text)
+        return {name: [token for token in tokens if validator.validate_pattern(token, name)]
+                for name in validator.patterns}
+    
+    token_time = _measure(per_token, repeat=3)
+    search_time = _measure(lambda: validator.analyze_text_patterns(text), repeat=3)
+    spans_time = _measure(lambda: validator.find_pattern_spans(text), repeat=3)
+    spans = validator.find_pattern_spans(text)
+    print(f"  • {len(text):,} caracteres, {len(validator.patterns)} patrones, {len(spans):,} coincidencias")
+    print(f"  • Tokens x patrones:            {token_time * 1000:.0f} ms")
+    print(f"  • Un finditer por patrón:       {search_time * 1000:.0f} ms ({token_time / search_time:.1f}x)")
+    print(f"  • Un solo finditer (prioridad): {spans_time * 1000:.0f} ms ({token_time / spans_time:.1f}x)")
+    email_time = _measure(lambda: validator.find_all_patterns(text, 'email'), repeat=3)
+    print(f"  • Un patrón (email): {email_time * 1000:.0f} ms")
+
+
+def benchmark_prefilter(repeat_text: int = 20):
+    """Compara la expresión sola contra prefiltro + expresión sobre palabras distintas"""
+    print("\n=== PREFILTROS: expresión regular sola vs prefiltro + expresión ===")
+    validator = PatternValidator()
+    words = [f"{word.strip(PUNCTUATION_CHARS)}{i}" for i, word in
+             enumerate(get_performance_test_text().split() * repeat_text)]
+    print(f"  • {len(words):,} palabras distintas")
+    for pattern_name in validator.get_available_patterns():
+        prefilter = validator.get_prefilter(pattern_name)
+        if prefilter is None:
+            print(f"    - {pattern_name}: sin prefiltro")
+            continue
+        match = validator.compiled_patterns[pattern_name].match
+        regex_time = _measure(lambda: [match(word) for word in words], repeat=3)
+        check = prefilter.check
+        filtered_time = _measure(lambda: [check(word) and match(word) for word in words], repeat=3)
+        validator.validate_many(words, pattern_name)
+        stats = validator.get_prefilter_stats()[pattern_name]
+        print(f"    - {pattern_name}: {regex_time * 1000:.1f} ms -> {filtered_time * 1000:.1f} ms "
+              f"({regex_time / filtered_time:.1f}x), expresión evitada en "
+              f"{stats['rejected_percentage']:.0f}%")
+
+
+if __name__ == "__main__":
+    print("⏱️  BENCHMARKS DEL SISTEMA DE ANÁLISIS LÉXICO")
+    print("="*50)
+    benchmark_classifier()
+    benchmark_dispatch()
+    benchmark_dfa()
+    benchmark_cache()
+    benchmark_scanner()
+    benchmark_stream()
+    benchmark_mmap()
+    benchmark_parallel()
+    benchmark_token_table()
+    benchmark_token_memory()
+    benchmark_statistics()
+    benchmark_text_properties()
+    benchmark_edits()
+    benchmark_token_queries()
+    benchmark_position_queries()
+    benchmark_corpus_index()
+    benchmark_validate_many()
+    benchmark_pattern_search()
+    benchmark_prefilter()
@@ -0,0 +1,58 @@
+"""
+Cache Test: Caché LRU de clasificaciones del analizador léxico
+"""
+
+import sys
+import os
+
+import pytest
+
+# Agregar el directorio padre al path para poder importar src
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.analysis.lexical_analyzer import LexicalAnalyzer
+
+
+def _cache(analyzer):
+    statistics = analyzer.get_cache_statistics()
+    return statistics['hits'], statistics['misses'], statistics['evictions'], statistics['size']
+
+
+@pytest.mark.parametrize('engine', ['regex', 'dfa'])
+def test_hits_misses_and_lru_eviction(engine):
+    analyzer = LexicalAnalyzer(engine, cache_size=3)
+    analyzer.analyze("uno 123 uno user@test.com 123")
+    assert _cache(analyzer) == (2, 3, 0, 3)
+    assert analyzer.get_cache_statistics()['hit_ratio'] == pytest.approx(2 / 5)
+    
+    # 'dos' desaloja al menos usado recientemente ('uno'), no a '123'
+    analyzer.analyze("123 dos uno")
+    assert _cache(analyzer) == (3, 5, 2, 3)
+    assert [lexeme for _, lexeme in analyzer._classification_cache] == ['123', 'dos', 'uno']
+    assert [token.pattern_name for token in analyzer.tokens] == ['numero_entero', None, None]
+    
+    analyzer.clear_cache()
+    assert _cache(analyzer) == (0, 0, 0, 0)
+
+
+def test_cache_size_zero_disables_the_cache():
+    analyzer = LexicalAnalyzer(cache_size=0)
+    tokens = analyzer.analyze("123 123 user@test.com 123")
+    assert [token.pattern_name for token in tokens] == ['numero_entero'] * 2 + ['email', 'numero_entero']
+    assert _cache(analyzer) == (0, 4, 0, 0)
+
+
+@pytest.mark.parametrize('engine', ['regex', 'dfa'])
+def test_add_pattern_invalidates_cached_classifications(engine):
+    analyzer = LexicalAnalyzer(engine)
+    assert [token.pattern_name for token in analyzer.analyze("TCK-1234 123")] == [None, 'numero_entero']
+    analyzer.analyze("TCK-1234 123")
+    assert _cache(analyzer)[:2] == (2, 2)
+    
+    # La versión de los patrones forma parte de la clave: lo guardado antes ya no se usa
+    analyzer.pattern_validator.add_pattern('ticket', r'^TCK-[0-9]{4}$')
+    analyzer.pattern_validator.add_pattern('numero_entero', r'^[0-9]{4,}$')
+    tokens = analyzer.analyze("TCK-1234 123")
+    assert [token.pattern_name for token in tokens] == ['ticket', 'numero_decimal']
+    assert _cache(analyzer)[:2] == (2, 4)
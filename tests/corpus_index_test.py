@@ -0,0 +1,102 @@
+"""
+Corpus Index Test: Índice invertido de lexemas, consultas y persistencia en disco
+"""
+
+import sys
+import os
+import gzip
+import json
+
+import pytest
+
+# Agregar el directorio padre al path para poder importar src
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.analysis.corpus_index import CorpusIndex
+from src.analysis.lexical_analyzer import LexicalAnalyzer
+
+
+DOCUMENTS = {
+    'a.txt': "Admin@Test.com escribe a admin@test.com desde 192.168.1.1, hola",
+    'b.txt': "ADMIN@TEST.COM y ana@test.com; 192.168.1.10 hola hola",
+    'c.txt': "sin patrones aquí",
+}
+
+
+def _index(valid_only=True):
+    index = CorpusIndex(valid_only)
+    analyzer = LexicalAnalyzer()
+    for document_id, text in DOCUMENTS.items():
+        index.add_document(document_id, analyzer.analyze(text))
+    return index
+
+
+def test_lexemes_differing_in_case_share_one_entry():
+    index = _index()
+    assert index.lookup('admin@test.com') == {'a.txt': [0, 25], 'b.txt': [0]}
+    assert index.lookup('ADMIN@test.COM') == index.lookup('admin@test.com')
+    assert 'Admin@TEST.com' in index
+    assert index.documents_containing('admin@test.com') == ['a.txt', 'b.txt']
+    assert index.get_pattern('ADMIN@TEST.COM') == 'email'
+    with pytest.raises(ValueError):
+        index.add_document('a.txt', [])
+
+
+def test_valid_only_skips_invalid_tokens_and_punctuation():
+    index = _index()
+    assert 'hola' not in index and ',' not in index
+    assert index.documents_containing('sin') == []
+    assert len(index) == 4
+    
+    everything = _index(valid_only=False)
+    assert everything.lookup('hola') == {'a.txt': [59], 'b.txt': [44, 49]}
+    assert everything.get_pattern('hola') is None
+    assert ',' not in everything and ';' not in everything
+
+
+def test_prefix_lookup():
+    index = _index()
+    assert list(index.prefix_lookup('192.168.1.')) == ['192.168.1.1', '192.168.1.10']
+    assert list(index.prefix_lookup('A')) == ['admin@test.com', 'ana@test.com']
+    assert list(index.prefix_lookup('a', limit=1)) == ['admin@test.com']
+    assert index.prefix_lookup('ana')['ana@test.com'] == {'b.txt': [17]}
+    assert list(index.prefix_lookup('', pattern_name='ip_address')) == ['192.168.1.1', '192.168.1.10']
+    assert index.prefix_lookup('zzz') == {}
+    
+    # Un documento nuevo invalida el orden guardado
+    index.add_document('d.txt', LexicalAnalyzer().analyze("ab@cd.co"))
+    assert list(index.prefix_lookup('a')) == ['ab@cd.co', 'admin@test.com', 'ana@test.com']
+
+
+def test_save_and_load_round_trip(tmp_path):
+    index = _index(valid_only=False)
+    path = index.save(str(tmp_path / 'indices' / 'corpus.json.gz'))
+    
+    # Las posiciones se guardan como diferencias con la anterior
+    with gzip.open(path, 'rt', encoding='utf-8') as handle:
+        data = json.load(handle)
+    assert data['terms']['hola'] == [None, [[0, [59]], [1, [44, 5]]]]
+    assert data['terms']['admin@test.com'] == ['email', [[0, [0, 25]], [1, [0]]]]
+    
+    loaded = CorpusIndex.load(path)
+    assert loaded.valid_only is False and loaded.documents == index.documents
+    assert len(loaded) == len(index)
+    for lexeme in index.prefix_lookup(''):
+        assert loaded.lookup(lexeme) == index.lookup(lexeme)
+        assert loaded.get_pattern(lexeme) == index.get_pattern(lexeme)
+    assert loaded.prefix_lookup('192') == index.prefix_lookup('192')
+    
+    # El índice cargado admite nuevas altas
+    loaded.add_document('d.txt', LexicalAnalyzer().analyze("hola"))
+    assert loaded.documents_containing('hola') == ['a.txt', 'b.txt', 'd.txt']
+    with pytest.raises(ValueError):
+        loaded.add_document('a.txt', [])
+
+
+def test_load_rejects_unknown_format(tmp_path):
+    path = tmp_path / 'otro.json.gz'
+    with gzip.open(path, 'wt', encoding='utf-8') as handle:
+        json.dump({'version': 99}, handle)
+    with pytest.raises(ValueError):
+        CorpusIndex.load(str(path))
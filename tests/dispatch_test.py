@@ -0,0 +1,69 @@
+"""
+Dispatch Test: Las reglas de forma son condiciones necesarias, así que el
+despacho clasifica igual que el validador
+"""
+
+import sys
+import os
+import random
+
+# Agregar el directorio padre al path para poder importar src
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.patterns.patterns import PatternValidator
+from src.patterns.dispatch import SHAPE_RULES, ShapeDispatcher
+from test_cases import get_performance_test_text, get_test_cases
+
+
+def _samples():
+    """Ejemplos de los casos de prueba y del texto de rendimiento, más variantes al azar"""
+    samples = get_performance_test_text().split()
+    for cases in get_test_cases().values():
+        samples += cases['validos'] + cases['invalidos']
+    rng = random.Random(2)
+    alphabet = "abcXYZñÉ0139٣@.:/-_+$!%*?&"
+    for _ in range(30_000):
+        text = list(rng.choice(samples))
+        for _ in range(rng.randint(1, 3)):
+            position = rng.randint(0, len(text))
+            if rng.random() < 0.5 or not text:
+                text.insert(position, rng.choice(alphabet))
+            else:
+                del text[min(position, len(text) - 1)]
+        samples.append(''.join(text))
+    return samples
+
+
+SAMPLES = _samples()
+
+
+def test_shape_rules_are_necessary_conditions():
+    validator = PatternValidator()
+    dispatcher = ShapeDispatcher(validator)
+    assert set(SHAPE_RULES) == set(validator.patterns)
+    for sample in SAMPLES:
+        candidates = dispatcher.get_candidates(sample)
+        for pattern_name in validator.patterns:
+            if validator.validate_pattern(sample, pattern_name):
+                assert pattern_name in candidates, (pattern_name, sample)
+        assert dispatcher.classify(sample) == validator.classify(sample), sample
+
+
+def test_dispatch_matches_validator_after_add_pattern():
+    validator = PatternValidator()
+    dispatcher = ShapeDispatcher(validator)
+    for sample in SAMPLES[:2000]:
+        dispatcher.classify(sample)
+    
+    # Un patrón nuevo y la redefinición de uno con regla: ninguno se descarta por forma
+    validator.add_pattern('ticket', r'^TCK-[0-9]{4}$')
+    validator.add_pattern('codigo_postal', r'^[0-9]{3,8}$')
+    samples = SAMPLES + ['TCK-1234', '123', '12345678']
+    for sample in samples:
+        assert dispatcher.classify(sample) == validator.classify(sample), sample
+    assert dispatcher.classify('123') == 'codigo_postal'
+    stats = dispatcher.get_dispatch_statistics()
+    assert stats['lexemes_classified'] == len(samples) + 1
+    assert stats['skips_by_pattern']['ticket'] == 0
@@ -0,0 +1,131 @@
+"""
+Edit Test: La re-tokenización incremental de apply_edit equivale a analizar el texto editado
+"""
+
+import sys
+import os
+import random
+
+import pytest
+
+# Agregar el directorio padre al path para poder importar src
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.analysis.lexical_analyzer import LexicalAnalyzer, TokenType
+from src.analysis.statistics import StatisticsAnalyzer
+from src.core.model import TextModel
+from token_helpers import analysis_result, reference_result, signature
+
+
+TEXT = "Contacto: admin@test.com, tel 3001234567\nIP 192.168.1.1 (servidor)\n\nfin 25/12/2024"
+
+
+def _assert_matches_full_analysis(analyzer):
+    """Compara tokens, conteos e índices con un análisis completo del texto editado"""
+    reference = LexicalAnalyzer()
+    assert analysis_result(analyzer, analyzer.tokens) == reference_result(analyzer.text, reference)
+    assert analyzer.get_pattern_counts() == reference.get_pattern_counts()
+    for token_type in TokenType:
+        assert analyzer.count_tokens_by_type(token_type) == reference.count_tokens_by_type(token_type)
+        assert signature(analyzer.get_tokens_by_type(token_type)) == \
+            signature(reference.get_tokens_by_type(token_type))
+    for pattern_name in set(reference.get_pattern_counts()) | {'email', 'no_existe'}:
+        assert signature(analyzer.get_tokens_by_pattern(pattern_name)) == \
+            signature(reference.get_tokens_by_pattern(pattern_name))
+    
+    for offset in range(len(analyzer.text) + 1):
+        assert signature(filter(None, [analyzer.get_token_at(offset)])) == \
+            signature(filter(None, [reference.get_token_at(offset)]))
+    last_line = reference.current_line
+    for first in range(1, last_line + 1):
+        assert signature(analyzer.get_tokens_in_lines(first, last_line)) == \
+            signature(reference.get_tokens_in_lines(first, last_line))
+
+
+EDITS = {
+    'insercion': [(0, 0, "Hola "), (15, 0, "x"), (len(TEXT) + 5, 0, " 42")],
+    'borrado': [(10, 14, ""), (0, 3, ""), (20, 1, "")],
+    'une_tokens': [(TEXT.index(', tel'), 6, "")],
+    'parte_token': [(TEXT.index('@'), 0, " ")],
+    'multilinea': [(TEXT.index('\n'), 0, "\nnueva línea 123\notra user@mail.org\n"),
+                   (5, 30, "a\nb\nc"), (0, 0, "\n\n")],
+    'borra_saltos': [(TEXT.index('\n'), 1, ""), (TEXT.index('\n\n') - 1, 2, " ")],
+    'reemplaza_todo': [(0, len(TEXT), "nuevo 1.5\n2")],
+}
+
+
+@pytest.mark.parametrize('name', sorted(EDITS))
+def test_edit_sequences_match_full_analysis(name):
+    analyzer = LexicalAnalyzer()
+    analyzer.analyze(TEXT)
+    for offset, delete_len, insert_text in EDITS[name]:
+        analyzer.apply_edit(offset, delete_len, insert_text)
+        _assert_matches_full_analysis(analyzer)
+
+
+def test_random_edit_sequences_match_full_analysis():
+    rng = random.Random(16)
+    pieces = ['hola', 'user@test.com', '123', '3.14', ',', '(', ')', '\n', ' ', 'ñandú',
+              'http://a.b', '\n\n', 'A1-b', '192.168.0.1']
+    for _ in range(60):
+        analyzer = LexicalAnalyzer()
+        analyzer.analyze(''.join(rng.choice(pieces) for _ in range(rng.randint(0, 30))))
+        for _ in range(rng.randint(1, 6)):
+            offset = rng.randint(0, len(analyzer.text))
+            delete_len = rng.randint(0, min(8, len(analyzer.text) - offset))
+            insert_text = ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 3)))
+            analyzer.apply_edit(offset, delete_len, insert_text)
+        _assert_matches_full_analysis(analyzer)
+
+
+def _fresh_statistics(text):
+    """Estadísticas avanzadas de un análisis completo del texto, sin el sello de tiempo"""
+    analyzer = LexicalAnalyzer()
+    tokens = analyzer.analyze(text)
+    stats = StatisticsAnalyzer().analyze_results(tokens, text, analyzer.get_statistics())
+    del stats['timestamp']
+    return stats
+
+
+def _edited_statistics(model):
+    stats = dict(model.advanced_stats)
+    del stats['timestamp']
+    return stats
+
+
+def test_model_edits_update_advanced_statistics_without_growing_history():
+    model = TextModel()
+    model.set_text(TEXT)
+    history = model.statistics_analyzer.analysis_history
+    assert len(history) == 1
+    
+    for name in sorted(EDITS):
+        for offset, delete_len, insert_text in EDITS[name]:
+            offset = min(offset, len(model.text))
+            model.apply_edit(offset, min(delete_len, len(model.text) - offset), insert_text)
+            assert _edited_statistics(model) == _fresh_statistics(model.text)
+    assert len(history) == 1
+    
+    # Un texto nuevo sí es otro análisis
+    model.set_text("otro texto 123")
+    assert len(history) == 2
+
+
+def test_model_random_edits_match_fresh_statistics():
+    rng = random.Random(16)
+    pieces = ['hola', 'Hola', 'user@test.com', '123', '3.14', ',', '.', '\n', ' ', 'ñandú',
+              'http://a.b', '\n\n', 'A1-b', '192.168.0.1', '  ']
+    for _ in range(40):
+        model = TextModel()
+        model.set_text(''.join(rng.choice(pieces) for _ in range(rng.randint(0, 30))))
+        for _ in range(rng.randint(1, 8)):
+            offset = rng.randint(0, len(model.text))
+            delete_len = rng.randint(0, min(8, len(model.text) - offset))
+            insert_text = ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 3)))
+            model.apply_edit(offset, delete_len, insert_text)
+            if rng.random() < 0.5:
+                assert _edited_statistics(model) == _fresh_statistics(model.text)
+        assert _edited_statistics(model) == _fresh_statistics(model.text)
+        assert len(model.statistics_analyzer.analysis_history) == 1
@@ -0,0 +1,66 @@
+"""
+File Test: analyze_file e iter_file sobre un archivo mapeado en memoria equivalen a analyze()
+"""
+
+import sys
+import os
+
+import pytest
+
+# Agregar el directorio padre al path para poder importar src
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.analysis.lexical_analyzer import LexicalAnalyzer
+from token_helpers import analysis_result, cursor, reference_result, signature
+
+
+TEXTS = {
+    'vacio': "",
+    'ascii': "admin@test.com, 192.168.1.1 (servidor) y https://github.com/proyecto\n",
+    'lineas': "línea uno 3001234567\n\nlínea tres: ñandú 25/12/2024;\n   fin",
+    'crlf': "uno 123\r\ndos user@mail.org\r\n\r\ntres (4.5)\r\n",
+    'espacios_unicode': "ab cd　ef é@x.com 123 \x85 q r\n\nz",
+    'sin_salto_final': "x\n" * 40 + "ñ" * 5 + " fin",
+}
+
+
+@pytest.mark.parametrize('engine', ['regex', 'dfa'])
+@pytest.mark.parametrize('name', sorted(TEXTS))
+def test_file_scan_matches_analyze(tmp_path, engine, name):
+    text = TEXTS[name]
+    path = tmp_path / 'documento.txt'
+    # Bytes tal cual: el escaneo no traduce '\r\n'
+    path.write_bytes(text.encode('utf-8'))
+    
+    expected = reference_result(text, LexicalAnalyzer(engine))
+    analyzer = LexicalAnalyzer(engine)
+    assert analysis_result(analyzer, analyzer.analyze_file(str(path))) == expected
+    
+    # iter_file genera los mismos tokens sin guardarlos
+    expected_tokens, _, expected_cursor = expected
+    streaming = LexicalAnalyzer(engine)
+    assert signature(streaming.iter_file(str(path))) == expected_tokens
+    assert cursor(streaming) == expected_cursor
+    assert streaming.tokens == []
+
+
+def test_file_scan_keeps_carriage_returns(tmp_path):
+    path = tmp_path / 'crlf.txt'
+    path.write_bytes(b"a\r\nb 12\r\n")
+    analyzer = LexicalAnalyzer()
+    tokens = analyzer.analyze_file(str(path))
+    assert [(token.lexeme, token.position, token.line, token.column) for token in tokens] == [
+        ('a', 0, 1, 1), ('b', 3, 2, 1), ('12', 5, 2, 3)]
+    assert cursor(analyzer) == (9, 3, 1)
+
+
+def test_file_scan_rejects_invalid_utf8(tmp_path):
+    path = tmp_path / 'invalido.txt'
+    path.write_bytes("válido 123 ".encode('utf-8') + b"mal\xff\xfeformado fin")
+    with pytest.raises(UnicodeDecodeError):
+        LexicalAnalyzer().analyze_file(str(path))
+    # Igual que al decodificar el archivo completo
+    with pytest.raises(UnicodeDecodeError):
+        path.read_bytes().decode('utf-8')
@@ -0,0 +1,87 @@
+"""
+History Test: Historial acotado que desplaza los análisis antiguos a un archivo JSONL
+"""
+
+import sys
+import os
+import csv
+
+import pytest
+
+# Agregar el directorio padre al path para poder importar src
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.analysis.history import AnalysisHistory, CSV_FIELDS
+from src.analysis.lexical_analyzer import LexicalAnalyzer
+from src.analysis.statistics import StatisticsAnalyzer
+
+
+def _analysis(number):
+    """Análisis mínimo con los campos que se aplanan a CSV"""
+    return {
+        'timestamp': f'2024-01-{number + 1:02d}T00:00:00',
+        'text_analysis': {'character_count': 10 * number, 'word_count': number, 'line_count': 1},
+        'token_analysis': {'total_tokens': number, 'valid_token_count': number // 2},
+        'quality_metrics': {'accuracy': float(number)},
+        'pattern_analysis': {'pattern_variety': 1},
+        'complexity_analysis': {'complexity_index': number / 10},
+    }
+
+
+def test_spills_the_oldest_entries_at_the_bound():
+    history = AnalysisHistory(capacity=3)
+    for number in range(7):
+        history.append(_analysis(number))
+    assert len(history) == 7
+    assert history.spilled_count == 4
+    assert [analysis['token_analysis']['total_tokens'] for analysis in history.recent()] == [4, 5, 6]
+    
+    # rows() y la iteración leen primero lo desplazado y luego lo que sigue en memoria
+    assert [row['total_tokens'] for row in history.rows()] == list(range(7))
+    assert [analysis['timestamp'] for analysis in history] == \
+        [_analysis(number)['timestamp'] for number in range(7)]
+    assert history.get_aggregates() == {'count': 7, 'avg_accuracy': 3.0, 'avg_complexity': pytest.approx(0.3),
+                                        'avg_tokens': 3.0, 'in_memory': 3, 'spilled': 4}
+    assert history.get_window()[2] == [2, 3, 4, 5, 6]
+    history.close()
+    
+    with pytest.raises(ValueError):
+        AnalysisHistory(capacity=0)
+
+
+def test_reopening_the_spill_file_continues_the_history(tmp_path):
+    path = str(tmp_path / 'historial.jsonl')
+    history = AnalysisHistory(capacity=2, spill_path=path)
+    for number in range(5):
+        history.append(_analysis(number))
+    assert history.spilled_count == 3
+    # Al cerrar, lo que seguía en memoria también pasa al archivo
+    history.close()
+    
+    reopened = AnalysisHistory(capacity=2, spill_path=path)
+    assert len(reopened) == 5 and reopened.spilled_count == 5 and reopened.recent() == []
+    assert reopened.get_aggregates()['avg_tokens'] == 2.0
+    reopened.append(_analysis(5))
+    assert [row['total_tokens'] for row in reopened.rows()] == list(range(6))
+    assert reopened.get_window()[2] == [1, 2, 3, 4, 5]
+    reopened.close()
+
+
+def test_csv_export_includes_spilled_and_in_memory_entries(tmp_path):
+    statistics = StatisticsAnalyzer(history_size=2, history_path=str(tmp_path / 'historial.jsonl'))
+    analyzer = LexicalAnalyzer()
+    texts = ["hola user@test.com", "123 456", "uno dos tres", "192.168.0.1", "fin"]
+    for text in texts:
+        tokens = analyzer.analyze(text)
+        statistics.analyze_results(tokens, text, analyzer.get_statistics())
+    assert statistics.analysis_history.spilled_count == 3
+    
+    path = str(tmp_path / 'exportes' / 'historial.csv')
+    assert statistics.export_to_csv(path)
+    with open(path, newline='', encoding='utf-8') as handle:
+        rows = list(csv.DictReader(handle))
+    assert list(rows[0]) == list(CSV_FIELDS)
+    assert [int(row['character_count']) for row in rows] == [len(text) for text in texts]
+    assert [int(row['total_tokens']) for row in rows] == [2, 2, 3, 1, 1]
+    statistics.analysis_history.close()
@@ -0,0 +1,63 @@
+"""
+Parallel Test: analyze_parallel entre varios procesos equivale al análisis secuencial
+"""
+
+import sys
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+# Agregar el directorio padre al path para poder importar src
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.analysis.lexical_analyzer import LexicalAnalyzer
+from token_helpers import analysis_result, reference_result
+
+
+LINES = [
+    "Contacto: admin@test.com, tel 3001234567",
+    "IP 192.168.1.1 (servidor) https://github.com/proyecto",
+    "",
+    "línea con ñandú 25/12/2024; TCK-1234 y x",
+    "ab cd　ef é@x.com 123 \x85 q",
+    "   x",
+]
+TEXTS = ['\n'.join(LINES), '\n'.join(LINES * 7) + '\n', 'x\n' * 50, '\n\n\n', 'sin saltos 123']
+
+
+def _analyzer(engine, custom):
+    analyzer = LexicalAnalyzer(engine)
+    if custom:
+        analyzer.pattern_validator.add_pattern('ticket', r'^TCK-[0-9]{4}$')
+        analyzer.pattern_validator.add_pattern('equis', r'^x$')
+    return analyzer
+
+
+@pytest.fixture(scope='module')
+def executor():
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        yield pool
+
+
+@pytest.mark.parametrize('engine', ['regex', 'dfa'])
+@pytest.mark.parametrize('custom', [False, True])
+@pytest.mark.parametrize('min_shard_size', [1, 7, 50])
+def test_parallel_matches_sequential(executor, engine, custom, min_shard_size):
+    for text in TEXTS:
+        expected = reference_result(text, _analyzer(engine, custom))
+        parallel = _analyzer(engine, custom)
+        tokens = parallel.analyze_parallel(text, 4, executor, min_shard_size=min_shard_size)
+        assert analysis_result(parallel, tokens) == expected, repr(text[:40])
+
+
+def test_custom_patterns_reach_the_workers(executor):
+    text = '\n'.join(LINES * 3)
+    assert len(LexicalAnalyzer._split_shards(text, 4)) == 4
+    analyzer = _analyzer('regex', custom=True)
+    tokens = analyzer.analyze_parallel(text, 4, executor, min_shard_size=1)
+    assert analyzer.get_pattern_counts()['ticket'] == 3
+    assert analyzer.get_pattern_counts()['equis'] == 6
+    assert [token.pattern_name for token in tokens if token.lexeme == 'TCK-1234'] == ['ticket'] * 3
@@ -0,0 +1,96 @@
+"""
+Position Index Test: Consultas por posición y por líneas con búsqueda binaria
+"""
+
+import sys
+import os
+
+import pytest
+
+# Agregar el directorio padre al path para poder importar src
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.analysis.lexical_analyzer import LexicalAnalyzer
+from src.analysis.position_index import PositionIndex
+
+
+# Tokens: ab [0, 2) y cd [3, 5) en la línea 1; la línea 2 está vacía;
+# ef [7, 9) y gh [11, 13) en la línea 3; la línea 4 está vacía
+TEXT = "ab cd\n\nef  gh\n"
+
+
+def _lexemes(tokens):
+    return [token.lexeme for token in tokens]
+
+
+@pytest.fixture
+def index():
+    analyzer = LexicalAnalyzer()
+    return PositionIndex.from_tokens(analyzer.analyze(TEXT))
+
+
+def test_token_at_boundaries(index):
+    expected = {-1: None, 0: 0, 1: 0, 2: None, 3: 1, 4: 1, 5: None, 6: None,
+                7: 2, 8: 2, 9: None, 10: None, 11: 3, 12: 3, 13: None, 14: None, 100: None}
+    assert {offset: index.token_at(offset) for offset in expected} == expected
+
+
+@pytest.mark.parametrize('start, end, expected', [
+    (0, 0, (0, 0)),      # rango vacío
+    (0, 1, (0, 1)),
+    (2, 3, (1, 1)),      # solo el espacio entre ab y cd
+    (1, 4, (0, 2)),      # corta dos tokens por la mitad
+    (5, 7, (2, 2)),      # salto de línea y línea vacía
+    (4, 8, (1, 3)),
+    (0, 100, (0, 4)),
+    (13, 20, (4, 4)),
+])
+def test_offset_range(index, start, end, expected):
+    assert index.offset_range(start, end) == expected
+
+
+@pytest.mark.parametrize('first_line, last_line, expected', [
+    (1, 1, (0, 2)),
+    (2, 2, (2, 2)),      # línea vacía
+    (2, 3, (2, 4)),
+    (1, 4, (0, 4)),
+    (4, 9, (4, 4)),
+    (3, 1, (2, 2)),      # rango invertido
+])
+def test_line_range(index, first_line, last_line, expected):
+    assert index.line_range(first_line, last_line) == expected
+
+
+def test_queries_after_apply_edit_rebuild_the_index():
+    analyzer = LexicalAnalyzer()
+    analyzer.analyze(TEXT)
+    before = analyzer.get_position_index()
+    assert _lexemes(analyzer.get_tokens_in_lines(3, 3)) == ['ef', 'gh']
+    
+    # Dos líneas nuevas antes de 'ef': ef y gh pasan a la línea 5
+    analyzer.apply_edit(6, 0, "x1\ny2\n")
+    index = analyzer.get_position_index()
+    assert index is not before and index.generation == analyzer.generation
+    reference = PositionIndex.from_tokens(LexicalAnalyzer().analyze(analyzer.text))
+    assert (list(index.starts), list(index.ends), list(index.lines)) == \
+        (list(reference.starts), list(reference.ends), list(reference.lines))
+    
+    assert _lexemes(analyzer.get_tokens_in_lines(2, 3)) == ['x1', 'y2']
+    assert _lexemes(analyzer.get_tokens_in_lines(4, 4)) == []
+    assert _lexemes(analyzer.get_tokens_in_lines(5, 5)) == ['ef', 'gh']
+    assert analyzer.get_token_at(analyzer.text.index('gh') + 1).lexeme == 'gh'
+    assert analyzer.get_token_at(analyzer.text.index('gh') - 1) is None
+    assert _lexemes(analyzer.get_tokens_in_range(5, 10)) == ['x1', 'y2']
+    
+    # Sin cambios no se reconstruye
+    assert analyzer.get_position_index() is index
+
+
+def test_columnar_tokens_share_the_table_columns():
+    analyzer = LexicalAnalyzer()
+    table = analyzer.analyze_columnar(TEXT)
+    index = analyzer.get_position_index()
+    assert index.starts is table.starts and index.lines is table.lines
+    assert _lexemes(analyzer.get_tokens_in_lines(3, 4)) == ['ef', 'gh']
+    assert analyzer.get_token_at(3).lexeme == 'cd'
@@ -0,0 +1,71 @@
+"""
+Prefilter Test: Los prefiltros nunca descartan un texto que coincide con su patrón
+"""
+
+import sys
+import os
+import re
+import random
+
+# Agregar el directorio padre al path para poder importar src
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.patterns.patterns import PatternValidator
+from src.patterns.prefilter import build_prefilter
+from test_cases import get_test_cases
+
+
+def _samples():
+    """Ejemplos válidos e inválidos de los casos de prueba, más variantes al azar"""
+    samples = []
+    for cases in get_test_cases().values():
+        samples += cases['validos'] + cases['invalidos']
+    rng = random.Random(7)
+    alphabet = "abcXYZh0139@.:/-_+$!%*?& "
+    for _ in range(20_000):
+        text = list(rng.choice(samples))
+        for _ in range(rng.randint(1, 3)):
+            position = rng.randint(0, len(text))
+            if rng.random() < 0.5 or not text:
+                text.insert(position, rng.choice(alphabet))
+            else:
+                del text[min(position, len(text) - 1)]
+        samples.append(''.join(text))
+    return [sample.strip() for sample in samples]
+
+
+def test_prefilters_never_reject_a_match():
+    validator = PatternValidator()
+    validator.add_pattern('version', r'^v(?:\d+\.){2}\d+(?:-rc\d+)?$')
+    validator.add_pattern('codigo', r'ab(?:cd|ce)[0-9]+')
+    samples = _samples() + ['v1.2.3', 'v10.0.1-rc2', 'abcd12', 'abce7xyz']
+    for name, pattern in validator.patterns.items():
+        prefilter = build_prefilter(pattern)
+        if prefilter is None:
+            continue
+        compiled = re.compile(pattern)
+        for sample in samples:
+            if compiled.match(sample):
+                assert prefilter.check(sample), (name, sample, prefilter.describe())
+
+
+def test_prefilter_conditions_and_metrics():
+    validator = PatternValidator()
+    ip = validator.get_prefilter('ip_address').describe()
+    assert (ip['min_length'], ip['max_length'], ip['counts']) == (7, 15, {'.': 3})
+    url = validator.get_prefilter('url').describe()
+    assert url['prefix'] == 'http' and '://' in url['literals']
+    assert validator.get_prefilter('numero_entero') is None
+    
+    validator.add_pattern('ticket', r'^TCK-[0-9]{4}$')
+    values = ['TCK-1234', 'TCK-12345', 'hola', 'TCK-abcd', ' TCK-0001 ']
+    assert [validator.validate_pattern(value, 'ticket') for value in values] == \
+        [True, False, False, False, True]
+    verdicts, _ = validator.validate_many(values * 3, 'ticket')
+    assert list(verdicts) == [1, 0, 0, 0, 1] * 3
+    stats = validator.get_prefilter_stats()['ticket']
+    # 'TCK-12345' y 'hola' se descartan por longitud y 'TCK-abcd' por no tener
+    # dígitos, sin ejecutar la expresión (validate_many verifica cada valor distinto una vez)
+    assert stats['checked'] == 10 and stats['rejected'] == 6
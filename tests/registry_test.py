@@ -0,0 +1,67 @@
+"""
+Registry Test: Registro de patrones compartido, compilación diferida y versiones
+"""
+
+import sys
+import os
+
+import pytest
+
+# Agregar el directorio padre al path para poder importar src
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.patterns.patterns import PatternValidator
+from src.patterns.registry import PatternRegistry, get_default_registry
+from src.analysis.lexical_analyzer import LexicalAnalyzer
+from src.core.model import TextModel
+
+
+def test_default_registry_is_shared_and_compiles_lazily():
+    registry = PatternRegistry()
+    assert registry.compiled == {}
+    validator = PatternValidator(registry)
+    assert validator.validate_pattern('192.168.1.1', 'ip_address')
+    assert list(registry.compiled) == ['ip_address']
+    
+    model = TextModel()
+    assert model.pattern_validator.registry is get_default_registry()
+    assert model.lexical_analyzer.pattern_validator.registry is get_default_registry()
+
+
+def test_add_pattern_is_private_unless_the_registry_is_explicit():
+    analyzer = LexicalAnalyzer()
+    other = LexicalAnalyzer()
+    analyzer.pattern_validator.add_pattern('ticket', r'^TCK-[0-9]{4}$')
+    assert [token.pattern_name for token in analyzer.analyze('TCK-1234')] == ['ticket']
+    assert [token.pattern_name for token in other.analyze('TCK-1234')] == [None]
+    assert 'ticket' not in get_default_registry().patterns
+    
+    # Con un registro explícito el cambio llega a todos y sus cachés se invalidan
+    registry = PatternRegistry()
+    first, second = PatternValidator(registry), PatternValidator(registry)
+    assert first.classify('TCK-1234') is None
+    version = second.version
+    first.add_pattern('ticket', r'^TCK-[0-9]{4}$', 'Tiquete de soporte')
+    assert second.version != version
+    assert second.classify('TCK-1234') == 'ticket'
+    assert second.get_pattern_description('ticket') == 'Tiquete de soporte'
+
+
+def test_validator_views_are_read_only():
+    first, second = PatternValidator(), PatternValidator()
+    with pytest.raises(TypeError):
+        first.patterns['email'] = r'^x$'
+    with pytest.raises(TypeError):
+        first.custom_descriptions['email'] = 'otra'
+    with pytest.raises(AttributeError):
+        first.custom_patterns.add('email')
+    
+    # Los cambios pasan por add_pattern: copia propia, nueva versión y cachés al día
+    version = first.version
+    first.add_pattern('email', r'^x$')
+    assert first.patterns['email'] == r'^x$' and first.version != version
+    assert first.validate_pattern('x', 'email') and not first.validate_pattern('a@b.co', 'email')
+    assert second.patterns['email'] != r'^x$'
+    assert second.validate_pattern('a@b.co', 'email')
+    assert 'email' in first.custom_patterns and 'email' not in second.custom_patterns
@@ -0,0 +1,81 @@
+"""
+Search Test: Búsqueda de patrones en texto corrido frente a la validación por tokens
+"""
+
+import sys
+import os
+import re
+
+# Agregar el directorio padre al path para poder importar src
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.patterns.patterns import PatternValidator
+
+
+MIXED_TEXT = """
+    Información de contacto:
+    Email: admin@test.com y soporte123@servicio.net
+    Teléfono: 3001234567 o 57-315-555-0123
+    Fecha: 25/12/2024 y 2024/01/15
+    IP: 192.168.1.1
+    URL: https://github.com/proyecto
+    Cédula: 1234567890
+    Código postal: 630001
+    Placa ABC123 y XYZ-789 clave MiPassword123! y números 123 -45 +3.14
+    """
+
+
+def _token_baseline(validator, text):
+    """Resultado de referencia: cada palabra separada por espacios contra cada patrón"""
+    tokens = re.findall(r'\S+', text)
+    results = {}
+    for pattern_name in validator.patterns:
+        matches = [token for token in tokens if validator.validate_pattern(token, pattern_name)]
+        if matches:
+            results[pattern_name] = matches
+    return results
+
+
+def test_analyze_text_patterns_matches_token_baseline():
+    validator = PatternValidator()
+    results = validator.analyze_text_patterns(MIXED_TEXT)
+    assert results == _token_baseline(validator, MIXED_TEXT)
+    # Las apariciones cuentan en todos los patrones que las reconocen
+    assert {'3001234567', '1234567890', '630001', '123'} <= set(results['numero_entero'])
+    assert validator.find_all_patterns(MIXED_TEXT, 'codigo_postal') == ['630001']
+
+
+def test_search_matches_are_accepted_by_validate_pattern():
+    validator = PatternValidator()
+    text = "abcdefg1,X@ ABC\n123 tel +57 300 123 4567 y clave MiPassword123! y 1.1.1.1"
+    spans = validator.find_pattern_spans(text)
+    for pattern_name, start, end, lexeme in spans:
+        assert text[start:end] == lexeme
+        assert validator.validate_pattern(lexeme, pattern_name), (pattern_name, lexeme)
+    found = {lexeme: pattern_name for pattern_name, _, _, lexeme in spans}
+    # Un lookahead no mira más allá del token, y una coincidencia no cruza saltos de línea
+    assert 'abcdefg1' not in found
+    assert 'ABC\n123' not in found
+    assert found['+57 300 123 4567'] == 'telefono'
+    assert found['MiPassword123!'] == 'password_segura'
+
+
+def test_sentence_punctuation_is_left_out_of_matches():
+    validator = PatternValidator()
+    cases = {
+        'Escribe a user@test.com.': [('email', 'user@test.com')],
+        'tel: 3001234567.': [('telefono', '3001234567')],
+        'fecha 2024-01-15.': [('fecha', '2024-01-15')],
+        'https://x.com/a?b=1.': [('url', 'https://x.com/a?b=1')],
+        'IP 192.168.0.1: ok; 3.14, y 25/12/2024;': [
+            ('ip_address', '192.168.0.1'), ('numero_decimal', '3.14'), ('fecha', '25/12/2024')],
+    }
+    for text, expected in cases.items():
+        spans = validator.find_pattern_spans(text)
+        assert [(pattern_name, lexeme) for pattern_name, _, _, lexeme in spans] == expected, text
+        for pattern_name, start, end, lexeme in spans:
+            assert text[start:end] == lexeme and validator.validate_pattern(lexeme, pattern_name)
+    # Solo un signo final: más de uno deja la coincidencia pegada a otro carácter de token
+    assert validator.find_all_patterns('total 12.. fin', 'numero_entero') == []
+    assert validator.find_all_patterns('Escribe a user@test.com.', 'email') == ['user@test.com']
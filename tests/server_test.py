@@ -0,0 +1,103 @@
+"""
+Server Test: Servidor de análisis en localhost con JSON lines y HTTP
+"""
+
+import sys
+import os
+import json
+import asyncio
+
+# Agregar el directorio padre al path para poder importar src
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.core import batch
+from src.core.server import AnalysisServer, _warm_worker
+
+
+async def _exchange(port, requests):
+    """Envía solicitudes JSON lines por una conexión y retorna las respuestas por id"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    for request in requests:
+        writer.write(json.dumps(request).encode('utf-8') + b'\n')
+    await writer.drain()
+    responses = {}
+    for _ in requests:
+        response = json.loads(await reader.readline())
+        responses[response['id']] = response
+    writer.close()
+    return responses
+
+
+async def _http_post(port, path, payload, length=None):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    body = json.dumps(payload).encode('utf-8')
+    length = len(body) if length is None else length
+    writer.write(f"POST {path} HTTP/1.1\r\nHost: localhost\r\n"
+                 f"Content-Length: {length}\r\n\r\n".encode('latin-1') + body)
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, body = raw.partition(b'\r\n\r\n')
+    return int(head.split()[1]), json.loads(body)
+
+
+def test_server_answers_json_lines_and_http():
+    async def scenario():
+        server = AnalysisServer(port=0, workers=1, queue_size=2, timeout=10)
+        await server.start()
+        try:
+            requests = [{'id': i, 'op': 'analyze', 'text': f"user{i}@test.com y 192.168.1.{i}"}
+                        for i in range(8)]
+            requests.append({'id': 'v', 'op': 'validate', 'value': 'user@test.com', 'pattern': 'email'})
+            requests.append({'id': 'm', 'op': 'validate', 'values': ['a@b.co', 'x', ' c@d.org '],
+                             'pattern': 'email'})
+            requests.append({'id': 'x', 'op': 'validate', 'value': 'a', 'pattern': 'no_existe'})
+            requests.append({'id': 'y', 'op': 'desconocida'})
+            responses = await _exchange(server.port, requests)
+            
+            for i in range(8):
+                result = responses[i]['result']
+                assert result['pattern_counts'] == {'email': 1, 'ip_address': 1}
+            assert responses['v'] == {'id': 'v', 'ok': True, 'result': {'valid': True}}
+            assert responses['m']['result']['valid'] == [True, False, True]
+            assert responses['m']['result']['counts']['valid'] == 2
+            assert not responses['x']['ok'] and 'no_existe' in responses['x']['error']
+            assert not responses['y']['ok']
+            
+            status, response = await _http_post(server.port, '/validate',
+                                                {'value': '3001234567', 'pattern': 'telefono'})
+            assert status == 200 and response['result'] == {'valid': True}
+            for length in ('abc', '-5'):
+                status, response = await _http_post(server.port, '/ping', {}, length)
+                assert status == 400 and 'Content-Length' in response['error']
+        finally:
+            await server.stop()
+    
+    asyncio.run(scenario())
+
+
+def test_server_times_out_requests_and_stops_gracefully():
+    async def scenario():
+        server = AnalysisServer(port=0, workers=1, queue_size=1, timeout=0.001)
+        await server.start()
+        try:
+            text = "palabra user@test.com " * 50_000
+            responses = await _exchange(server.port, [{'id': 1, 'op': 'analyze', 'text': text},
+                                                      {'id': 2, 'op': 'ping'}])
+            assert responses[1]['ok'] is False and 'timed out' in responses[1]['error']
+            assert responses[2]['result'] == {'pong': True}
+        finally:
+            await server.stop()
+        assert server.requests_failed == 1
+    
+    asyncio.run(scenario())
+
+
+def test_warm_worker_compiles_every_pattern():
+    _warm_worker()
+    validator = batch._get_worker_model().pattern_validator
+    registry = validator.registry
+    assert set(registry.compiled) == set(validator.patterns)
+    assert registry.combined_pattern is not None
+    assert set(registry.prefilters) == set(validator.patterns)
@@ -0,0 +1,112 @@
+"""
+Sketches Test: Precisión del modo aproximado frente al modo exacto
+"""
+
+import sys
+import os
+
+# Agregar el directorio padre al path para poder importar src
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.analysis.sketches import HyperLogLog
+from src.analysis.accumulators import TokenAccumulator
+from src.analysis.lexical_analyzer import LexicalAnalyzer
+from src.analysis.statistics import StatisticsAnalyzer
+
+
+def _synthetic_corpus(distinct: int, repetitions: int = 3) -> str:
+    """Texto con `distinct` palabras distintas mezcladas con patrones reconocibles"""
+    words = []
+    for i in range(distinct):
+        words.append(f"palabra{i}")
+        if i % 10 == 0:
+            words.append(f"user{i}@test.com")
+        if i % 7 == 0:
+            words.append(str(100000 + i))
+    return "\n".join(" ".join(words[j:j + 12]) for j in range(0, len(words), 12)) * repetitions
+
+
+def test_hyperloglog_error_bound():
+    """La estimación queda dentro de 3 errores estándar para varias cardinalidades"""
+    for cardinality in (1_000, 50_000, 200_000):
+        sketch = HyperLogLog()
+        sketch.update(f"lexema-{i}" for i in range(cardinality))
+        error = abs(sketch.count() - cardinality) / cardinality
+        assert error <= 3 * sketch.relative_error, (cardinality, sketch.count())
+
+
+def test_hyperloglog_small_cardinalities_are_nearly_exact():
+    sketch = HyperLogLog()
+    for i in range(200):
+        sketch.add(str(i))
+        sketch.add(str(i))  # Los repetidos no cambian la estimación
+    assert abs(sketch.count() - 200) <= 2
+    assert HyperLogLog().count() == 0
+
+
+def test_hyperloglog_merge_estimates_union():
+    left, right, union = HyperLogLog(), HyperLogLog(), HyperLogLog()
+    left.update(str(i) for i in range(0, 60_000))
+    right.update(str(i) for i in range(40_000, 100_000))
+    union.update(str(i) for i in range(0, 100_000))
+    merged = left.copy().merge(right)
+    assert merged.registers == union.registers
+    assert left.count() != merged.count()
+
+
+def test_hyperloglog_memory_is_bounded():
+    sketch = HyperLogLog(precision=12)
+    sketch.update(str(i) for i in range(100_000))
+    assert sketch.memory_usage() == 4096
+
+
+def test_approximate_statistics_match_exact_mode():
+    """Las métricas de elementos distintos quedan cerca y el resto es idéntico"""
+    text = _synthetic_corpus(20_000)
+    analyzer = LexicalAnalyzer()
+    tokens = analyzer.analyze(text)
+    basic_stats = analyzer.get_statistics()
+    exact = StatisticsAnalyzer().analyze_results(tokens, text, basic_stats)
+    approximate = StatisticsAnalyzer(approximate=True).analyze_results(tokens, text, basic_stats)
+    tolerance = 3 * HyperLogLog().relative_error
+    
+    def close(estimate, reference):
+        return abs(estimate - reference) <= tolerance * reference
+    
+    assert close(approximate['token_analysis']['unique_tokens'], exact['token_analysis']['unique_tokens'])
+    assert close(approximate['token_analysis']['token_diversity'], exact['token_analysis']['token_diversity'])
+    assert close(approximate['complexity_analysis']['lexical_diversity'],
+                 exact['complexity_analysis']['lexical_diversity'])
+    for pattern_name, metrics in exact['pattern_analysis']['pattern_metrics'].items():
+        estimated = approximate['pattern_analysis']['pattern_metrics'][pattern_name]
+        assert close(estimated['unique_values'], metrics['unique_values']), pattern_name
+    
+    # Las métricas que no cuentan elementos distintos no cambian
+    for key in ('total_tokens', 'avg_token_length', 'median_token_length', 'token_length_std'):
+        assert approximate['token_analysis'][key] == exact['token_analysis'][key]
+    assert approximate['text_analysis'] == exact['text_analysis']
+
+
+def test_approximate_accumulators_merge_like_a_single_pass():
+    analyzer = LexicalAnalyzer()
+    tokens = analyzer.analyze(_synthetic_corpus(5_000, repetitions=1))
+    whole = TokenAccumulator(approximate=True)
+    whole.update(tokens)
+    first, second = TokenAccumulator(approximate=True), TokenAccumulator(approximate=True)
+    first.update(tokens[:len(tokens) // 2])
+    second.update(tokens[len(tokens) // 2:])
+    first.merge(second)
+    assert first.lexemes.registers == whole.lexemes.registers
+    assert first.total == whole.total and first.median_length() == whole.median_length()
+
+
+def test_length_quantiles_match_sorted_lengths():
+    analyzer = LexicalAnalyzer()
+    tokens = analyzer.analyze(_synthetic_corpus(2_000, repetitions=1))
+    totals = TokenAccumulator()
+    totals.update(tokens)
+    lengths = sorted(len(token.lexeme) for token in tokens)
+    for fraction in (0.1, 0.5, 0.9, 0.99, 1.0):
+        rank = max(1, -(-int(fraction * 1000) * len(lengths) // 1000))
+        assert totals.length_quantile(fraction) == lengths[rank - 1]
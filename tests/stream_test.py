@@ -0,0 +1,62 @@
+"""
+Stream Test: analyze_stream por bloques produce los mismos tokens que analyze()
+"""
+
+import sys
+import os
+import io
+
+import pytest
+
+# Agregar el directorio padre al path para poder importar src
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.analysis.lexical_analyzer import LexicalAnalyzer
+from token_helpers import cursor, reference_result, signature
+
+
+TEXTS = [
+    "",
+    "palabra",
+    "admin@test.com, 192.168.1.1 (servidor) y https://github.com/proyecto\n",
+    "línea uno 3001234567\n\nlínea tres: ñandú 25/12/2024;\n   fin",
+    "ab cd　ef é@x.com 123 \x85 q\n\nz\r\nCRLF 1.5\r\n",
+    "x\n" * 40 + "user@mail.org" * 3,
+]
+
+
+@pytest.mark.parametrize('engine', ['regex', 'dfa'])
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 64, 65536])
+def test_stream_matches_analyze_across_chunk_boundaries(engine, chunk_size):
+    for text in TEXTS:
+        # analyze_stream no guarda los tokens, así que no hay estadísticas que comparar
+        expected_tokens, _, expected_cursor = reference_result(text, LexicalAnalyzer(engine))
+        # Texto: los bloques pequeños cortan lexemas en cualquier punto
+        analyzer = LexicalAnalyzer(engine)
+        tokens = signature(analyzer.analyze_stream(io.StringIO(text), chunk_size))
+        assert (tokens, cursor(analyzer)) == (expected_tokens, expected_cursor), repr(text)
+        # Bytes: además se cortan caracteres UTF-8 de varios bytes
+        analyzer = LexicalAnalyzer(engine)
+        stream = io.BytesIO(text.encode('utf-8'))
+        tokens = signature(analyzer.analyze_stream(stream, chunk_size))
+        assert (tokens, cursor(analyzer)) == (expected_tokens, expected_cursor), repr(text)
+
+
+def test_stream_keeps_tokens_cut_at_a_boundary_whole():
+    text = "correo admin@test.com fin"
+    split = text.index('@')
+    
+    class TwoChunks(io.StringIO):
+        """Entrega el texto en dos bloques cortados dentro del correo"""
+        def __init__(self):
+            super().__init__()
+            self.chunks = [text[:split], text[split:]]
+        
+        def read(self, size=-1):
+            return self.chunks.pop(0) if self.chunks else ''
+    
+    tokens = list(LexicalAnalyzer().analyze_stream(TwoChunks()))
+    assert [(token.lexeme, token.pattern_name, token.position) for token in tokens] == [
+        ('correo', None, 0), ('admin@test.com', 'email', 7), ('fin', None, 22)]
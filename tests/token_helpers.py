@@ -0,0 +1,44 @@
+"""
+Token Helpers: Comparación de resultados de análisis léxico en las pruebas de equivalencia
+Los escáneres alternativos (por bloques, mmap, en paralelo, incremental) deben
+producir exactamente lo mismo que LexicalAnalyzer.analyze()
+"""
+
+import sys
+import os
+
+# Agregar el directorio padre al path para poder importar src
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.analysis.lexical_analyzer import LexicalAnalyzer
+
+
+def signature(tokens):
+    """Tupla comparable de cada token: lexema, tipo, patrón, posición, línea y columna"""
+    return [(token.lexeme, token.token_type, token.pattern_name, token.position,
+             token.line, token.column) for token in tokens]
+
+
+def cursor(analyzer):
+    """Posición, línea y columna en que terminó el último análisis"""
+    return analyzer.current_position, analyzer.current_line, analyzer.current_column
+
+
+def analysis_result(analyzer, tokens):
+    """Tokens, estadísticas (sin las de la caché) y cursor final de un análisis"""
+    statistics = analyzer.get_statistics()
+    statistics.pop('cache', None)
+    return signature(tokens), statistics, cursor(analyzer)
+
+
+def reference_result(text, analyzer=None):
+    """
+    Resultado de analyze() sobre el texto completo
+    
+    Args:
+        text: Texto a analizar
+        analyzer: Analizador nuevo ya configurado (por defecto, LexicalAnalyzer())
+    """
+    analyzer = analyzer or LexicalAnalyzer()
+    return analysis_result(analyzer, analyzer.analyze(text))
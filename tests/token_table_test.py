@@ -0,0 +1,55 @@
+"""
+Token Table Test: La tabla columnar funciona igual con y sin NumPy
+"""
+
+import sys
+import os
+import subprocess
+
+# Agregar el directorio padre al path para poder importar src
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.analysis import token_table
+from src.analysis.lexical_analyzer import LexicalAnalyzer, TokenType
+
+
+TEXT = "admin@test.com 192.168.1.1 hola, 3001234567 y 25/12/2024 ; 123 abc 10.0.0.1"
+
+
+def _summary(analyzer):
+    return (analyzer.get_pattern_counts(),
+            {token_type: [str(token) for token in analyzer.get_tokens_by_type(token_type)]
+             for token_type in TokenType},
+            [str(token) for token in analyzer.get_tokens_by_pattern('ip_address')],
+            [str(token) for token in analyzer.get_tokens_by_pattern('inexistente')],
+            {token_type: analyzer.count_tokens_by_type(token_type) for token_type in TokenType})
+
+
+def test_fallback_without_numpy_matches_numpy(monkeypatch):
+    analyzer = LexicalAnalyzer()
+    analyzer.analyze_columnar(TEXT)
+    expected = _summary(analyzer)
+    
+    monkeypatch.setattr(token_table, 'np', None)
+    analyzer.analyze_columnar(TEXT)
+    assert _summary(analyzer) == expected
+    assert [str(token) for token in analyzer.get_tokens_by_pattern('ip_address')] == [
+        "Token('192.168.1.1', VALID_PATTERN, ip_address, L1:C16)",
+        "Token('10.0.0.1', VALID_PATTERN, ip_address, L1:C68)"]
+
+
+def test_analyzers_import_without_numpy(tmp_path):
+    # Un módulo numpy que falla al importarse simula que NumPy no está instalado
+    (tmp_path / 'numpy.py').write_text("raise ImportError('numpy no disponible')\n")
+    code = ("from src.analysis.lexical_analyzer import LexicalAnalyzer\n"
+            "from src.core.model import TextModel\n"
+            "import src.core.batch, src.core.server\n"
+            "analyzer = LexicalAnalyzer()\n"
+            "analyzer.analyze_columnar('hola 192.168.1.1')\n"
+            "print(analyzer.get_pattern_counts())\n")
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(tmp_path), parent_dir]))
+    result = subprocess.run([sys.executable, '-c', code], cwd=parent_dir, env=env,
+                            capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "{'ip_address': 1}"